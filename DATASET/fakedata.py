@@ -1,12 +1,17 @@
 from faker import Faker
 from random import choice, randint, uniform, sample
 from datetime import datetime
+import os
+import subprocess
+import sys
 import randomtimestamp
 from pymongo import MongoClient
 
 
-client = MongoClient("mongodb://localhost:27017/")
-db = client["DDS_Project"]
+connection_string = "mongodb://localhost:27017/"
+database_name = "DDS_Project"
+client = MongoClient(connection_string)
+db = client[database_name]
 # Define collections
 users_collection = db["users"]
 content_collection = db["content"]
@@ -14,6 +19,11 @@ interaction_history_collection = db["interaction_history"]
 recommendations_collection = db["recommendations"]
 regional_trends_collection = db["regional_trends"]
 
+# Also load interaction_history as one document per user per month (bucket pattern),
+# rebuilt from the inserted collection by the MongoDB bucket loader
+load_interaction_buckets = True
+bucket_loader = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "MONGODB", "interaction_buckets.py")
+
 fake = Faker()
 
 # Regions for geo-distribution
@@ -160,3 +170,6 @@ print("Sample Regional Trends:", regional_trends[:2])
 
 # Run the insertion function
 insert_data(users,content_list,interaction_history,recommendations,regional_trends)
+
+if load_interaction_buckets:
+    subprocess.run([sys.executable, bucket_loader, "--connection-string", connection_string, "--database", database_name], check=True)
@@ -15,20 +15,32 @@ def initialize_dynamodb(region_name):
     )
 
 
-def create_table_on_demand(dynamodb, table_name, partition_key, sort_key=None):
+def create_table_on_demand(dynamodb, table_name, partition_key, sort_key=None, global_secondary_indexes=None):
     """Creates a table with on-demand capacity."""
     key_schema = [{'AttributeName': partition_key, 'KeyType': 'HASH'}]
     attribute_definitions = [{'AttributeName': partition_key, 'AttributeType': 'S'}]
     if sort_key:
         key_schema.append({'AttributeName': sort_key, 'KeyType': 'RANGE'})
         attribute_definitions.append({'AttributeName': sort_key, 'AttributeType': 'S'})
+
+    table_kwargs = {}
+    if global_secondary_indexes:
+        # Index key attributes must be declared once alongside the table keys
+        defined = {attribute['AttributeName'] for attribute in attribute_definitions}
+        for index in global_secondary_indexes:
+            for key in index['KeySchema']:
+                if key['AttributeName'] not in defined:
+                    attribute_definitions.append({'AttributeName': key['AttributeName'], 'AttributeType': 'S'})
+                    defined.add(key['AttributeName'])
+        table_kwargs['GlobalSecondaryIndexes'] = global_secondary_indexes
     
     try:
         table = dynamodb.create_table(
             TableName=table_name,
             KeySchema=key_schema,
             AttributeDefinitions=attribute_definitions,
-            BillingMode='PAY_PER_REQUEST'  # On-demand capacity mode
+            BillingMode='PAY_PER_REQUEST',  # On-demand capacity mode
+            **table_kwargs
         )
         print(f"Creating table {table_name} in On-Demand mode in region {dynamodb.meta.client.meta.region_name}...")
         table.meta.client.get_waiter('table_exists').wait(TableName=table_name)
@@ -39,6 +51,39 @@ def create_table_on_demand(dynamodb, table_name, partition_key, sort_key=None):
         print(f"Unexpected error while creating table {table_name} in region {dynamodb.meta.client.meta.region_name}: {e}")
 
 
+def user_id_index():
+    """GSI on Users keyed by user_id, projecting the coordinates used by the user directory."""
+    return {
+        'IndexName': 'UserIdIndex',
+        'KeySchema': [{'AttributeName': 'user_id', 'KeyType': 'HASH'}],
+        'Projection': {
+            'ProjectionType': 'INCLUDE',
+            'NonKeyAttributes': ['latitude', 'longitude']
+        }
+    }
+
+
+def ensure_user_id_index(dynamodb):
+    """Add the user_id GSI to an existing Users table that was created without it."""
+    client = dynamodb.meta.client
+    region_name = client.meta.region_name
+    try:
+        description = client.describe_table(TableName="Users")['Table']
+        existing = {index['IndexName'] for index in description.get('GlobalSecondaryIndexes', [])}
+        if 'UserIdIndex' in existing:
+            return
+        client.update_table(
+            TableName="Users",
+            AttributeDefinitions=[{'AttributeName': 'user_id', 'AttributeType': 'S'}],
+            GlobalSecondaryIndexUpdates=[{'Create': user_id_index()}]
+        )
+        print(f"Creating UserIdIndex on Users in region {region_name}...")
+    except ClientError as e:
+        print(f"ClientError: {e.response['Error']['Message']} while adding UserIdIndex in region {region_name}")
+    except Exception as e:
+        print(f"Unexpected error while adding UserIdIndex in region {region_name}: {e}")
+
+
 def create_tables_on_demand(dynamodb):
     """Creates DynamoDB tables with on-demand capacity mode based on the schema."""
     # Create Users Table
@@ -46,7 +91,8 @@ def create_tables_on_demand(dynamodb):
         dynamodb=dynamodb,
         table_name="Users",
         partition_key="location",  # Partitioned by location
-        sort_key="user_id"  # Sort key for unique records
+        sort_key="user_id",  # Sort key for unique records
+        global_secondary_indexes=[user_id_index()]  # Lookup by user_id without knowing the location
     )
 
     # Create Regional Trends Table
@@ -73,6 +119,14 @@ def create_tables_on_demand(dynamodb):
         sort_key="interaction_history_id"  # Sort key for unique interactions
     )
 
+    # Create time-ordered Interaction History Table for recent-activity range queries
+    create_table_on_demand(
+        dynamodb=dynamodb,
+        table_name="InteractionHistoryByTime",
+        partition_key="user_id",  # Partitioned by user
+        sort_key="interaction_time_id"  # Zero-padded epoch millis + '#' + interaction id
+    )
+
 
 def enable_point_in_time_recovery(dynamodb, table_name):
     """Enable Point-in-Time Recovery (PITR) for fault tolerance."""
@@ -92,7 +146,7 @@ def enable_point_in_time_recovery(dynamodb, table_name):
 
 def setup_fault_tolerance(dynamodb):
     """Setup fault tolerance for all tables."""
-    tables = ["Users", "RegionalTrends", "Content", "InteractionHistory"]
+    tables = ["Users", "RegionalTrends", "Content", "InteractionHistory", "InteractionHistoryByTime"]
 
     for table in tables:
         enable_point_in_time_recovery(dynamodb, table)
@@ -104,6 +158,7 @@ def main():
         print(f"Setting up DynamoDB in region {region}...")
         dynamodb = initialize_dynamodb(region)
         create_tables_on_demand(dynamodb)
+        ensure_user_id_index(dynamodb)
         setup_fault_tolerance(dynamodb)
         print(f"DynamoDB setup completed in region {region}!")
 
@@ -4,6 +4,7 @@ from decouple import config
 from botocore.exceptions import ClientError
 from decimal import Decimal
 from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 import time
 
 # Initialize region mappings
@@ -40,6 +41,45 @@ def load_json_data(file_path):
         return []
 
 
+def parse_timestamp(value):
+    """
+    Parse an ISO 8601 timestamp string.
+
+    datetime.fromisoformat only accepts a 'Z' suffix and fractions of other than 3 or 6
+    digits from Python 3.11 on, so both are normalized first.
+    """
+    tzinfo = None
+    if value.endswith('Z'):
+        value, tzinfo = value[:-1], timezone.utc
+    if '.' in value:
+        whole, fraction = value.split('.', 1)
+        digits = len(fraction) - len(fraction.lstrip('0123456789'))
+        value = f"{whole}.{fraction[:digits][:6].ljust(6, '0')}{fraction[digits:]}"
+    parsed = datetime.fromisoformat(value)
+    return parsed.replace(tzinfo=tzinfo) if tzinfo else parsed
+
+
+def epoch_millis(timestamp):
+    """Convert an ISO timestamp string, Mongo {'$date': ...} value or datetime to UTC epoch milliseconds."""
+    if isinstance(timestamp, dict):
+        timestamp = timestamp.get('$date')
+    if isinstance(timestamp, str):
+        timestamp = parse_timestamp(timestamp)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return int(timestamp.timestamp() * 1000)
+
+
+def time_ordered_sort_key(timestamp, interaction_id=""):
+    """
+    Build the InteractionHistoryByTime sort key: 13-digit epoch millis, '#', interaction id.
+
+    Zero padding keeps lexicographic order equal to time order, so range conditions
+    on a bare millis prefix select time windows.
+    """
+    return f"{epoch_millis(timestamp):013d}#{interaction_id}"
+
+
 def preprocess_data(raw_data, table_name):
     """Preprocess data for a given table."""
     processed_data = []
@@ -61,19 +101,29 @@ def preprocess_data(raw_data, table_name):
                 if '_id' in record and '$oid' in record['_id']:
                     record['interaction_history_id'] = record['_id']['$oid']
                     del record['_id']
+            elif table_name == "InteractionHistoryByTime":
+                # Copy so the flat InteractionHistory records are left untouched
+                record = dict(record)
+                if '_id' in record and '$oid' in record['_id']:
+                    record['interaction_history_id'] = record.pop('_id')['$oid']
+                record['interaction_time_id'] = time_ordered_sort_key(
+                    record['timestamp'], record.get('interaction_history_id', '')
+                )
             processed_data.append(record)
         except Exception as e:
             print(f"Error processing record: {record}. Error: {e}")
     return processed_data
 
 
-def batch_write_to_table(dynamodb, table_name, data):
-    """Batch write data into a DynamoDB table."""
+def batch_write_to_table(dynamodb, table_name, data, cache=None):
+    """Batch write data into a DynamoDB table, invalidating cached reads of it if a cache is given."""
     table = dynamodb.Table(table_name)
     try:
         with table.batch_writer() as batch:
             for record in data:
                 batch.put_item(Item=record)
+        if cache is not None:
+            cache.invalidate_table(table_name)
         print(f"Batch data loaded successfully into {table_name} in region {dynamodb.meta.client.meta.region_name}. Total records: {len(data)}")
     except ClientError as e:
         print(f"ClientError: {e.response['Error']['Message']} while batch writing to {table_name} in region {dynamodb.meta.client.meta.region_name}")
@@ -87,13 +137,13 @@ def chunk_data(data, chunk_size=25):
         yield data[i:i + chunk_size]
 
 
-def write_data_in_chunks(dynamodb, table_name, data):
+def write_data_in_chunks(dynamodb, table_name, data, cache=None):
     """Write data in chunks to handle large datasets efficiently."""
     for chunk in chunk_data(data):
-        batch_write_to_table(dynamodb, table_name, chunk)
+        batch_write_to_table(dynamodb, table_name, chunk, cache=cache)
 
 
-def distribute_data_across_regions(data, table_name, column_name):
+def distribute_data_across_regions(data, table_name, column_name, cache=None):
     """Distribute data to respective regions based on the region column."""
     # Preprocess the data
     data = preprocess_data(data, table_name)
@@ -111,10 +161,10 @@ def distribute_data_across_regions(data, table_name, column_name):
             print(f"Region {region} has {len(region_data)} records for {table_name}")
             if region_data:  # Only process if there is data for this region
                 dynamodb = initialize_dynamodb(regions[region])
-                executor.submit(write_data_in_chunks, dynamodb, table_name, region_data)
+                executor.submit(write_data_in_chunks, dynamodb, table_name, region_data, cache)
 
 
-def replicate_data_across_regions(data, table_name):
+def replicate_data_across_regions(data, table_name, cache=None):
     """Replicate data to all regions."""
     # Preprocess the data
     data = preprocess_data(data, table_name)
@@ -122,10 +172,17 @@ def replicate_data_across_regions(data, table_name):
     with ThreadPoolExecutor(max_workers=len(regions)) as executor:
         for region in regions.values():
             dynamodb = initialize_dynamodb(region)
-            executor.submit(write_data_in_chunks, dynamodb, table_name, data)
+            executor.submit(write_data_in_chunks, dynamodb, table_name, data, cache)
 
 
-def main():
+def main(cache=None):
+    """
+    Load every table.
+
+    Args:
+        cache: Read-through cache whose entries are invalidated per written table, e.g. the
+            analyzer's cache when the load runs in the analyzer's process
+    """
     # File paths for JSON data
     files = {
         "Users": "users.json",
@@ -136,19 +193,22 @@ def main():
 
     # Load and distribute Users table data
     users_data = load_json_data(files["Users"])
-    distribute_data_across_regions(users_data, "Users", column_name="location")
+    distribute_data_across_regions(users_data, "Users", column_name="location", cache=cache)
 
     # Load and distribute RegionalTrends table data
     regional_trends_data = load_json_data(files["RegionalTrends"])
-    distribute_data_across_regions(regional_trends_data, "RegionalTrends", column_name="region")
+    distribute_data_across_regions(regional_trends_data, "RegionalTrends", column_name="region", cache=cache)
 
     # Load and replicate Content table data
     content_data = load_json_data(files["Content"])
-    replicate_data_across_regions(content_data, "Content")
+    replicate_data_across_regions(content_data, "Content", cache=cache)
 
     # Load and replicate InteractionHistory table data
     interaction_history_data = load_json_data(files["InteractionHistory"])
-    replicate_data_across_regions(interaction_history_data, "InteractionHistory")
+    replicate_data_across_regions(interaction_history_data, "InteractionHistory", cache=cache)
+
+    # Replicate the same interactions into the time-ordered schema variant
+    replicate_data_across_regions(interaction_history_data, "InteractionHistoryByTime", cache=cache)
 
     print("Data loading completed across regions.")
 
@@ -1,20 +1,29 @@
 import boto3
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import Attr, Key
 from botocore.config import Config
 from collections import defaultdict
+import random
 import time
 import statistics
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import psutil
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 from decouple import config
+from load_tables import main as load_all_tables, parse_timestamp, time_ordered_sort_key
+from read_through_cache import ReadThroughCache
+from region_router import RegionRouter
+from user_directory import UserDirectory
 
 
 class DynamoDBPerformanceAnalyzer:
-    def __init__(self):
+    def __init__(self, cache=None):
         """
         Initialize the performance analyzer for DynamoDB with a larger connection pool.
+
+        Args:
+            cache: Read-through cache used by the cached queries; defaults to an in-process LRU with TTL
         """
         self.regions = {
             "us-east-1": "North America",
@@ -45,13 +54,27 @@ class DynamoDBPerformanceAnalyzer:
             for region in self.regions.keys()
         }
 
+        # Location name -> AWS region, the static mapping used by the loader
+        self.location_regions = {location: region for region, location in self.regions.items()}
+
+        # Latency-aware router over the same regions
+        self.router = RegionRouter()
+
+        # user_id -> home partition directory backed by the Users user_id GSI
+        self.user_directory = UserDirectory(self.dynamodb_resources, self.location_regions)
+
+        # Read-through cache in front of the regional queries
+        self.cache = cache if cache is not None else ReadThroughCache()
+
     def initialize_dynamodb(self, region_name: str):
         """Get the pre-initialized DynamoDB resource for a region."""
         return self.dynamodb_resources[region_name]
 
-    def scan_table(self, table_name: str, dynamodb):
+    def scan_table(self, table_name: str, dynamodb, raise_errors: bool = False):
         """
         Scan a DynamoDB table and retrieve all items.
+
+        Errors are logged and an empty list returned, unless raise_errors is set.
         """
         table = dynamodb.Table(table_name)
         try:
@@ -59,10 +82,19 @@ class DynamoDBPerformanceAnalyzer:
             return response.get("Items", [])
         except Exception as e:
             self.logger.error(f"Error scanning {table_name}: {e}")
+            if raise_errors:
+                raise
             return []
 
     def measure_query_performance(
-        self, table_name: str, query_func, query_name: str, num_requests: int, concurrent_users: int
+        self,
+        table_name: str,
+        query_func,
+        query_name: str,
+        num_requests: int,
+        concurrent_users: int,
+        warmup_requests: int = 0,
+        window_seconds: float = 1.0,
     ) -> Dict[str, float]:
         """
         Measure the performance of a query function.
@@ -73,30 +105,43 @@ class DynamoDBPerformanceAnalyzer:
             query_name (str): Name of the query
             num_requests (int): Number of requests to simulate
             concurrent_users (int): Number of concurrent users
+            warmup_requests (int): Untimed requests run first to open connections and TLS sessions
+            window_seconds (float): Width of the throughput/latency time series windows
 
         Returns:
             dict: Performance metrics
         """
-        response_times: List[float] = []
+        # (completion offset ms, response time ms) per timed request
+        samples: List[Tuple[float, float]] = []
+        run_start = [0.0]
 
-        def execute_query():
+        def execute_query(timed: bool = True):
             """Execute a single query and track response time."""
             start_time = time.perf_counter()
             query_func()
-            response_time = (time.perf_counter() - start_time) * 1000  # Convert to ms
-            response_times.append(response_time)
+            end_time = time.perf_counter()
+            if timed:
+                samples.append(((end_time - run_start[0]) * 1000, (end_time - start_time) * 1000))  # Convert to ms
 
         # Initial system stats
         initial_cpu = psutil.cpu_percent()
         initial_memory = psutil.virtual_memory().percent
 
-        # Execute queries concurrently
-        start_time = time.perf_counter()
         with ThreadPoolExecutor(max_workers=concurrent_users) as executor:
+            # Warmup requests reuse the same workers and connection pool, results discarded
+            if warmup_requests:
+                warmup_futures = [executor.submit(execute_query, False) for _ in range(warmup_requests)]
+                list(as_completed(warmup_futures))
+
+            # Execute queries concurrently
+            run_start[0] = start_time = time.perf_counter()
             futures = [executor.submit(execute_query) for _ in range(num_requests)]
             list(as_completed(futures))  # Wait for all futures
         total_execution_time = (time.perf_counter() - start_time) * 1000  # in ms
 
+        samples.sort()
+        response_times = [response_time for _, response_time in samples]
+
         # Calculate metrics
         metrics = {
             "total_execution_time_ms": total_execution_time,
@@ -109,11 +154,81 @@ class DynamoDBPerformanceAnalyzer:
             else 0,
             "cpu_utilization_increase": psutil.cpu_percent() - initial_cpu,
             "memory_utilization_increase": psutil.virtual_memory().percent - initial_memory,
+            "warmup_requests": warmup_requests,
         }
+        metrics.update(self._steady_state_metrics(samples, total_execution_time))
+        metrics["time_series"] = self._build_time_series(samples, total_execution_time, window_seconds)
 
         # Log performance metrics
         self._log_performance_metrics(query_name, metrics)
         return metrics
+
+    def _detect_steady_state(self, response_times: List[float], tolerance: float = 0.2, min_blocks: int = 3) -> Optional[int]:
+        """
+        Find where latencies stop trending, in completion order.
+
+        Requests are grouped into blocks; the steady state begins at the first block
+        whose next `min_blocks` block means are within `tolerance` of the median block
+        mean of everything after it.
+
+        Returns:
+            int: Index of the first steady-state request, or None if never reached
+        """
+        block_size = max(5, len(response_times) // 20)
+        block_means = [
+            statistics.mean(response_times[i:i + block_size])
+            for i in range(0, len(response_times) - block_size + 1, block_size)
+        ]
+        for block in range(len(block_means) - min_blocks + 1):
+            median = statistics.median(block_means[block:])
+            window = block_means[block:block + min_blocks]
+            if median > 0 and all(abs(mean - median) / median <= tolerance for mean in window):
+                return block * block_size
+        return None
+
+    def _steady_state_metrics(self, samples: List[Tuple[float, float]], total_execution_time: float) -> Dict[str, Any]:
+        """Average latency and throughput of the requests after the steady-state point."""
+        start_index = self._detect_steady_state([response_time for _, response_time in samples])
+        if start_index is None:
+            return {
+                "steady_state_start_ms": None,
+                "steady_state_requests": 0,
+                "steady_state_avg_response_time_ms": None,
+                "steady_state_throughput_queries_per_sec": None,
+            }
+
+        steady_start = samples[start_index - 1][0] if start_index else 0.0
+        steady_times = [response_time for _, response_time in samples[start_index:]]
+        steady_duration = max(total_execution_time - steady_start, 1e-9)
+        return {
+            "steady_state_start_ms": steady_start,
+            "steady_state_requests": len(steady_times),
+            "steady_state_avg_response_time_ms": statistics.mean(steady_times),
+            "steady_state_throughput_queries_per_sec": len(steady_times) / (steady_duration / 1000),
+        }
+
+    def _build_time_series(
+        self, samples: List[Tuple[float, float]], total_execution_time: float, window_seconds: float
+    ) -> List[Dict[str, float]]:
+        """Per-window request count, throughput and latency over the timed run."""
+        window_ms = window_seconds * 1000
+        num_windows = max(1, int(total_execution_time // window_ms) + 1)
+        windows: List[List[float]] = [[] for _ in range(num_windows)]
+        for completed_at, response_time in samples:
+            windows[min(int(completed_at // window_ms), num_windows - 1)].append(response_time)
+
+        time_series = []
+        for index, response_times in enumerate(windows):
+            window_start = index * window_ms
+            window_length = min(window_ms, total_execution_time - window_start) or window_ms
+            time_series.append({
+                "window_start_ms": window_start,
+                "requests": len(response_times),
+                "throughput_queries_per_sec": len(response_times) / (window_length / 1000),
+                "avg_response_time_ms": statistics.mean(response_times) if response_times else None,
+                "max_response_time_ms": max(response_times) if response_times else None,
+            })
+        return time_series
     
     def _log_performance_metrics(self, query_name: str, metrics: Dict[str, float]):
         """
@@ -140,15 +255,30 @@ class DynamoDBPerformanceAnalyzer:
         
         for description, key, unit in log_format:
             self.logger.info(f"{description:<30}: {metrics[key]:.2f} {unit}")
+
+        if metrics.get("steady_state_start_ms") is None:
+            self.logger.info(f"{'Steady State':<30}: not reached")
+        else:
+            self.logger.info(f"{'Steady State Start':<30}: {metrics['steady_state_start_ms']:.2f} ms")
+            self.logger.info(f"{'Steady State Avg Response':<30}: {metrics['steady_state_avg_response_time_ms']:.2f} ms")
+            self.logger.info(f"{'Steady State Throughput':<30}: {metrics['steady_state_throughput_queries_per_sec']:.2f} queries/sec")
+
+        for window in metrics.get("time_series", []):
+            avg_response = window["avg_response_time_ms"]
+            self.logger.info(
+                f"  t={window['window_start_ms'] / 1000:>6.1f}s  requests={window['requests']:<6} "
+                f"throughput={window['throughput_queries_per_sec']:.2f} q/s  "
+                f"avg={'-' if avg_response is None else f'{avg_response:.2f} ms'}"
+            )
         
         self.logger.info(f"{'='*50}\n")
 
-    def regional_query(self, dynamodb, region):
+    def regional_query(self, dynamodb, region, raise_errors: bool = False):
         """
         Perform the regional query in region.
         """
         table_name = "RegionalTrends"
-        items = self.scan_table(table_name, dynamodb)
+        items = self.scan_table(table_name, dynamodb, raise_errors=raise_errors)
 
         # Filter and sort items for region
         asia_items = [item for item in items if item.get("region") == region]
@@ -162,6 +292,70 @@ class DynamoDBPerformanceAnalyzer:
 
         return sorted_items[:10]  # Limit to top 10
 
+    def cached_regional_query(self, dynamodb, region):
+        """
+        Regional query served through the read-through cache.
+
+        The key is scoped to the table so loader writes to RegionalTrends invalidate it.
+        A failed scan raises inside the loader, so the empty error result is returned
+        without being cached and the next request retries the backend.
+        """
+        key = ("RegionalTrends", dynamodb.meta.client.meta.region_name, region)
+        try:
+            return self.cache.get_or_load(key, lambda: self.regional_query(dynamodb, region, raise_errors=True))
+        except Exception:
+            return []
+
+    def reload_tables(self):
+        """
+        Run the loader in this process with the analyzer's cache, so every table it writes
+        drops its cached reads.
+        """
+        load_all_tables(cache=self.cache)
+
+    def compare_regional_cache(
+        self, aws_region: str = "ap-south-1", num_requests: int = 200, concurrent_users: int = 20
+    ) -> Dict[str, Any]:
+        """
+        Benchmark a regional query with and without the read-through cache.
+
+        Args:
+            aws_region (str): AWS region whose RegionalTrends table is queried
+            num_requests (int): Number of requests per variant
+            concurrent_users (int): Number of concurrent users
+
+        Returns:
+            dict: Uncached and cached metrics, the cached ones including cache statistics
+        """
+        region = self.regions[aws_region]
+        dynamodb = self.initialize_dynamodb(aws_region)
+
+        uncached_metrics = self.measure_query_performance(
+            table_name="RegionalTrends",
+            query_func=lambda: self.regional_query(dynamodb, region),
+            query_name=f"{region} Regional Query (uncached)",
+            num_requests=num_requests,
+            concurrent_users=concurrent_users,
+        )
+
+        # Start cold so the first concurrent misses exercise request coalescing
+        self.cache.clear()
+        self.cache.reset_stats()
+        cached_metrics = self.measure_query_performance(
+            table_name="RegionalTrends",
+            query_func=lambda: self.cached_regional_query(dynamodb, region),
+            query_name=f"{region} Regional Query (cached)",
+            num_requests=num_requests,
+            concurrent_users=concurrent_users,
+        )
+        cached_metrics["cache"] = self.cache.stats()
+        self.logger.info(f"Cache statistics: {cached_metrics['cache']}")
+        self.logger.info(f"Cached vs uncached average latency: "
+                         f"{cached_metrics['avg_response_time_ms']:.2f} ms vs "
+                         f"{uncached_metrics['avg_response_time_ms']:.2f} ms")
+
+        return {"uncached": uncached_metrics, "cached": cached_metrics}
+
     def global_query(self):
         """
         Perform the global query across all regions.
@@ -187,6 +381,255 @@ class DynamoDBPerformanceAnalyzer:
         sorted_aggregated = sorted(aggregated.items(), key=lambda x: -x[1])
         return sorted_aggregated[:5]
 
+    def load_sample_users(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Load a sample of users with their coordinates from every regional Users table.
+
+        Args:
+            limit (int): Maximum number of users read per region
+
+        Returns:
+            list: Users with user_id, location, latitude and longitude
+        """
+        users = []
+        for region in self.regions.keys():
+            table = self.initialize_dynamodb(region).Table("Users")
+            try:
+                response = table.scan(
+                    ProjectionExpression="user_id, #loc, latitude, longitude",
+                    ExpressionAttributeNames={"#loc": "location"},
+                    Limit=limit,
+                )
+                users.extend(response.get("Items", []))
+            except Exception as e:
+                self.logger.error(f"Error sampling users in {region}: {e}")
+        return users
+
+    def user_interaction_query(self, dynamodb, user_id: str):
+        """
+        Fetch a user's interaction history from the replicated InteractionHistory table.
+
+        Errors are raised rather than swallowed so the router can fail over.
+        """
+        table = dynamodb.Table("InteractionHistory")
+        response = table.query(KeyConditionExpression=Key("user_id").eq(user_id))
+        return response.get("Items", [])
+
+    def static_user_query(self, user: Dict[str, Any]):
+        """Serve the user's read from the region hard-mapped to their location."""
+        dynamodb = self.initialize_dynamodb(self.location_regions[user["location"]])
+        return self.user_interaction_query(dynamodb, user["user_id"])
+
+    def routed_user_query(self, user: Dict[str, Any]):
+        """Serve the user's read from the fastest healthy region near their coordinates."""
+        _, items = self.router.route(
+            float(user["latitude"]),
+            float(user["longitude"]),
+            lambda region: self.user_interaction_query(self.initialize_dynamodb(region), user["user_id"]),
+        )
+        return items
+
+    def compare_routing(self, num_requests: int = 200, concurrent_users: int = 20) -> Dict[str, Any]:
+        """
+        Benchmark per-user reads with the static location mapping against latency-aware routing.
+
+        Args:
+            num_requests (int): Number of requests per strategy
+            concurrent_users (int): Number of concurrent users
+
+        Returns:
+            dict: Metrics for both strategies and the router state after the run
+        """
+        users = self.load_sample_users()
+        if not users:
+            self.logger.error("No users available for the routing comparison")
+            return {}
+
+        static_metrics = self.measure_query_performance(
+            table_name="InteractionHistory",
+            query_func=lambda: self.static_user_query(random.choice(users)),
+            query_name="Static Region User Query",
+            num_requests=num_requests,
+            concurrent_users=concurrent_users,
+            warmup_requests=concurrent_users,
+        )
+        routed_metrics = self.measure_query_performance(
+            table_name="InteractionHistory",
+            query_func=lambda: self.routed_user_query(random.choice(users)),
+            query_name="Routed Region User Query",
+            num_requests=num_requests,
+            concurrent_users=concurrent_users,
+            warmup_requests=concurrent_users,
+        )
+
+        router_state = self.router.snapshot()
+        speedup = static_metrics["avg_response_time_ms"] / routed_metrics["avg_response_time_ms"]
+        self.logger.info(f"Routed vs static average latency: "
+                         f"{routed_metrics['avg_response_time_ms']:.2f} ms vs "
+                         f"{static_metrics['avg_response_time_ms']:.2f} ms ({speedup:.2f}x)")
+        for region, state in router_state.items():
+            self.logger.info(f"Router {region}: {state}")
+
+        return {"static": static_metrics, "routed": routed_metrics, "router": router_state}
+
+    def scan_user_lookup(self, user_id: str):
+        """
+        Find a user by id without knowing its location by scanning each regional Users table.
+        """
+        for region in self.regions.keys():
+            table = self.initialize_dynamodb(region).Table("Users")
+            scan_kwargs = {"FilterExpression": Attr("user_id").eq(user_id)}
+            while True:
+                response = table.scan(**scan_kwargs)
+                if response.get("Items"):
+                    return response["Items"][0]
+                if "LastEvaluatedKey" not in response:
+                    break
+                scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        return None
+
+    def compare_user_lookup(self, num_requests: int = 200, concurrent_users: int = 20) -> Dict[str, Any]:
+        """
+        Benchmark user-by-id lookups: directory + single GetItem against a cross-region scan.
+
+        Args:
+            num_requests (int): Number of requests per strategy
+            concurrent_users (int): Number of concurrent users
+
+        Returns:
+            dict: Directory load time and metrics for both strategies
+        """
+        start_time = time.perf_counter()
+        directory_size = self.user_directory.load()
+        load_time_ms = (time.perf_counter() - start_time) * 1000
+        self.logger.info(f"User directory loaded {directory_size} users in {load_time_ms:.2f} ms")
+        if not directory_size:
+            self.logger.error("User directory is empty, skipping user lookup comparison")
+            return {}
+
+        user_ids = random.sample(self.user_directory.user_ids(), min(directory_size, 100))
+
+        directory_metrics = self.measure_query_performance(
+            table_name="Users",
+            query_func=lambda: self.user_directory.get_user(random.choice(user_ids)),
+            query_name="Directory User Lookup",
+            num_requests=num_requests,
+            concurrent_users=concurrent_users,
+            warmup_requests=concurrent_users,
+        )
+        scan_metrics = self.measure_query_performance(
+            table_name="Users",
+            query_func=lambda: self.scan_user_lookup(random.choice(user_ids)),
+            query_name="Scan User Lookup",
+            num_requests=num_requests,
+            concurrent_users=concurrent_users,
+            warmup_requests=concurrent_users,
+        )
+
+        return {
+            "directory_load_time_ms": load_time_ms,
+            "directory_size": directory_size,
+            "directory": directory_metrics,
+            "scan": scan_metrics,
+        }
+
+    def recent_interactions_query(self, dynamodb, user_id: str, limit: int = 10):
+        """
+        Last `limit` interactions of a user from the time-ordered table, newest first.
+        """
+        table = dynamodb.Table("InteractionHistoryByTime")
+        response = table.query(
+            KeyConditionExpression=Key("user_id").eq(user_id),
+            ScanIndexForward=False,
+            Limit=limit,
+        )
+        return response.get("Items", [])
+
+    def interactions_since_query(self, dynamodb, user_id: str, since: datetime, limit: int = 100):
+        """
+        Interactions of a user at or after `since` from the time-ordered table, newest first.
+        """
+        table = dynamodb.Table("InteractionHistoryByTime")
+        response = table.query(
+            KeyConditionExpression=Key("user_id").eq(user_id)
+            & Key("interaction_time_id").gte(time_ordered_sort_key(since)),
+            ScanIndexForward=False,
+            Limit=limit,
+        )
+        return response.get("Items", [])
+
+    def legacy_user_interactions(self, dynamodb, user_id: str):
+        """Read a user's whole InteractionHistory partition, sorted newest first in Python."""
+        table = dynamodb.Table("InteractionHistory")
+        query_kwargs = {"KeyConditionExpression": Key("user_id").eq(user_id)}
+        items = []
+        while True:
+            response = table.query(**query_kwargs)
+            items.extend(response.get("Items", []))
+            if "LastEvaluatedKey" not in response:
+                break
+            query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        return sorted(items, key=lambda item: item["timestamp"], reverse=True)
+
+    def benchmark_recent_activity(
+        self, region: str = "us-east-1", limit: int = 10, since_days: int = 180, since_limit: int = 100,
+        num_requests: int = 200, concurrent_users: int = 20
+    ) -> Dict[str, Any]:
+        """
+        Benchmark "last N" and "since T" reads on the time-ordered schema against the flat one.
+
+        Args:
+            region (str): AWS region serving the replicated interaction tables
+            limit (int): N for the last-N query
+            since_days (int): Window of the since-T query, counted back from the newest interaction
+            since_limit (int): Most interactions returned by either since-T variant
+            num_requests (int): Number of requests per query
+            concurrent_users (int): Number of concurrent users
+
+        Returns:
+            dict: Metrics for each query variant
+        """
+        dynamodb = self.initialize_dynamodb(region)
+        sample = dynamodb.Table("InteractionHistoryByTime").scan(
+            ProjectionExpression="user_id, #ts", ExpressionAttributeNames={"#ts": "timestamp"}, Limit=500
+        ).get("Items", [])
+        if not sample:
+            self.logger.error("InteractionHistoryByTime is empty, skipping recent-activity benchmark")
+            return {}
+
+        user_ids = list({item["user_id"] for item in sample})
+        newest = max(parse_timestamp(item["timestamp"]) for item in sample)
+        since = (newest if newest.tzinfo else newest.replace(tzinfo=timezone.utc)) - timedelta(days=since_days)
+        since_iso = since.replace(tzinfo=None).isoformat()
+
+        queries = {
+            "Recent Interactions (time-ordered)": lambda: self.recent_interactions_query(
+                dynamodb, random.choice(user_ids), limit
+            ),
+            "Recent Interactions (flat)": lambda: self.legacy_user_interactions(
+                dynamodb, random.choice(user_ids)
+            )[:limit],
+            "Interactions Since (time-ordered)": lambda: self.interactions_since_query(
+                dynamodb, random.choice(user_ids), since, since_limit
+            ),
+            "Interactions Since (flat)": lambda: [
+                item for item in self.legacy_user_interactions(dynamodb, random.choice(user_ids))
+                if item["timestamp"] >= since_iso
+            ][:since_limit],
+        }
+
+        results = {}
+        for query_name, query_func in queries.items():
+            results[query_name] = self.measure_query_performance(
+                table_name="InteractionHistoryByTime",
+                query_func=query_func,
+                query_name=query_name,
+                num_requests=num_requests,
+                concurrent_users=concurrent_users,
+                warmup_requests=concurrent_users,
+            )
+        return results
+
     def execute_queries(self):
         """
         Execute both regional and global queries and measure their performance.
@@ -200,6 +643,7 @@ class DynamoDBPerformanceAnalyzer:
             query_name="Asia Regional Query",
             num_requests=200,
             concurrent_users=20,
+            warmup_requests=20,
         )
         self.logger.info(f"Regional Query Metrics: {regional_metrics}")
         
@@ -212,6 +656,7 @@ class DynamoDBPerformanceAnalyzer:
             query_name="North America Regional Query",
             num_requests=200,
             concurrent_users=20,
+            warmup_requests=20,
         )
         self.logger.info(f"Regional Query Metrics: {regional_metrics}")
         
@@ -224,6 +669,7 @@ class DynamoDBPerformanceAnalyzer:
             query_name="South America Regional Query",
             num_requests=200,
             concurrent_users=20,
+            warmup_requests=20,
         )
         self.logger.info(f"Regional Query Metrics: {regional_metrics}")
         
@@ -236,6 +682,7 @@ class DynamoDBPerformanceAnalyzer:
             query_name="Europe Regional Query",
             num_requests=200,
             concurrent_users=20,
+            warmup_requests=20,
         )
         self.logger.info(f"Regional Query Metrics: {regional_metrics}")
 
@@ -247,9 +694,30 @@ class DynamoDBPerformanceAnalyzer:
             query_name="Global Content Query",
             num_requests=1000,
             concurrent_users=100,
+            warmup_requests=100,
         )
         self.logger.info(f"Global Query Metrics: {global_metrics}")
 
+        # Nearest-region routing vs static location mapping
+        self.logger.info("Executing User Query Routing Comparison...")
+        routing_metrics = self.compare_routing()
+        self.logger.info(f"Routing Comparison Metrics: {routing_metrics}")
+
+        # User-by-id lookup through the user directory vs scanning
+        self.logger.info("Executing User Lookup Comparison...")
+        lookup_metrics = self.compare_user_lookup()
+        self.logger.info(f"User Lookup Comparison Metrics: {lookup_metrics}")
+
+        # Recent-activity range queries on the time-ordered interaction schema
+        self.logger.info("Executing Recent Activity Queries...")
+        recent_activity_metrics = self.benchmark_recent_activity()
+        self.logger.info(f"Recent Activity Metrics: {recent_activity_metrics}")
+
+        # Regional query with and without the read-through cache
+        self.logger.info("Executing Regional Cache Comparison (Asia)...")
+        cache_metrics = self.compare_regional_cache()
+        self.logger.info(f"Regional Cache Comparison Metrics: {cache_metrics}")
+
 
 # Main Script
 def main():
@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+
+class ReadThroughCache:
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60.0):
+        """
+        In-process LRU read-through cache with TTL and request coalescing.
+
+        Keys are tuples whose first element is the DynamoDB table name, so writes to a
+        table can invalidate every cached read of it. Any object exposing the same
+        get_or_load / invalidate / invalidate_table / clear / reset_stats / stats methods
+        (e.g. a DAX-backed client wrapper) can be passed to the analyzer instead. A loader
+        that raises is not cached.
+
+        Args:
+            max_entries (int): Maximum cached keys before least-recently-used eviction
+            ttl_seconds (float): Time a loaded value stays fresh
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        self._inflight: Dict[Hashable, Future] = {}
+        self._generation = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Zero the hit/miss counters, e.g. between benchmark runs."""
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for `key`, loading it on a miss.
+
+        Concurrent misses for the same key wait on the first caller's load instead of
+        issuing their own backend call.
+        """
+        leader = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+            pending = self._inflight.get(key)
+            if pending is not None:
+                self.coalesced += 1
+            else:
+                self.misses += 1
+                pending = self._inflight[key] = Future()
+                generation = self._generation
+                leader = True
+
+        if not leader:
+            return pending.result()
+
+        try:
+            value = loader()
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            pending.set_exception(e)
+            raise
+
+        with self._lock:
+            self._inflight.pop(key, None)
+            # Skip storing if an invalidation raced with the load
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        pending.set_result(value)
+        return value
+
+    def invalidate(self, key: Hashable):
+        """Drop a single key."""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(key, None)
+
+    def invalidate_table(self, table_name: str):
+        """Drop every cached read of a table; called by the loader after writes."""
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._entries if isinstance(key, tuple) and key and key[0] == table_name]:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop everything."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and the hit ratio (coalesced waits count as hits)."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0
+        }
@@ -0,0 +1,139 @@
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Approximate coordinates of the AWS data centers hosting each regional replica
+REGION_COORDINATES = {
+    "us-east-1": (38.13, -78.45),     # N. Virginia
+    "sa-east-1": (-23.55, -46.63),    # Sao Paulo
+    "eu-central-1": (50.11, 8.68),    # Frankfurt
+    "ap-south-1": (19.08, 72.88)      # Mumbai
+}
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two coordinates in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = math.radians(lat2 - lat1)
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class RegionRouter:
+    def __init__(
+        self,
+        region_coordinates: Dict[str, Tuple[float, float]] = None,
+        max_candidates: int = 2,
+        alpha: float = 0.2,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0
+    ):
+        """
+        Route reads to the fastest healthy region near a user.
+
+        Args:
+            region_coordinates (dict): AWS region -> (latitude, longitude)
+            max_candidates (int): Number of nearest regions considered for a read
+            alpha (float): Smoothing factor of the per-region latency EWMA
+            failure_threshold (int): Consecutive failures before a region is marked unhealthy
+            cooldown_seconds (float): Time before an unhealthy region is probed again
+        """
+        self.region_coordinates = region_coordinates or REGION_COORDINATES
+        self.max_candidates = max_candidates
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+
+        self._lock = threading.Lock()
+        self._ewma_ms: Dict[str, Optional[float]] = {region: None for region in self.region_coordinates}
+        self._failures: Dict[str, int] = {region: 0 for region in self.region_coordinates}
+        self._unhealthy_since: Dict[str, Optional[float]] = {region: None for region in self.region_coordinates}
+        self._requests: Dict[str, int] = {region: 0 for region in self.region_coordinates}
+
+    def candidate_regions(self, latitude: float, longitude: float) -> List[str]:
+        """Return every region ordered by distance from the given coordinates."""
+        return sorted(
+            self.region_coordinates,
+            key=lambda region: haversine_km(latitude, longitude, *self.region_coordinates[region])
+        )
+
+    def is_healthy(self, region: str) -> bool:
+        """A region is healthy unless it failed repeatedly and is still cooling down."""
+        unhealthy_since = self._unhealthy_since[region]
+        if unhealthy_since is None:
+            return True
+        return time.monotonic() - unhealthy_since >= self.cooldown_seconds
+
+    def select_regions(self, latitude: float, longitude: float) -> List[str]:
+        """
+        Order regions in the sequence they should be tried for a read.
+
+        The nearest `max_candidates` healthy regions come first, fastest EWMA first
+        (regions without a measurement yet are tried before measured ones so they get
+        sampled). The remaining regions follow by distance as failover targets.
+        """
+        by_distance = self.candidate_regions(latitude, longitude)
+        with self._lock:
+            healthy = [region for region in by_distance if self.is_healthy(region)]
+            unhealthy = [region for region in by_distance if not self.is_healthy(region)]
+            candidates = healthy[:self.max_candidates]
+            candidates.sort(key=lambda region: -1.0 if self._ewma_ms[region] is None else self._ewma_ms[region])
+        return candidates + healthy[self.max_candidates:] + unhealthy
+
+    def record_success(self, region: str, latency_ms: float):
+        """Fold a successful read into the region's EWMA and reset its failure count."""
+        with self._lock:
+            previous = self._ewma_ms[region]
+            self._ewma_ms[region] = latency_ms if previous is None else self.alpha * latency_ms + (1 - self.alpha) * previous
+            self._failures[region] = 0
+            self._unhealthy_since[region] = None
+            self._requests[region] += 1
+
+    def record_failure(self, region: str):
+        """Count a failed read and mark the region unhealthy once the threshold is hit."""
+        with self._lock:
+            self._failures[region] += 1
+            if self._failures[region] >= self.failure_threshold:
+                self._unhealthy_since[region] = time.monotonic()
+
+    def route(self, latitude: float, longitude: float, read_func: Callable[[str], Any]) -> Tuple[str, Any]:
+        """
+        Execute a read against the best region, failing over on errors.
+
+        Args:
+            latitude (float): User latitude
+            longitude (float): User longitude
+            read_func (callable): Called with the AWS region name; must raise on failure
+
+        Returns:
+            tuple: (region that served the read, read result)
+        """
+        last_error = None
+        for region in self.select_regions(latitude, longitude):
+            start_time = time.perf_counter()
+            try:
+                result = read_func(region)
+            except Exception as e:
+                self.record_failure(region)
+                last_error = e
+                continue
+            self.record_success(region, (time.perf_counter() - start_time) * 1000)
+            return region, result
+        raise RuntimeError(f"All regions failed for read at ({latitude}, {longitude})") from last_error
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Current EWMA latency, health and request count per region."""
+        with self._lock:
+            return {
+                region: {
+                    "ewma_latency_ms": self._ewma_ms[region],
+                    "healthy": self.is_healthy(region),
+                    "consecutive_failures": self._failures[region],
+                    "requests_served": self._requests[region]
+                }
+                for region in self.region_coordinates
+            }
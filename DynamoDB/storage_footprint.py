@@ -0,0 +1,72 @@
+from botocore.exceptions import ClientError
+
+from create_load_tables import initialize_dynamodb, regions
+
+# Tables created by create_load_tables.py
+TABLES = ["Users", "RegionalTrends", "Content", "InteractionHistory", "InteractionHistoryByTime"]
+
+
+def describe_footprint(dynamodb, table_name):
+    """
+    Table and GSI sizes from DescribeTable.
+
+    DynamoDB refreshes TableSizeBytes and ItemCount about every six hours, so sizes of
+    freshly loaded tables lag behind. It has no compression setting; the table class only
+    changes the price per GB.
+    """
+    table = dynamodb.meta.client.describe_table(TableName=table_name)['Table']
+    records = table.get('ItemCount', 0)
+    table_bytes = table.get('TableSizeBytes', 0)
+    index_bytes = sum(index.get('IndexSizeBytes', 0) for index in table.get('GlobalSecondaryIndexes', []))
+    total_bytes = table_bytes + index_bytes
+    return {
+        'table_class': table.get('TableClassSummary', {}).get('TableClass', 'STANDARD'),
+        'records': records,
+        'table_bytes': table_bytes,
+        'index_bytes': index_bytes,
+        'total_bytes': total_bytes,
+        'bytes_per_record': total_bytes / records if records else None
+    }
+
+
+def collect_footprints():
+    """Footprint of every table in every region."""
+    footprints = {}
+    for region in regions:
+        dynamodb = initialize_dynamodb(region)
+        for table_name in TABLES:
+            try:
+                footprints[(region, table_name)] = describe_footprint(dynamodb, table_name)
+            except ClientError as e:
+                print(f"ClientError: {e.response['Error']['Message']} for table {table_name} in region {region}")
+    return footprints
+
+
+def print_footprints(footprints):
+    print(f"{'Region':<14}  {'Table':<26}  {'Class':<27}  {'Records':>9}  {'Table MiB':>9}  "
+          f"{'GSI MiB':>8}  {'Bytes/record':>12}")
+    for (region, table_name), entry in footprints.items():
+        bytes_per_record = entry['bytes_per_record']
+        print(
+            f"{region:<14}  {table_name:<26}  {entry['table_class']:<27}  {entry['records']:>9}  "
+            f"{entry['table_bytes'] / 1024 ** 2:>9.2f}  {entry['index_bytes'] / 1024 ** 2:>8.2f}  "
+            f"{'-' if bytes_per_record is None else f'{bytes_per_record:.1f}':>12}"
+        )
+
+    totals = {}
+    for (_, table_name), entry in footprints.items():
+        records, total_bytes = totals.get(table_name, (0, 0))
+        totals[table_name] = (records + entry['records'], total_bytes + entry['total_bytes'])
+    print()
+    print(f"{'All regions':<14}  {'Table':<26}  {'Records':>9}  {'Total MiB':>9}  {'Bytes/record':>12}")
+    for table_name, (records, total_bytes) in totals.items():
+        bytes_per_record = f"{total_bytes / records:.1f}" if records else "-"
+        print(f"{'':<14}  {table_name:<26}  {records:>9}  {total_bytes / 1024 ** 2:>9.2f}  {bytes_per_record:>12}")
+
+
+def main():
+    print_footprints(collect_footprints())
+
+
+if __name__ == "__main__":
+    main()
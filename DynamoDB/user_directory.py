@@ -0,0 +1,187 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from boto3.dynamodb.conditions import Key
+
+USER_ID_INDEX = "UserIdIndex"
+
+
+class UserLocation(NamedTuple):
+    """Compact directory entry: the user's home partition and coordinates."""
+    location: str
+    region: str
+    latitude: float
+    longitude: float
+    refreshed_at: float
+
+
+class UserDirectory:
+    def __init__(
+        self,
+        dynamodb_resources: Dict[str, Any],
+        location_regions: Dict[str, str],
+        table_name: str = "Users",
+        index_name: str = USER_ID_INDEX
+    ):
+        """
+        In-process user_id -> home region/coordinates directory for the location-partitioned Users table.
+
+        Args:
+            dynamodb_resources (dict): AWS region -> boto3 DynamoDB resource
+            location_regions (dict): Location name -> AWS region holding that partition
+            table_name (str): Users table name
+            index_name (str): GSI keyed on user_id
+        """
+        self.dynamodb_resources = dynamodb_resources
+        self.location_regions = location_regions
+        self.table_name = table_name
+        self.index_name = index_name
+
+        self._entries: Dict[str, UserLocation] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def user_ids(self) -> List[str]:
+        """Snapshot of the user ids currently in the directory."""
+        return list(self._entries.keys())
+
+    def _entry_from_item(self, item: Dict[str, Any]) -> UserLocation:
+        location = item["location"]
+        return UserLocation(
+            location=location,
+            region=self.location_regions[location],
+            latitude=float(item.get("latitude", 0)),
+            longitude=float(item.get("longitude", 0)),
+            refreshed_at=time.time()
+        )
+
+    def _scan_region(self, region: str) -> List[Dict[str, Any]]:
+        """Scan the user_id GSI of one region, following pagination."""
+        table = self.dynamodb_resources[region].Table(self.table_name)
+        scan_kwargs = {
+            "IndexName": self.index_name,
+            "ProjectionExpression": "user_id, #loc, latitude, longitude",
+            "ExpressionAttributeNames": {"#loc": "location"}
+        }
+        items = []
+        while True:
+            response = table.scan(**scan_kwargs)
+            items.extend(response.get("Items", []))
+            if "LastEvaluatedKey" not in response:
+                return items
+            scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def load(self) -> int:
+        """
+        Bulk-load the directory by scanning the user_id GSI in every region in parallel.
+
+        Returns:
+            int: Number of users in the directory
+        """
+        with ThreadPoolExecutor(max_workers=len(self.dynamodb_resources)) as executor:
+            results = list(executor.map(self._scan_region, self.dynamodb_resources.keys()))
+
+        entries = {item["user_id"]: self._entry_from_item(item) for items in results for item in items}
+        with self._lock:
+            self._entries.update(entries)
+        return len(self._entries)
+
+    def invalidate(self, user_id: str):
+        """Drop a user so the next lookup resolves it from the GSI again."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def _resolve(self, user_id: str) -> Optional[UserLocation]:
+        """Query the user_id GSI region by region until the user is found."""
+        for region, dynamodb in self.dynamodb_resources.items():
+            response = dynamodb.Table(self.table_name).query(
+                IndexName=self.index_name,
+                KeyConditionExpression=Key("user_id").eq(user_id),
+                Limit=1
+            )
+            items = response.get("Items", [])
+            if items:
+                return self._entry_from_item(items[0])
+        return None
+
+    def lookup(self, user_id: str) -> Optional[UserLocation]:
+        """
+        Resolve a user's home partition, O(1) on a directory hit.
+
+        Misses fall back to the GSI and are cached.
+        """
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            return entry
+        entry = self._resolve(user_id)
+        if entry is not None:
+            with self._lock:
+                self._entries[user_id] = entry
+        return entry
+
+    def refresh(
+        self,
+        user_ids: Iterable[str] = None,
+        max_age_seconds: float = None,
+        scan_threshold: int = 1000,
+        max_workers: int = 16
+    ) -> int:
+        """
+        Incrementally re-resolve directory entries from the GSI.
+
+        Up to `scan_threshold` stale users are resolved with concurrent GSI queries; above
+        that, one paginated GSI scan per region (as in load) is cheaper than a query per user.
+
+        Args:
+            user_ids (iterable): Users to refresh; defaults to every cached user
+            max_age_seconds (float): Only refresh entries older than this
+            scan_threshold (int): Stale users above which the GSI is scanned instead
+            max_workers (int): Concurrent GSI queries
+
+        Returns:
+            int: Number of entries refreshed
+        """
+        now = time.time()
+        candidates = list(self._entries.keys()) if user_ids is None else list(user_ids)
+        stale = []
+        for user_id in candidates:
+            entry = self._entries.get(user_id)
+            if entry is not None and max_age_seconds is not None and now - entry.refreshed_at < max_age_seconds:
+                continue
+            stale.append(user_id)
+        if not stale:
+            return 0
+
+        if len(stale) > scan_threshold:
+            with ThreadPoolExecutor(max_workers=len(self.dynamodb_resources)) as executor:
+                results = list(executor.map(self._scan_region, self.dynamodb_resources.keys()))
+            wanted = set(stale)
+            found = {
+                item["user_id"]: self._entry_from_item(item)
+                for items in results for item in items if item["user_id"] in wanted
+            }
+            resolved = [found.get(user_id) for user_id in stale]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(stale))) as executor:
+                resolved = list(executor.map(self._resolve, stale))
+
+        with self._lock:
+            for user_id, entry in zip(stale, resolved):
+                if entry is None:
+                    self._entries.pop(user_id, None)
+                else:
+                    self._entries[user_id] = entry
+        return len(stale)
+
+    def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch a full user record with a single GetItem against its home partition."""
+        entry = self.lookup(user_id)
+        if entry is None:
+            return None
+        table = self.dynamodb_resources[entry.region].Table(self.table_name)
+        response = table.get_item(Key={"location": entry.location, "user_id": user_id})
+        return response.get("Item")
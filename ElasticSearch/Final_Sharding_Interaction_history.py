@@ -1,5 +1,6 @@
 from elasticsearch import Elasticsearch
-from elasticsearch.helpers import bulk
+from bulk_ingest import ingest
+from interaction_stream import ensure_stream, backfill
 import json
 import hashlib
 
@@ -7,6 +8,10 @@ import hashlib
 es = Elasticsearch('https://localhost:9200', basic_auth=('elastic', 'uRmY*oulxBA8+N4m_4nW'), verify_certs=False)
 
 # Step 2: Define Index Settings and Mappings
+# True: rolling data stream, one primary per backing index and no routing key (see interaction_stream.py)
+# False: the original single 4-shard index with hashed routing keys
+use_data_stream = True
+
 index_name = "interaction_history"
 
 index_settings = {
@@ -25,7 +30,9 @@ index_settings = {
 }
 
 # Create the index if it doesn't exist
-if not es.indices.exists(index=index_name):
+if use_data_stream:
+    ensure_stream(es)
+elif not es.indices.exists(index=index_name):
     es.indices.create(index=index_name, body=index_settings)
     print(f"Index '{index_name}' created.")
 else:
@@ -60,13 +67,11 @@ def generate_documents(data):
             "routing": routing_key  # Custom routing
         }
 
-# Step 6: Bulk Upload Data
+# Step 6: Bulk Upload Data (parallel workers, refresh and replicas off during the load)
 try:
-    success, errors = bulk(es, generate_documents(interaction_data), raise_on_error=False)
-    print(f"Indexed {success} documents successfully.")
-    if errors:
-        print("Errors:")
-        for error in errors:
-            print(error)
+    if use_data_stream:
+        backfill(es, interaction_data)
+    else:
+        ingest(es, index_name, generate_documents(interaction_data))
 except Exception as e:
     print(f"Error during bulk upload: {e}")
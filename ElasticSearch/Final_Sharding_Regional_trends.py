@@ -1,5 +1,6 @@
 from elasticsearch import Elasticsearch
-from elasticsearch.helpers import bulk
+from bulk_ingest import ingest
+from region_layout import create_region_indices, read_alias, region_index, regions
 import json
 
 # Step 1: Initialize Elasticsearch Client
@@ -8,6 +9,21 @@ es = Elasticsearch('https://localhost:9200', basic_auth=('elastic', 'uRmY*oulxBA
 # Step 2: Define Index Settings and Mappings
 index_name = "regional_trends"
 
+# True: one single-shard index per region (regional_trends-<region>) behind the
+# regional_trends_regions alias, see region_layout.py
+# False: the original single 4-shard index with routing keys per region
+use_region_indices = True
+
+# Store documents ordered by engagement so top-K queries with the same sort (and
+# track_total_hits false) stop reading each segment after K hits. Index sorting can only
+# be set when the index is created; an existing index has to be deleted and reloaded.
+sort_by_engagement = True
+recreate_unsorted_index = False  # Delete an existing unsorted index so it is recreated sorted
+engagement_sort = {
+    "sort.field": ["engagement_metrics.total_views", "engagement_metrics.total_likes"],
+    "sort.order": ["desc", "desc"]
+}
+
 index_settings = {
     "settings": {
         "number_of_shards": 4,  # Shard into 4 regions
@@ -32,8 +48,30 @@ index_settings = {
     }
 }
 
+if sort_by_engagement:
+    index_settings["settings"]["index"] = engagement_sort
+
+# An existing index keeps the sort it was created with, so check what is actually there
+def check_index_sort(name):
+    settings = es.indices.get_settings(index=name)[name]["settings"]["index"]
+    if "sort" in settings:
+        return
+    if recreate_unsorted_index:
+        es.indices.delete(index=name)
+        print(f"Index '{name}' had no index sorting and was deleted, it is recreated sorted.")
+    else:
+        print(f"Warning: index '{name}' was created without index sorting, top-K queries on it cannot stop early. "
+              f"Delete it or set recreate_unsorted_index = True, then reload.")
+
+if sort_by_engagement:
+    for name in [region_index(index_name, region) for region in regions] if use_region_indices else [index_name]:
+        if es.indices.exists(index=name):
+            check_index_sort(name)
+
 # Create the index if it doesn't exist
-if not es.indices.exists(index=index_name):
+if use_region_indices:
+    create_region_indices(es, index_name, index_settings)
+elif not es.indices.exists(index=index_name):
     es.indices.create(index=index_name, body=index_settings)
     print(f"Index '{index_name}' created.")
 else:
@@ -59,21 +97,27 @@ def get_routing_key(region):
 # Step 5: Prepare Documents for Bulk Upload
 def generate_documents(data):
     for item in data:
-        yield {
+        document = {
             "_index": index_name,
             "_id": item["_id"]["$oid"],  # Use `_id` as the document ID
             "_source": {
                 "region": item["region"],
                 "top_content": item["top_content"],
                 "engagement_metrics": item["engagement_metrics"]
-            },
-            "routing": get_routing_key(item["region"])  # Custom routing
+            }
         }
+        if not use_region_indices:
+            document["routing"] = get_routing_key(item["region"])  # Custom routing
+        elif item["region"] in regions:
+            document["_index"] = region_index(index_name, item["region"])
+        else:
+            print(f"Skipped document {document['_id']} of unknown region '{item['region']}'")
+            continue
+        yield document
 
-# Step 6: Bulk Upload Data
+# Step 6: Bulk Upload Data (parallel workers, refresh and replicas off during the load)
 try:
-    bulk(es, generate_documents(regional_trends_data))
-    print("Data uploaded successfully!")
+    ingest(es, read_alias(index_name) if use_region_indices else index_name, generate_documents(regional_trends_data))
 except Exception as e:
     print(f"Error during bulk upload: {e}")
 
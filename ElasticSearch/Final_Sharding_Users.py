@@ -1,4 +1,6 @@
-from elasticsearch import Elasticsearch, helpers
+from elasticsearch import Elasticsearch
+from bulk_ingest import ingest
+from region_layout import create_region_indices, read_alias, region_index, regions
 import json
 
 
@@ -8,6 +10,11 @@ es = Elasticsearch('https://localhost:9200', basic_auth=('elastic', 'uRmY*oulxBA
 # Define the index name
 index_name = "users"
 
+# True: one single-shard index per location (users-<location>) behind the users_regions
+# alias, see region_layout.py
+# False: the original single 4-shard index with routing keys per location
+use_region_indices = True
+
 # Define the index settings and mappings
 index_settings = {
     "settings": {
@@ -59,7 +66,9 @@ index_settings = {
 }
 
 # Create the index with the specified settings and mappings (if it doesn't already exist)
-if not es.indices.exists(index=index_name):
+if use_region_indices:
+    create_region_indices(es, index_name, index_settings)
+elif not es.indices.exists(index=index_name):
     es.indices.create(index=index_name, body=index_settings)
     print(f"Index '{index_name}' created successfully.")
 
@@ -89,12 +98,13 @@ def generate_documents(users):
         if not user_id:
             raise ValueError(f"Missing or malformed '_id' for user: {user}")
         
-        routing_key = get_routing_key(user["location"])
-        yield {
+        if use_region_indices and user["location"] not in regions:
+            print(f"Skipped user {user_id} of unknown location '{user['location']}'")
+            continue
+        document = {
             "_op_type": "index",
-            "_index": index_name,
+            "_index": region_index(index_name, user["location"]) if use_region_indices else index_name,
             "_id": user_id,  # Use the extracted _id value
-            "_routing": routing_key,  # Custom routing to the correct shard
             "_source": {
                 "user_id": user["user_id"],
                 "name": user["name"],
@@ -104,14 +114,15 @@ def generate_documents(users):
                 "profile": user["profile"]
             }
         }
+        if not use_region_indices:
+            document["_routing"] = get_routing_key(user["location"])  # Custom routing to the correct shard
+        yield document
 
 # Load the JSON data (assuming the JSON file path is 'users_data.json')
 file_path = r'C:\Users\vicky\OneDrive\Desktop\ASU\Coursework\CSE 512\Project\DDS_Project.users.json'
 users_data = load_json_data(file_path)
 
-# Bulk upload the documents to Elasticsearch
-helpers.bulk(es, generate_documents(users_data))
-
-print("Data uploaded successfully!")
+# Bulk upload the documents to Elasticsearch (parallel workers, refresh and replicas off during the load)
+ingest(es, read_alias(index_name) if use_region_indices else index_name, generate_documents(users_data))
 
 
@@ -1,5 +1,5 @@
 from elasticsearch import Elasticsearch
-from elasticsearch.helpers import bulk
+from bulk_ingest import ingest
 import json
 from datetime import datetime
 
@@ -81,7 +81,7 @@ def generate_documents(data):
             parsed_date = datetime.strptime(release_date, "%Y-%m-%dT%H:%M:%SZ")
 
         yield {
-            "_index": "content",
+            "_index": index_name,
             "_id": item_id,
             "_source": {
                 "content_id": item["content_id"],
@@ -98,14 +98,9 @@ def generate_documents(data):
             "routing": get_routing_key(item["genre"])  # Custom routing
         }
 
-# Step 6: Bulk Upload Data
+# Step 6: Bulk Upload Data (parallel workers, refresh and replicas off during the load)
 try:
-    success, errors = bulk(es, generate_documents(content_data), raise_on_error=False)
-    print(f"Indexed {success} documents successfully.")
-    if errors:
-        print("Errors:")
-        for error in errors:
-            print(error)
+    ingest(es, index_name, generate_documents(content_data))
 except Exception as e:
     print(f"Error during bulk upload: {e}")
 
@@ -2,6 +2,7 @@ import time
 import psutil
 import numpy as np
 from elasticsearch import Elasticsearch
+from region_layout import read_alias
 from concurrent.futures import ThreadPoolExecutor
 
 # Initialize Elasticsearch connection
@@ -13,7 +14,7 @@ def execute_requests(user_id, num_requests):
     for _ in range(num_requests):
         # Step 1: Query to fetch top_content from regional_trends
         step1_start = time.time()
-        response_1 = es.search(index="regional_trends", body={
+        response_1 = es.search(index=read_alias("regional_trends"), body={
             "query": {
                 "bool": {
                     "filter": {
@@ -27,6 +28,7 @@ def execute_requests(user_id, num_requests):
                 {"engagement_metrics.total_views": {"order": "desc"}},
                 {"engagement_metrics.total_likes": {"order": "desc"}}
             ],
+            "track_total_hits": False,
             "size": 5,
             "_source": ["top_content"]
         })
@@ -1,9 +1,10 @@
 from elasticsearch import Elasticsearch
+from region_layout import read_alias
 
 es = Elasticsearch('https://localhost:9200', basic_auth=('elastic', 'uRmY*oulxBA8+N4m_4nW'), verify_certs=False)
 
 # Step 1: Query to fetch top_content from regional_trends
-response_1 = es.search(index="regional_trends", body={
+response_1 = es.search(index=read_alias("regional_trends"), body={
     "query": {
         "bool": {
             "filter": {
@@ -17,6 +18,7 @@ response_1 = es.search(index="regional_trends", body={
         {"engagement_metrics.total_views": {"order": "desc"}},
         {"engagement_metrics.total_likes": {"order": "desc"}}
     ],
+    "track_total_hits": False,  # No total count needed, lets the sorted index stop early
     "size": 5,
     "_source": ["top_content"]
 })
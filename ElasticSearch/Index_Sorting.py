@@ -0,0 +1,116 @@
+from elasticsearch import Elasticsearch, helpers
+from bulk_ingest import ingest
+from region_layout import read_alias
+import random
+import time
+import numpy as np
+
+# Step 1: Initialize Elasticsearch Client
+es = Elasticsearch('https://localhost:9200', basic_auth=('elastic', 'uRmY*oulxBA8+N4m_4nW'), verify_certs=False)
+
+# Step 2: Copies to compare, filled with the same synthetic documents
+source_index = read_alias("regional_trends")
+target_documents = 1000000  # regional_trends is small; the copies are scaled up from its documents
+seed = 42
+keep_copies = False  # Leave the copies in place for inspection
+
+engagement_sort = {
+    "sort.field": ["engagement_metrics.total_views", "engagement_metrics.total_likes"],
+    "sort.order": ["desc", "desc"]
+}
+copies = {
+    "regional_trends_unsorted": {},
+    "regional_trends_sorted": engagement_sort
+}
+
+# The regional and global top-K queries from Local_recommendation_query.py and Global_Query_Output.py
+sort = [
+    {"engagement_metrics.total_views": {"order": "desc"}},
+    {"engagement_metrics.total_likes": {"order": "desc"}}
+]
+queries = {
+    "Regional Top 10 (Europe)": {
+        "query": {"bool": {"filter": {"terms": {"region": ["Europe"]}}}},
+        "sort": sort,
+        "_source": ["top_content", "engagement_metrics.total_likes", "engagement_metrics.total_views", "region"],
+        "size": 10
+    },
+    "Global Top 5": {
+        "query": {"bool": {"filter": {"terms": {"region": ["Asia", "South America", "North America", "Europe"]}}}},
+        "sort": sort,
+        "_source": ["top_content"],
+        "size": 5
+    }
+}
+
+
+# Step 3: Scale the source documents up, jittering the engagement metrics
+def synthetic_documents(index_name, source_documents, count):
+    rng = random.Random(seed)
+    for number in range(count):
+        document = rng.choice(source_documents)
+        metrics = document["engagement_metrics"]
+        yield {
+            "_index": index_name,
+            "_id": str(number),
+            "_source": {
+                "region": document["region"],
+                "top_content": document["top_content"],
+                "engagement_metrics": {
+                    name: int(value * rng.uniform(0.5, 1.5)) for name, value in metrics.items()
+                }
+            }
+        }
+
+
+def create_copy(index_name, sort_settings, source_documents):
+    if es.indices.exists(index=index_name):
+        es.indices.delete(index=index_name)
+    mappings = next(iter(es.indices.get_mapping(index=source_index).values()))["mappings"]
+    settings = {"number_of_shards": 4, "number_of_replicas": 1}
+    if sort_settings:
+        settings["index"] = sort_settings
+    es.indices.create(index=index_name, body={"settings": settings, "mappings": mappings})
+    # Merged to one segment per shard so both copies are compared on the same segment layout
+    ingest(es, index_name, synthetic_documents(index_name, source_documents, target_documents), force_merge=True)
+
+
+# Step 4: Latency of a query
+def measure_latency(index_name, body, num_requests=200):
+    for _ in range(20):  # Warmup
+        es.search(index=index_name, body=body)
+    response_times = []
+    for _ in range(num_requests):
+        start_time = time.time()
+        es.search(index=index_name, body=body, request_cache=False)
+        response_times.append((time.time() - start_time) * 1000)
+    return np.mean(response_times), np.percentile(response_times, 95)
+
+
+if __name__ == "__main__":
+    source_documents = [hit["_source"] for hit in helpers.scan(es, index=source_index, query={"query": {"match_all": {}}})]
+    print(f"Scaling {len(source_documents)} '{source_index}' documents up to {target_documents}")
+    for index_name, sort_settings in copies.items():
+        create_copy(index_name, sort_settings, source_documents)
+
+    latencies = {}
+    print(f"\n{'Query':<26}  {'Index':<26}  {'Total hits':<10}  {'Avg ms':>8}  {'p95 ms':>8}")
+    for query_name, body in queries.items():
+        for index_name in copies:
+            # Default counts hits up to 10,000; false lets the sorted copy stop after the top K
+            for track_total_hits in ("default", False):
+                request = body if track_total_hits == "default" else dict(body, track_total_hits=track_total_hits)
+                average, p95 = measure_latency(index_name, request)
+                latencies[(query_name, index_name, track_total_hits)] = average
+                print(f"{query_name:<26}  {index_name:<26}  {str(track_total_hits):<10}  {average:>8.2f}  {p95:>8.2f}")
+
+    # Gain of the new setup (sorted index, no hit count) over the old one (unsorted, counted)
+    print()
+    for query_name in queries:
+        before = latencies[(query_name, "regional_trends_unsorted", "default")]
+        after = latencies[(query_name, "regional_trends_sorted", False)]
+        print(f"{query_name}: {before:.2f} ms -> {after:.2f} ms ({before / after if after else 0:.1f}x)")
+
+    if not keep_copies:
+        for index_name in copies:
+            es.indices.delete(index=index_name)
@@ -0,0 +1,149 @@
+from elasticsearch import Elasticsearch
+from datetime import datetime, timedelta
+from bulk_ingest import ingest
+from interaction_stream import STREAM_NAME, ensure_stream, backfill, backing_indices
+import json
+import hashlib
+import time
+import numpy as np
+
+# Step 1: Initialize Elasticsearch Client
+es = Elasticsearch('https://localhost:9200', basic_auth=('elastic', 'uRmY*oulxBA8+N4m_4nW'), verify_certs=False)
+
+# Step 2: Layouts to compare
+# The single index is rebuilt exactly as Final_Sharding_Interaction_history.py used to load it
+single_index = "interaction_history_single"
+single_index_settings = {
+    "settings": {"number_of_shards": 4, "number_of_replicas": 1},
+    "mappings": {
+        "properties": {
+            "user_id": {"type": "keyword"},
+            "content_id": {"type": "keyword"},
+            "interaction_type": {"type": "keyword"},
+            "timestamp": {"type": "date"}
+        }
+    }
+}
+recent_days = 7  # Window of the recent-activity queries, ending at the newest interaction
+
+json_file_path = r"C:\Users\vicky\OneDrive\Desktop\ASU\Coursework\CSE 512\Project\DDS_Project.interaction_history.json"  # Replace with the correct path
+
+
+def get_routing_key(user_id):
+    # Hash user_id and mod by 4 to determine the shard (the single index's routing)
+    hash_value = int(hashlib.sha256(user_id.encode('utf-8')).hexdigest(), 16)
+    return str(hash_value % 4)
+
+
+def single_index_actions(data):
+    for item in data:
+        yield {
+            "_index": single_index,
+            "_id": item["_id"]["$oid"],
+            "_source": {
+                "user_id": item["user_id"],
+                "content_id": item["content_id"],
+                "interaction_type": item["interaction_type"],
+                "timestamp": item["timestamp"]
+            },
+            "routing": get_routing_key(item["user_id"])
+        }
+
+
+# Step 3: Ingest into both layouts
+def load_single_index(data):
+    if es.indices.exists(index=single_index):
+        es.indices.delete(index=single_index)
+    es.indices.create(index=single_index, body=single_index_settings)
+    start_time = time.perf_counter()
+    stats = ingest(es, single_index, single_index_actions(data))
+    duration = time.perf_counter() - start_time
+    return {"indexed": stats["indexed"], "failed": stats["failed"], "duration_s": duration,
+            "docs_per_sec": stats["indexed"] / duration if duration else 0.0}
+
+
+def load_stream(data):
+    if es.indices.exists(index=STREAM_NAME):
+        es.indices.delete_data_stream(name=STREAM_NAME)
+    ensure_stream(es)
+    return backfill(es, data)
+
+
+def routing_hash_cost(data):
+    """Seconds of loader CPU spent on the SHA-256 routing keys alone"""
+    start_time = time.perf_counter()
+    for item in data:
+        get_routing_key(item["user_id"])
+    return time.perf_counter() - start_time
+
+
+# Step 4: Recent-window queries, the same on both layouts apart from the timestamp field
+def recent_window(data):
+    newest = datetime.fromisoformat(max(item["timestamp"] for item in data))
+    return (newest - timedelta(days=recent_days)).isoformat(), newest.isoformat()
+
+
+def recent_activity_query(field, start, end):
+    return {
+        "query": {"range": {field: {"gte": start, "lte": end}}},
+        "aggs": {"by_type": {"terms": {"field": "interaction_type"}}},
+        "size": 0
+    }
+
+
+def recent_user_history_query(field, start, end, user_id):
+    return {
+        "query": {"bool": {"filter": [
+            {"term": {"user_id": user_id}},
+            {"range": {field: {"gte": start, "lte": end}}}
+        ]}},
+        "sort": [{field: {"order": "desc"}}],
+        "size": 20
+    }
+
+
+def benchmark(index_name, body, routing=None, num_requests=200):
+    """
+    Average / p95 latency in ms, and the shards searched and skipped per request.
+
+    pre_filter_shard_size=1 makes every search run the can_match phase, which skips shards
+    whose @timestamp range cannot match; by default it only runs past 128 shards.
+    """
+    for _ in range(20):  # Warmup
+        es.search(index=index_name, body=body, routing=routing)
+    response_times = []
+    shards = {}
+    for _ in range(num_requests):
+        start_time = time.time()
+        response = es.search(index=index_name, body=body, routing=routing, request_cache=False, pre_filter_shard_size=1)
+        response_times.append((time.time() - start_time) * 1000)
+        shards = response["_shards"]
+    return np.mean(response_times), np.percentile(response_times, 95), shards.get("total", 0), shards.get("skipped", 0)
+
+
+if __name__ == "__main__":
+    with open(json_file_path, "r") as file:
+        interaction_data = json.load(file)
+
+    single = load_single_index(interaction_data)
+    stream = load_stream(interaction_data)
+    print(f"\n{'Layout':<30}  {'Indexed':>9}  {'Failed':>6}  {'Seconds':>8}  {'Docs/sec':>9}")
+    print(f"{single_index:<30}  {single['indexed']:>9}  {single['failed']:>6}  {single['duration_s']:>8.1f}  {single['docs_per_sec']:>9.0f}")
+    print(f"{STREAM_NAME:<30}  {stream['indexed']:>9}  {stream['failed']:>6}  {stream['duration_s']:>8.1f}  {stream['docs_per_sec']:>9.0f}")
+    print(f"SHA-256 routing keys alone: {routing_hash_cost(interaction_data):.2f} s of loader CPU")
+    print(f"'{STREAM_NAME}' has {len(backing_indices(es))} backing indices of 1 primary shard each")
+
+    start, end = recent_window(interaction_data)
+    user_id = max(interaction_data, key=lambda item: item["timestamp"])["user_id"]  # Active in the window
+    cases = [
+        (f"Activity, last {recent_days} days", single_index, recent_activity_query("timestamp", start, end), None),
+        (f"Activity, last {recent_days} days", STREAM_NAME, recent_activity_query("@timestamp", start, end), None),
+        (f"User history, last {recent_days} days", single_index,
+         recent_user_history_query("timestamp", start, end, user_id), get_routing_key(user_id)),
+        (f"User history, last {recent_days} days", STREAM_NAME,
+         recent_user_history_query("@timestamp", start, end, user_id), None)
+    ]
+    print(f"\n{'Query':<28}  {'Layout':<30}  {'Shards':>6}  {'Skipped':>7}  {'Avg ms':>8}  {'p95 ms':>8}")
+    for query_name, index_name, body, routing in cases:
+        average, p95, total, skipped = benchmark(index_name, body, routing)
+        print(f"{query_name:<28}  {index_name:<30}  {total:>6}  {skipped:>7}  {average:>8.2f}  {p95:>8.2f}")
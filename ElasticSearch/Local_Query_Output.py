@@ -2,6 +2,7 @@ import time
 import psutil
 import numpy as np
 from elasticsearch import Elasticsearch
+from region_layout import region_index
 
 # Initialize Elasticsearch client
 es = Elasticsearch('https://localhost:9200', basic_auth=('elastic', 'uRmY*oulxBA8+N4m_4nW'), verify_certs=False)
@@ -17,8 +18,8 @@ def execute_bulk_search(num_requests):
     # Prepare bulk search body
     body = []
     for _ in range(num_requests):
-        # Metadata part (empty for now, it can contain index or other parameters)
-        body.append({})
+        # Metadata part: the region's own single-shard index
+        body.append({"index": region_index("regional_trends", "Europe")})
         # Query part
         body.append({
             "query": {
@@ -40,6 +41,7 @@ def execute_bulk_search(num_requests):
                 "engagement_metrics.total_views", 
                 "region"
             ],
+            "track_total_hits": False,
             "size": 10  # Size should be part of the query, not metadata
         })
     
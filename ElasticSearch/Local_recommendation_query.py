@@ -1,9 +1,10 @@
 from elasticsearch import Elasticsearch
+from region_layout import region_index
 
 es = Elasticsearch('https://localhost:9200', basic_auth=('elastic', 'uRmY*oulxBA8+N4m_4nW'), verify_certs=False)
 
-# Step 1: Query to fetch top_content from regional_trends
-response_1 = es.search(index="regional_trends", body={
+# Step 1: Query to fetch top_content from the region's own single-shard index
+response_1 = es.search(index=region_index("regional_trends", "Europe"), body={
     "query": {
         "bool": {
             "filter": {
@@ -17,6 +18,7 @@ response_1 = es.search(index="regional_trends", body={
         {"engagement_metrics.total_views": {"order": "desc"}},
         {"engagement_metrics.total_likes": {"order": "desc"}} 
     ],
+    "track_total_hits": False,  # Skip counting matches so segments sorted by engagement stop after the top 10
     "size": 10,  # Retrieve top 10 documents
     "_source": [
         "top_content", 
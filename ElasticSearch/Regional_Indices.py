@@ -0,0 +1,127 @@
+from elasticsearch import Elasticsearch
+from region_layout import create_region_indices, region_index, region_layouts, regions
+import time
+import numpy as np
+
+# Step 1: Initialize Elasticsearch Client
+es = Elasticsearch('https://localhost:9200', basic_auth=('elastic', 'uRmY*oulxBA8+N4m_4nW'), verify_certs=False)
+
+# Step 2: Layout
+# The loaders write regional_trends and users straight into one single-shard index per
+# region (region_layout.py). This script shows where each region's documents sit and
+# benchmarks the regional query; by default it only reads. With migrate_routed_indices it
+# also copies an index loaded the old way, with routing keys, into the per-region indices
+# that do not exist yet. Existing per-region indices are never replaced, since they hold
+# what the loaders wrote last.
+migrate_routed_indices = False
+
+
+# Step 3: Copy a routed index into the per-region indices that are missing
+def build_region_indices(source_index, region_field):
+    missing = [region for region in regions if not es.indices.exists(index=region_index(source_index, region))]
+    if not missing:
+        print(f"Every per-region index of '{source_index}' exists, nothing to migrate.")
+        return
+    mappings = es.indices.get_mapping(index=source_index)[source_index]["mappings"]
+    settings = {"number_of_replicas": 1}
+    # Keep index sorting (regional_trends is sorted by engagement) so top-K queries still stop early
+    source_sort = es.indices.get_settings(index=source_index)[source_index]["settings"]["index"].get("sort")
+    if source_sort:
+        settings["index"] = {"sort": source_sort}
+    create_region_indices(es, source_index, {"settings": settings, "mappings": mappings})
+    for region in missing:
+        target = region_index(source_index, region)
+        # Routing is dropped: with one shard per index it is no longer needed
+        es.options(request_timeout=600).reindex(body={
+            "source": {"index": source_index, "query": {"term": {region_field: region}}},
+            "dest": {"index": target},
+            "script": {"source": "ctx._routing = null", "lang": "painless"}
+        }, wait_for_completion=True, refresh=True)
+        print(f"Index '{target}' filled with {es.count(index=target)['count']} documents.")
+
+
+# Step 4: Verifier - which shard and node each region's documents actually sit on
+def shard_placement(index_pattern, region_field):
+    placement = []
+    shards = es.cat.shards(index=index_pattern, format="json", h="index,shard,prirep,node")
+    primaries = [shard for shard in shards if shard["prirep"] == "p"]
+    for region in regions:
+        for shard in primaries:
+            count = es.count(
+                index=shard["index"],
+                body={"query": {"term": {region_field: region}}},
+                preference=f"_shards:{shard['shard']}"
+            )["count"]
+            if count:
+                placement.append({
+                    "region": region,
+                    "index": shard["index"],
+                    "shard": int(shard["shard"]),
+                    "node": shard["node"],
+                    "documents": count
+                })
+    return placement
+
+
+def print_placement(title, placement):
+    print(f"\n{title}")
+    print(f"{'Region':<15}  {'Index':<32}  {'Shard':>5}  {'Node':<20}  {'Documents':>9}")
+    for entry in placement:
+        print(f"{entry['region']:<15}  {entry['index']:<32}  {entry['shard']:>5}  {str(entry['node']):<20}  {entry['documents']:>9}")
+
+    # Shards holding more than one region, the collisions the string routing keys produce
+    regions_per_shard = {}
+    for entry in placement:
+        regions_per_shard.setdefault((entry["index"], entry["shard"]), []).append(entry["region"])
+    for (index_name, shard), shard_regions in regions_per_shard.items():
+        if len(shard_regions) > 1:
+            print(f"Shard {shard} of '{index_name}' holds {', '.join(shard_regions)}")
+
+
+# Step 5: Benchmark - regional top-10 on the routed index vs the region's own index
+def regional_query(region):
+    return {
+        "query": {"bool": {"filter": {"terms": {"region": [region]}}}},
+        "sort": [
+            {"engagement_metrics.total_views": {"order": "desc"}},
+            {"engagement_metrics.total_likes": {"order": "desc"}}
+        ],
+        "_source": ["top_content", "engagement_metrics.total_likes", "engagement_metrics.total_views", "region"],
+        "size": 10
+    }
+
+
+def benchmark(index_name, body, num_requests=200):
+    """Average / p95 latency in ms and the number of shards each request searched"""
+    for _ in range(20):  # Warmup
+        es.search(index=index_name, body=body)
+    response_times = []
+    shards_searched = 0
+    for _ in range(num_requests):
+        start_time = time.time()
+        response = es.search(index=index_name, body=body, request_cache=False)
+        response_times.append((time.time() - start_time) * 1000)
+        shards_searched = response["_shards"]["total"]
+    return np.mean(response_times), np.percentile(response_times, 95), shards_searched
+
+
+if __name__ == "__main__":
+    for source_index, (region_field, read_alias) in region_layouts.items():
+        if es.indices.exists(index=source_index):
+            print_placement(f"Placement in '{source_index}' (routing keys)", shard_placement(source_index, region_field))
+            if migrate_routed_indices:
+                build_region_indices(source_index, region_field)
+        if es.indices.exists(index=read_alias):
+            print_placement(f"Placement behind '{read_alias}'", shard_placement(read_alias, region_field))
+        elif es.indices.exists(index=source_index):
+            print(f"'{read_alias}' does not exist, set migrate_routed_indices to copy '{source_index}' into it.")
+        else:
+            print(f"Neither '{source_index}' nor '{read_alias}' exists, skipped.")
+
+    print(f"\n{'Region':<15}  {'Index':<32}  {'Shards':>6}  {'Avg ms':>8}  {'p95 ms':>8}")
+    for region in regions:
+        for index_name in ["regional_trends", region_index("regional_trends", region)]:
+            if not es.indices.exists(index=index_name):
+                continue
+            average, p95, shards = benchmark(index_name, regional_query(region))
+            print(f"{region:<15}  {index_name:<32}  {shards:>6}  {average:>8.2f}  {p95:>8.2f}")
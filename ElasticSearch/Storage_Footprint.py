@@ -0,0 +1,132 @@
+from elasticsearch import Elasticsearch
+from interaction_stream import STREAM_NAME
+from region_layout import read_alias
+import time
+import numpy as np
+
+# Step 1: Initialize Elasticsearch Client
+es = Elasticsearch('https://localhost:9200', basic_auth=('elastic', 'uRmY*oulxBA8+N4m_4nW'), verify_certs=False)
+
+# Step 2: Indices and codecs to compare
+# Regional trends, users and interaction history are read through their per-region aliases and
+# the data stream; the single indices are measured too when loaded the old way
+source_indices = [
+    read_alias("regional_trends"), "regional_trends", "content_v2", read_alias("users"), "users",
+    STREAM_NAME, "interaction_history"
+]
+codecs = ["default", "best_compression"]
+keep_copies = False  # Leave the <index>_footprint_<codec> copies in place for inspection
+
+# Existing queries, run against each codec's copy of the index they read
+queries = {
+    "Regional Trends (Europe)": (read_alias("regional_trends"), {
+        "query": {"bool": {"filter": {"terms": {"region": ["Europe"]}}}},
+        "sort": [
+            {"engagement_metrics.total_views": {"order": "desc"}},
+            {"engagement_metrics.total_likes": {"order": "desc"}}
+        ],
+        "_source": ["top_content", "engagement_metrics.total_likes", "engagement_metrics.total_views", "region"],
+        "size": 10
+    }),
+    "Global Trends": (read_alias("regional_trends"), {
+        "query": {"bool": {"filter": {"terms": {"region": ["Asia", "South America", "North America", "Europe"]}}}},
+        "sort": [
+            {"engagement_metrics.total_views": {"order": "desc"}},
+            {"engagement_metrics.total_likes": {"order": "desc"}}
+        ],
+        "size": 5,
+        "_source": ["top_content"]
+    }),
+    "Content By Genre": ("content_v2", {
+        "query": {"term": {"genre": "Drama"}},
+        "size": 10
+    })
+}
+
+
+def copy_name(index_name, codec):
+    return f"{index_name}_footprint_{codec}"
+
+
+# Step 3: Copy an index with the same mappings and shard count under another codec
+def create_copy(index_name, codec):
+    target = copy_name(index_name, codec)
+    if es.indices.exists(index=target):
+        es.indices.delete(index=target)
+
+    # An alias or data stream answers with its indices; the first one stands for all of them
+    mappings = next(iter(es.indices.get_mapping(index=index_name).values()))["mappings"]
+    mappings.pop("_data_stream_timestamp", None)  # Only allowed on backing indices
+    settings = next(iter(es.indices.get_settings(index=index_name).values()))["settings"]["index"]
+    es.indices.create(index=target, body={
+        "settings": {
+            "number_of_shards": int(settings["number_of_shards"]),
+            "number_of_replicas": 0,  # Primary size only, replicas just multiply it
+            "codec": codec
+        },
+        "mappings": mappings
+    })
+    es.options(request_timeout=600).reindex(body={"source": {"index": index_name}, "dest": {"index": target}}, wait_for_completion=True, refresh=True)
+
+    # Merge to one segment per shard so both codecs are compared on fully merged data
+    es.options(request_timeout=600).indices.forcemerge(index=target, max_num_segments=1)
+    es.indices.refresh(index=target)
+    return target
+
+
+# Step 4: Sizes from _cat/indices and segment stats
+def collect_sizes(index_name):
+    cat = es.cat.indices(index=index_name, format="json", bytes="b")[0]
+    stats = es.indices.stats(index=index_name, metric="store,segments,docs")["indices"][index_name]["primaries"]
+    records = int(cat["docs.count"])
+    store_bytes = int(cat["pri.store.size"])
+    return {
+        "records": records,
+        "store_bytes": store_bytes,
+        "segments": stats["segments"]["count"],
+        "bytes_per_record": store_bytes / records if records else None
+    }
+
+
+# Step 5: Latency of a query against one index
+def measure_latency(index_name, body, num_requests=200):
+    for _ in range(20):  # Warmup
+        es.search(index=index_name, body=body)
+    response_times = []
+    for _ in range(num_requests):
+        start_time = time.time()
+        es.search(index=index_name, body=body, request_cache=False)
+        response_times.append((time.time() - start_time) * 1000)
+    return np.mean(response_times), np.percentile(response_times, 95)
+
+
+# Step 6: Build the copies, collect sizes and latencies
+sizes = {}
+latencies = {}
+for codec in codecs:
+    for index_name in source_indices:
+        if not es.indices.exists(index=index_name):
+            print(f"Index '{index_name}' does not exist, skipped.")
+            continue
+        target = create_copy(index_name, codec)
+        sizes[(codec, index_name)] = collect_sizes(target)
+
+    for query_name, (index_name, body) in queries.items():
+        if (codec, index_name) in sizes:
+            latencies[(codec, query_name)] = measure_latency(copy_name(index_name, codec), body)
+
+# Step 7: Report
+print(f"{'Codec':<18}  {'Index':<26}  {'Records':>9}  {'Store MiB':>9}  {'Segments':>8}  {'Bytes/record':>12}")
+for (codec, index_name), entry in sizes.items():
+    bytes_per_record = entry["bytes_per_record"]
+    print(f"{codec:<18}  {index_name:<26}  {entry['records']:>9}  {entry['store_bytes'] / 1024 ** 2:>9.2f}  "
+          f"{entry['segments']:>8}  {'-' if bytes_per_record is None else f'{bytes_per_record:.1f}':>12}")
+
+print()
+print(f"{'Codec':<18}  {'Query':<25}  {'Avg ms':>8}  {'p95 ms':>8}")
+for (codec, query_name), (average, p95) in latencies.items():
+    print(f"{codec:<18}  {query_name:<25}  {average:>8.2f}  {p95:>8.2f}")
+
+if not keep_copies:
+    for codec, index_name in sizes:
+        es.indices.delete(index=copy_name(index_name, codec))
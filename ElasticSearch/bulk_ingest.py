@@ -0,0 +1,303 @@
+import json
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from elasticsearch import ApiError, ConnectionError as TransportConnectionError, ConnectionTimeout
+from elasticsearch.helpers import expand_action
+
+# Defaults sized for the project's cluster; a bulk request is cut at whichever limit is hit first
+DEFAULT_THREAD_COUNT = 4
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_MAX_CHUNK_BYTES = 10 * 1024 * 1024
+
+# Bounds the adaptive controller moves chunk size and concurrency within
+MIN_CHUNK_SIZE = 100
+MAX_CHUNK_SIZE = 10000
+MAX_THREAD_COUNT = 16
+
+# Item and request statuses meaning "cluster busy, try again later" (es_rejected_execution_exception)
+RETRYABLE_STATUSES = {429}
+
+
+class AdaptiveBulkController:
+    def __init__(
+        self,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        concurrency=DEFAULT_THREAD_COUNT,
+        min_chunk_size=MIN_CHUNK_SIZE,
+        max_chunk_size=MAX_CHUNK_SIZE,
+        max_concurrency=MAX_THREAD_COUNT,
+        target_latency_s=1.0,
+        cooldown_s=2.0
+    ):
+        """
+        Additive-increase / multiplicative-decrease control of bulk chunk size and concurrency.
+
+        Rejections halve the chunk size and drop one worker; requests slower than the target
+        shrink chunks; a full round of fast, clean requests grows chunks by a quarter and, when
+        well under the target, adds a worker. Decreases are spaced by a cooldown so the requests
+        already in flight when the cluster pushed back do not collapse the settings.
+
+        Args:
+            chunk_size (int): Initial documents per bulk request
+            concurrency (int): Initial concurrent bulk requests
+            min_chunk_size (int): Smallest chunk size
+            max_chunk_size (int): Largest chunk size
+            max_concurrency (int): Most concurrent bulk requests
+            target_latency_s (float): Bulk request latency considered healthy
+            cooldown_s (float): Minimum time between two decreases
+        """
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.max_concurrency = max_concurrency
+        self.target_latency_s = target_latency_s
+        self.cooldown_s = cooldown_s
+        self.history = []
+        self._clean_streak = 0
+        self._last_decrease = 0.0
+
+    def record(self, latency_s, rejected):
+        """Adjust chunk size and concurrency after one bulk request."""
+        now = time.monotonic()
+        if rejected or latency_s > self.target_latency_s:
+            self._clean_streak = 0
+            if now - self._last_decrease < self.cooldown_s:
+                return
+            self._last_decrease = now
+            if rejected:
+                self.chunk_size = max(self.min_chunk_size, self.chunk_size // 2)
+                self.concurrency = max(1, self.concurrency - 1)
+            else:
+                self.chunk_size = max(self.min_chunk_size, int(self.chunk_size * 0.8))
+        else:
+            self._clean_streak += 1
+            if self._clean_streak < self.concurrency:
+                return
+            self._clean_streak = 0
+            self.chunk_size = min(self.max_chunk_size, int(self.chunk_size * 1.25))
+            if latency_s < self.target_latency_s / 2:
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+        self.history.append((now, self.chunk_size, self.concurrency))
+
+
+def prepare_index_for_load(es, index_name):
+    """
+    Disable refresh and replicas for the load; returns the settings to restore afterwards.
+
+    index_name may be an alias or data stream, in which case every concrete index behind it
+    is tuned and its own settings are saved.
+    """
+    previous = {}
+    for name, entry in es.indices.get_settings(index=index_name).items():
+        settings = entry["settings"]["index"]
+        previous[name] = {
+            "refresh_interval": settings.get("refresh_interval"),  # None restores the default
+            "number_of_replicas": settings.get("number_of_replicas", "1")
+        }
+    for name in previous:
+        es.indices.put_settings(index=name, body={"index": {"refresh_interval": "-1", "number_of_replicas": 0}})
+    return previous
+
+
+def restore_index_settings(es, index_name, previous):
+    """Put back the refresh interval and replica count saved by prepare_index_for_load."""
+    for name, settings in previous.items():
+        es.indices.put_settings(index=name, body={"index": settings})
+    es.indices.refresh(index=index_name)
+
+
+def _serialize(action):
+    """(metadata, source, size in bytes) of one bulk action."""
+    metadata, source = expand_action(action)
+    size = len(json.dumps(metadata)) + 1
+    if source is not None:
+        size += len(json.dumps(source, default=str)) + 1
+    return metadata, source, size
+
+
+def _chunks(actions, controller, max_chunk_bytes):
+    """Cut actions into chunks sized by the controller's current chunk size and a byte limit."""
+    chunk, chunk_bytes = [], 0
+    for action in actions:
+        serialized = _serialize(action)
+        if chunk and (len(chunk) >= controller.chunk_size or chunk_bytes + serialized[2] > max_chunk_bytes):
+            yield chunk
+            chunk, chunk_bytes = [], 0
+        chunk.append(serialized)
+        chunk_bytes += serialized[2]
+    if chunk:
+        yield chunk
+
+
+def _backoff(attempt, initial_backoff, max_backoff):
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(max_backoff, initial_backoff * 2 ** attempt))
+
+
+def _send_chunk(es, chunk, max_retries, initial_backoff, max_backoff):
+    """
+    Send one chunk, resending rejected items (or the whole request on 429 / connection errors)
+    with backoff until they succeed or max_retries is exhausted.
+
+    A timed-out or dropped request may still have been applied, so once one has been resent a
+    409 on a create action means the document is already there and counts as indexed.
+
+    Returns:
+        dict: Indexed counts per index, failed items, rejections and the first attempt's latency
+    """
+    result = {"indexed": defaultdict(int), "failed": [], "rejected": 0, "latency_s": None}
+    pending = chunk
+    maybe_applied = False
+    for attempt in range(max_retries + 1):
+        operations = []
+        for metadata, source, _ in pending:
+            operations.append(metadata)
+            if source is not None:
+                operations.append(source)
+
+        start_time = time.perf_counter()
+        try:
+            response = es.bulk(operations=operations)
+        except (ApiError, TransportConnectionError, ConnectionTimeout) as e:
+            if isinstance(e, ApiError) and getattr(e, "status_code", None) not in RETRYABLE_STATUSES:
+                result["failed"] += [{"error": str(e), "action": metadata} for metadata, _, _ in pending]
+                return result
+            if result["latency_s"] is None:
+                result["latency_s"] = time.perf_counter() - start_time
+            maybe_applied = maybe_applied or not isinstance(e, ApiError)
+            result["rejected"] += len(pending)
+            time.sleep(_backoff(attempt, initial_backoff, max_backoff))
+            continue
+        if result["latency_s"] is None:
+            result["latency_s"] = time.perf_counter() - start_time
+
+        retry = []
+        for serialized, item in zip(pending, response["items"]):
+            outcome = next(iter(item.values()))
+            status = outcome.get("status", 500)
+            if status < 300 or (status == 409 and maybe_applied and "create" in item):
+                result["indexed"][outcome.get("_index")] += 1
+            elif status in RETRYABLE_STATUSES:
+                retry.append(serialized)
+            else:
+                result["failed"].append(item)
+        if not retry:
+            return result
+        result["rejected"] += len(retry)
+        pending = retry
+        time.sleep(_backoff(attempt, initial_backoff, max_backoff))
+
+    result["failed"] += [{"error": "rejected after retries", "action": metadata} for metadata, _, _ in pending]
+    return result
+
+
+def ingest(
+    es,
+    index_name,
+    actions,
+    thread_count=DEFAULT_THREAD_COUNT,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    max_chunk_bytes=DEFAULT_MAX_CHUNK_BYTES,
+    force_merge=False,
+    max_errors_shown=10,
+    adaptive=True,
+    target_latency_s=1.0,
+    max_retries=8,
+    initial_backoff=0.5,
+    max_backoff=30.0
+):
+    """
+    Load bulk actions into an index with parallel bulk workers.
+
+    Refresh and replicas are turned off for the duration of the load (and the optional
+    force merge) and restored afterwards, even if the load fails. Rejected (429) items
+    are retried with exponential backoff; with adaptive=True the chunk size and number
+    of concurrent requests follow the observed latency and rejections, so the load runs
+    at the rate the cluster sustains. Items that still fail are counted and reported.
+
+    Args:
+        es: Elasticsearch client
+        index_name (str): Index, alias or data stream whose indices are tuned for the load (actions may name it in _index)
+        actions (iterable): Bulk actions, as for helpers.bulk
+        thread_count (int): Initial (or, without adaptive, fixed) concurrent bulk requests
+        chunk_size (int): Initial (or fixed) maximum documents per bulk request
+        max_chunk_bytes (int): Maximum bytes per bulk request
+        force_merge (bool): Merge the index down to one segment per shard once loaded
+        max_errors_shown (int): Failed items printed at the end
+        adaptive (bool): Let AdaptiveBulkController tune chunk size and concurrency
+        target_latency_s (float): Bulk latency the controller treats as healthy
+        max_retries (int): Resends of rejected items before they count as failed
+        initial_backoff (float): Backoff ceiling of the first retry, in seconds
+        max_backoff (float): Largest backoff ceiling, in seconds
+
+    Returns:
+        dict: Indexed, failed and rejected counts, duration, docs/sec per index and final settings
+    """
+    controller = AdaptiveBulkController(
+        chunk_size=chunk_size,
+        concurrency=thread_count,
+        max_concurrency=max(thread_count, MAX_THREAD_COUNT),
+        target_latency_s=target_latency_s
+    )
+
+    previous = prepare_index_for_load(es, index_name)
+    indexed = defaultdict(int)
+    failed = 0
+    rejected = 0
+    errors = []
+    start_time = time.perf_counter()
+
+    def collect(future):
+        nonlocal failed, rejected
+        result = future.result()
+        for name, count in result["indexed"].items():
+            indexed[name] += count
+        failed += len(result["failed"])
+        rejected += result["rejected"]
+        errors.extend(result["failed"][:max(0, max_errors_shown - len(errors))])
+        if adaptive and result["latency_s"] is not None:
+            controller.record(result["latency_s"], result["rejected"])
+
+    try:
+        with ThreadPoolExecutor(max_workers=controller.max_concurrency) as executor:
+            in_flight = set()
+            for chunk in _chunks(actions, controller, max_chunk_bytes):
+                # Wait for a free slot under the controller's current concurrency
+                while len(in_flight) >= controller.concurrency:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future)
+                in_flight.add(executor.submit(_send_chunk, es, chunk, max_retries, initial_backoff, max_backoff))
+            for future in in_flight:
+                collect(future)
+        duration = time.perf_counter() - start_time
+
+        # Merged before replicas come back, so replicas copy the merged segments instead of merging again
+        if force_merge:
+            es.indices.refresh(index=index_name)
+            es.options(request_timeout=3600).indices.forcemerge(index=index_name, max_num_segments=1)
+            print(f"Force-merged '{index_name}' in {time.perf_counter() - start_time - duration:.1f} s")
+    finally:
+        restore_index_settings(es, index_name, previous)
+
+    stats = {
+        "indexed": sum(indexed.values()),
+        "failed": failed,
+        "rejected": rejected,
+        "duration_s": duration,
+        "docs_per_sec": {name: count / duration if duration else 0.0 for name, count in indexed.items()},
+        "final_chunk_size": controller.chunk_size,
+        "final_concurrency": controller.concurrency
+    }
+    for name, rate in stats["docs_per_sec"].items():
+        print(f"Indexed {indexed[name]} documents into '{name}' in {duration:.1f} s ({rate:.0f} docs/sec)")
+    print(f"Bulk settings at the end: {controller.chunk_size} docs per request, "
+          f"{controller.concurrency} concurrent requests, {rejected} rejected items retried")
+    if failed:
+        print(f"{failed} documents failed, first errors:")
+        for error in errors:
+            print(error)
+    return stats
@@ -0,0 +1,123 @@
+import time
+from itertools import groupby
+
+from bulk_ingest import ingest
+
+# Interaction history as a data stream: time-ordered backing indices behind one write target
+STREAM_NAME = "interaction_history_stream"
+TEMPLATE_NAME = "interaction_history_stream_template"
+POLICY_NAME = "interaction_history_rollover"
+
+# A new backing index is started once the current one reaches either limit
+ROLLOVER_CONDITIONS = {"max_primary_shard_size": "10gb", "max_age": "30d"}
+
+# Length of the ISO timestamp prefix that identifies a backfill period
+PERIODS = {"year": 4, "month": 7, "day": 10}
+
+
+def ensure_stream(es, number_of_shards=1, number_of_replicas=1):
+    """
+    Create the rollover policy, the data stream template and the data stream if missing.
+
+    The stream grows by adding backing indices rather than shards, so each backing index
+    gets a single primary that rollover caps at ROLLOVER_CONDITIONS; documents need no
+    routing key.
+    """
+    es.ilm.put_lifecycle(name=POLICY_NAME, policy={
+        "phases": {"hot": {"actions": {"rollover": ROLLOVER_CONDITIONS}}}
+    })
+    es.indices.put_index_template(
+        name=TEMPLATE_NAME,
+        index_patterns=[STREAM_NAME],
+        data_stream={},
+        priority=500,
+        template={
+            "settings": {
+                "number_of_shards": number_of_shards,
+                "number_of_replicas": number_of_replicas,
+                "index.lifecycle.name": POLICY_NAME
+            },
+            "mappings": {
+                "properties": {
+                    "user_id": {"type": "keyword"},
+                    "content_id": {"type": "keyword"},
+                    "interaction_type": {"type": "keyword"},
+                    "@timestamp": {"type": "date"}  # Data streams require @timestamp
+                }
+            }
+        }
+    )
+    if not es.indices.exists(index=STREAM_NAME):
+        es.indices.create_data_stream(name=STREAM_NAME)
+        print(f"Data stream '{STREAM_NAME}' created.")
+    else:
+        print(f"Data stream '{STREAM_NAME}' already exists.")
+
+
+def write_index(es):
+    """Backing index currently receiving writes"""
+    return es.indices.get_data_stream(name=STREAM_NAME)["data_streams"][0]["indices"][-1]["index_name"]
+
+
+def backing_indices(es):
+    return [index["index_name"] for index in es.indices.get_data_stream(name=STREAM_NAME)["data_streams"][0]["indices"]]
+
+
+def stream_actions(data):
+    """Bulk create actions for the data stream"""
+    for item in data:
+        yield {
+            "_op_type": "create",  # Data streams are append-only
+            "_index": STREAM_NAME,
+            "_id": item["_id"]["$oid"],
+            "_source": {
+                "user_id": item["user_id"],
+                "content_id": item["content_id"],
+                "interaction_type": item["interaction_type"],
+                "@timestamp": item["timestamp"]
+            }
+        }
+
+
+def backfill(es, data, period="year", **ingest_options):
+    """
+    Load historical interactions oldest first, rolling the stream over after each period.
+
+    The ILM policy rolls over on the age of the backing index, not of its documents, so a
+    backfill of old data would land in a single index. Rolling over per period gives every
+    backing index a narrow @timestamp range that time-range queries can skip. Periods are
+    sized to the data: a year of the exported interactions is a few MB, far below the
+    10gb shard limit, and monthly indices would only add tiny shards.
+
+    Args:
+        es: Elasticsearch client
+        data (list): Interaction documents as exported from MongoDB
+        period (str): Span of one backing index, a key of PERIODS
+        **ingest_options: Passed on to bulk_ingest.ingest
+
+    Returns:
+        dict: Indexed and failed counts, wall-clock duration and docs/sec, backing indices written
+    """
+    prefix = PERIODS[period]
+    indexed = 0
+    failed = 0
+    written = []
+    start_time = time.perf_counter()
+    ordered = sorted(data, key=lambda item: item["timestamp"])
+    for position, (key, items) in enumerate(groupby(ordered, key=lambda item: item["timestamp"][:prefix])):
+        if position:
+            es.indices.rollover(alias=STREAM_NAME)
+        target = write_index(es)
+        print(f"Loading {period} {key} into '{target}'")
+        stats = ingest(es, target, stream_actions(items), **ingest_options)
+        indexed += stats["indexed"]
+        failed += stats["failed"]
+        written.append(target)
+    duration = time.perf_counter() - start_time
+    return {
+        "indexed": indexed,
+        "failed": failed,
+        "duration_s": duration,
+        "docs_per_sec": indexed / duration if duration else 0.0,
+        "backing_indices": written
+    }
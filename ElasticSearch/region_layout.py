@@ -0,0 +1,53 @@
+import copy
+
+# Routing values "0".."3" are hashed by Elasticsearch, so they do not pick shards 0..3 and
+# two regions can share a shard. One single-shard index per region pins each region to
+# exactly one shard; a read alias spans all of them for global queries.
+regions = ["North America", "Europe", "Asia", "South America"]
+
+# Base index name -> (field holding the region, read alias over its per-region indices)
+region_layouts = {
+    "regional_trends": ("region", "regional_trends_regions"),
+    "users": ("location", "users_regions")
+}
+
+
+def region_slug(region):
+    """'North America' -> 'north-america'"""
+    return region.lower().replace(" ", "-")
+
+
+def region_index(base_index, region):
+    """Per-region index name, e.g. regional_trends-asia"""
+    return f"{base_index}-{region_slug(region)}"
+
+
+def read_alias(base_index):
+    return region_layouts[base_index][1]
+
+
+def create_region_indices(es, base_index, index_body):
+    """
+    Create the single-shard index of every region behind the read alias, if missing.
+
+    Args:
+        es: Elasticsearch client
+        base_index (str): Base index name, a key of region_layouts
+        index_body (dict): Settings and mappings as for the single index; the shard count is replaced by 1
+
+    Returns:
+        list: The per-region index names
+    """
+    body = copy.deepcopy(index_body)
+    body.setdefault("settings", {})["number_of_shards"] = 1
+    body["aliases"] = {read_alias(base_index): {}}
+    names = []
+    for region in regions:
+        name = region_index(base_index, region)
+        if not es.indices.exists(index=name):
+            es.indices.create(index=name, body=body)
+            print(f"Index '{name}' created.")
+        else:
+            print(f"Index '{name}' already exists.")
+        names.append(name)
+    return names
@@ -0,0 +1,155 @@
+import argparse
+import logging
+from typing import List, Dict, Any, Iterable
+
+from pymongo import MongoClient
+
+# Field of regional_trends holding the embedded copy of the joined content document
+SNAPSHOT_FIELD = "content_snapshot"
+
+# Content fields copied into the snapshot (_id is kept to propagate deletes)
+SNAPSHOT_CONTENT_FIELDS = ["content_id", "type", "genre"]
+
+logger = logging.getLogger(__name__)
+
+
+def snapshot_of(content: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the embedded snapshot from a content document"""
+    snapshot = {field: content.get(field) for field in SNAPSHOT_CONTENT_FIELDS}
+    snapshot["_id"] = content["_id"]
+    return snapshot
+
+
+def _snapshot_pipeline(match: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+    """
+    Aggregation that joins content once and merges the snapshot back into regional_trends
+
+    Rows whose top_content matches no content get a null snapshot, since a missing field
+    would leave an existing snapshot in place; _drop_unresolved removes the nulls.
+    """
+    pipeline = [{"$match": match}] if match else []
+    pipeline += [
+        {"$lookup": {
+            "from": "content",
+            "localField": "top_content",
+            "foreignField": "title",
+            "pipeline": [
+                {"$project": {"_id": 1, **{field: 1 for field in SNAPSHOT_CONTENT_FIELDS}}},
+                {"$limit": 1}
+            ],
+            "as": "matched_content"
+        }},
+        {"$project": {SNAPSHOT_FIELD: {"$ifNull": [{"$first": "$matched_content"}, None]}}},
+        {"$merge": {"into": "regional_trends", "on": "_id", "whenMatched": "merge", "whenNotMatched": "discard"}}
+    ]
+    return pipeline
+
+
+def _drop_unresolved(db):
+    """Remove the null snapshots left on rows whose top_content matched no content"""
+    db.regional_trends.update_many({SNAPSHOT_FIELD: {"$type": "null"}}, {"$unset": {SNAPSHOT_FIELD: ""}})
+
+
+def migrate(db) -> int:
+    """
+    Embed the content snapshot into every regional_trends document
+
+    Rows whose top_content has no matching content get no snapshot, matching the
+    rows that $unwind drops in the join pipeline; a snapshot they kept from an
+    earlier run is removed.
+
+    Returns:
+        int: Number of regional_trends documents carrying a snapshot
+    """
+    db.content.create_index("title")
+    db.regional_trends.aggregate(_snapshot_pipeline())
+    _drop_unresolved(db)
+    count = db.regional_trends.count_documents({SNAPSHOT_FIELD: {"$exists": True}})
+    logger.info(f"Content snapshot embedded in {count} regional_trends documents")
+    return count
+
+
+def refresh_titles(db, titles: Iterable[str]):
+    """Recompute snapshots only for regional_trends rows pointing at the given titles"""
+    titles = list(titles)
+    if titles:
+        db.regional_trends.aggregate(_snapshot_pipeline({"top_content": {"$in": titles}}))
+        _drop_unresolved(db)
+
+
+def refresh_content(db, content: Dict[str, Any]):
+    """
+    Propagate one inserted/updated content document to the snapshots
+
+    Rows referencing its current title get the new snapshot. Rows still carrying it
+    under an old title are joined again, so they pick up another content document
+    with that title or lose their snapshot.
+    """
+    db.regional_trends.update_many(
+        {"top_content": content["title"]},
+        {"$set": {SNAPSHOT_FIELD: snapshot_of(content)}}
+    )
+    refresh_titles(db, db.regional_trends.distinct(
+        "top_content", {f"{SNAPSHOT_FIELD}._id": content["_id"], "top_content": {"$ne": content["title"]}}
+    ))
+
+
+def remove_content(db, content_id):
+    """Join the rows carrying a deleted content document (by its _id) again, dropping its snapshots"""
+    refresh_titles(db, db.regional_trends.distinct("top_content", {f"{SNAPSHOT_FIELD}._id": content_id}))
+
+
+def run_refresh_job(db, resume_after: Dict[str, Any] = None):
+    """
+    Keep snapshots in sync by following the content change stream (requires a replica set)
+
+    Args:
+        db: pymongo Database
+        resume_after (dict): Resume token to continue a previous job from
+    """
+    with db.content.watch(full_document="updateLookup", resume_after=resume_after) as stream:
+        for change in stream:
+            operation = change["operationType"]
+            if operation in ("insert", "update", "replace") and change.get("fullDocument"):
+                refresh_content(db, change["fullDocument"])
+            elif operation == "delete":
+                remove_content(db, change["documentKey"]["_id"])
+            logger.info(f"Snapshot refresh applied {operation} on content {change['documentKey']['_id']}")
+
+
+def regional_snapshot_pipeline(region: str) -> List[Dict[str, Any]]:
+    """Join-free equivalent of the regional trends pipeline, reading the embedded snapshot"""
+    return [
+        {"$match": {"region": region, SNAPSHOT_FIELD: {"$exists": True}}},
+        {"$sort": {
+            "engagement_metrics.total_views": -1,
+            "engagement_metrics.total_likes": -1
+        }},
+        {"$limit": 10},
+        {"$project": {
+            "_id": 0,
+            "Content Title": "$top_content",
+            "Content Type": f"${SNAPSHOT_FIELD}.type",
+            "Total Views": "$engagement_metrics.total_views",
+            "Total Likes": "$engagement_metrics.total_likes"
+        }}
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embed content snapshots into regional_trends and keep them in sync")
+    parser.add_argument("command", choices=["migrate", "watch"])
+    parser.add_argument("--connection-string", default="mongodb://localhost:27015/")
+    parser.add_argument("--database", default="DDS_Project")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)-8s | %(message)s')
+    db = MongoClient(args.connection_string)[args.database]
+    if args.command == "migrate":
+        migrate(db)
+    else:
+        run_refresh_job(db)
+
+
+if __name__ == "__main__":
+    main()
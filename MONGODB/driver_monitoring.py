@@ -0,0 +1,166 @@
+import statistics
+import threading
+import time
+from typing import List, Dict, Any, Optional
+
+from pymongo import monitoring
+
+
+class RequestBreakdownRecorder:
+    def __init__(self):
+        """
+        Per-request timing collected from pymongo connection pool (CMAP) and command monitoring events
+
+        The synchronous driver emits these events on the thread running the operation, so a
+        request is delimited with begin()/end() on that thread and events in between are
+        attributed to it.
+        """
+        self._local = threading.local()
+        self.pool_listener = _PoolTimingListener(self)
+        self.command_listener = _CommandTimingListener(self)
+
+    def listeners(self) -> List[Any]:
+        """Listeners to pass as MongoClient(event_listeners=...)"""
+        return [self.pool_listener, self.command_listener]
+
+    def begin(self):
+        """Start attributing events of the current thread to a new request"""
+        self._local.current = {
+            'pool_wait_ms': 0.0,
+            'connection_creation_ms': 0.0,
+            'connections_created': 0,
+            'command_ms': 0.0,
+            'commands': 0,
+            'started_at': time.perf_counter()
+        }
+
+    def end(self) -> Optional[Dict[str, float]]:
+        """Finish the current request and return its breakdown"""
+        current = self.current()
+        self._local.current = None
+        if current is None:
+            return None
+        current['total_ms'] = (time.perf_counter() - current.pop('started_at')) * 1000
+        current['client_overhead_ms'] = max(0.0, current['total_ms'] - current['pool_wait_ms'] - current['command_ms'])
+        return current
+
+    def current(self) -> Optional[Dict[str, float]]:
+        return getattr(self._local, 'current', None)
+
+
+class _PoolTimingListener(monitoring.ConnectionPoolListener):
+    """Records connection checkout waits and new connection setup times"""
+
+    def __init__(self, recorder: RequestBreakdownRecorder):
+        self.recorder = recorder
+        self._checkout_started = threading.local()
+
+    def connection_check_out_started(self, event):
+        self._checkout_started.at = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        current = self.recorder.current()
+        if current is None:
+            return
+        # duration is reported by pymongo 4.7+, otherwise measured from the started event
+        duration = getattr(event, 'duration', None)
+        if duration is None:
+            duration = time.perf_counter() - getattr(self._checkout_started, 'at', time.perf_counter())
+        current['pool_wait_ms'] += duration * 1000
+
+    def connection_ready(self, event):
+        current = self.recorder.current()
+        if current is None:
+            return
+        current['connections_created'] += 1
+        current['connection_creation_ms'] += (getattr(event, 'duration', None) or 0.0) * 1000
+
+    def connection_check_out_failed(self, event):
+        pass
+
+    def connection_checked_in(self, event):
+        pass
+
+    def connection_created(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+
+class _CommandTimingListener(monitoring.CommandListener):
+    """Records the wire round trip of every command (aggregate, getMore, ...) of a request"""
+
+    def __init__(self, recorder: RequestBreakdownRecorder):
+        self.recorder = recorder
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        current = self.recorder.current()
+        if current is not None:
+            current['command_ms'] += event.duration_micros / 1000
+            current['commands'] += 1
+
+    def failed(self, event):
+        current = self.recorder.current()
+        if current is not None:
+            current['command_ms'] += event.duration_micros / 1000
+            current['commands'] += 1
+
+
+def summarize_breakdowns(breakdowns: List[Dict[str, float]], server_time_ms: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Average the per-request breakdowns into queueing / network / server / client components
+
+    Command round trip covers network and server time together. When a server-side
+    execution time is known (from explain executionStats) it is split off and the rest
+    is attributed to the network.
+
+    Args:
+        breakdowns (list): Results of RequestBreakdownRecorder.end()
+        server_time_ms (float): Server execution time of the pipeline, if known
+
+    Returns:
+        dict: Averages of each component and connection creation counts
+    """
+    if not breakdowns:
+        return {}
+
+    def average(key: str) -> float:
+        return statistics.mean(breakdown[key] for breakdown in breakdowns)
+
+    pool_waits = sorted(breakdown['pool_wait_ms'] for breakdown in breakdowns)
+    command_ms = average('command_ms')
+    summary = {
+        'avg_total_ms': average('total_ms'),
+        'avg_queueing_ms': average('pool_wait_ms'),
+        'p95_queueing_ms': pool_waits[min(len(pool_waits) - 1, int(len(pool_waits) * 0.95))],
+        'avg_command_round_trip_ms': command_ms,
+        'avg_client_overhead_ms': average('client_overhead_ms'),
+        'avg_commands_per_request': average('commands'),
+        'connections_created': sum(breakdown['connections_created'] for breakdown in breakdowns),
+        'avg_connection_creation_ms': (
+            sum(breakdown['connection_creation_ms'] for breakdown in breakdowns)
+            / max(1, sum(breakdown['connections_created'] for breakdown in breakdowns))
+        ),
+        'avg_server_ms': None,
+        'avg_network_ms': None
+    }
+    if server_time_ms is not None:
+        summary['avg_server_ms'] = min(server_time_ms, command_ms)
+        summary['avg_network_ms'] = command_ms - summary['avg_server_ms']
+    return summary
@@ -0,0 +1,163 @@
+import json
+import os
+from typing import List, Dict, Any, Optional
+
+
+def explain_pipeline(db, collection: str, pipeline: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Run an aggregation under explain with executionStats verbosity
+
+    Args:
+        db: pymongo Database
+        collection (str): Collection the pipeline runs on
+        pipeline (list): MongoDB aggregation pipeline
+
+    Returns:
+        dict: Raw explain output
+    """
+    return db.command({
+        "explain": {"aggregate": collection, "pipeline": pipeline, "cursor": {}},
+        "verbosity": "executionStats"
+    })
+
+
+def _plan_shape(plan: Optional[Dict[str, Any]]) -> str:
+    """Collapse a plan tree into 'STAGE > CHILD > ...' (branches joined with '|')"""
+    if not plan:
+        return ""
+    plan = plan.get("queryPlan", plan)  # SBE nests the classic tree under queryPlan
+    children = [plan["inputStage"]] if "inputStage" in plan else plan.get("inputStages", [])
+    child_shapes = [shape for shape in (_plan_shape(child) for child in children) if shape]
+    if not child_shapes:
+        return plan.get("stage", "")
+    joined = child_shapes[0] if len(child_shapes) == 1 else "(" + " | ".join(child_shapes) + ")"
+    return f"{plan.get('stage', '')} > {joined}"
+
+
+def _walk_execution_stages(stage: Optional[Dict[str, Any]], summary: Dict[str, Any]):
+    """Accumulate per-stage times and spill flags from an executionStages tree"""
+    if not stage:
+        return
+    summary["stage_times_ms"].append((stage.get("stage"), stage.get("executionTimeMillisEstimate", 0)))
+    if stage.get("stage") == "SORT" and (stage.get("usedDisk") or stage.get("spills", 0) > 0):
+        summary["sort_spilled"] = True
+    children = [stage["inputStage"]] if "inputStage" in stage else stage.get("inputStages", [])
+    for child in children:
+        _walk_execution_stages(child, summary)
+
+
+def _summarize_cursor(explain: Dict[str, Any], summary: Dict[str, Any]):
+    """Fold queryPlanner/executionStats of one cursor into the summary"""
+    planner = explain.get("queryPlanner", {})
+    stats = explain.get("executionStats", {})
+    summary["docs_examined"] += stats.get("totalDocsExamined", 0)
+    summary["keys_examined"] += stats.get("totalKeysExamined", 0)
+    summary["execution_time_ms"] = max(summary["execution_time_ms"], stats.get("executionTimeMillis", 0))
+    shape = _plan_shape(planner.get("winningPlan"))
+    if shape:
+        summary["plan_shapes"].append(shape)
+    _walk_execution_stages(stats.get("executionStages"), summary)
+
+
+def _summarize_shard(explain: Dict[str, Any], summary: Dict[str, Any]):
+    """Summarize the explain of a single (unsharded or per-shard) aggregation"""
+    if "stages" not in explain:
+        # Whole pipeline pushed down into the query layer
+        _summarize_cursor(explain, summary)
+        return
+
+    for stage in explain["stages"]:
+        name = next(key for key in stage if key.startswith("$"))
+        if name == "$cursor":
+            _summarize_cursor(stage["$cursor"], summary)
+        else:
+            summary["stage_times_ms"].append((name, stage.get("executionTimeMillisEstimate", 0)))
+        if name == "$sort" and (stage.get("usedDisk") or stage.get("spills", 0) > 0):
+            summary["sort_spilled"] = True
+        if name == "$lookup":
+            summary["docs_examined"] += stage.get("totalDocsExamined", 0)
+            summary["keys_examined"] += stage.get("totalKeysExamined", 0)
+            if stage.get("collectionScans", 0) > 0:
+                summary["plan_shapes"].append(f"$lookup > COLLSCAN x{stage['collectionScans']}")
+
+
+def summarize_explain(explain: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce an explain("executionStats") document to the figures tracked per benchmark
+
+    Handles classic multi-stage output, fully pushed-down (SBE) output and sharded
+    output from mongos, where every shard reports its own part of the pipeline.
+    shards_targeted is the number of shards mongos sent the pipeline to (None when
+    not running against a sharded cluster).
+
+    Args:
+        explain (dict): Raw explain output
+
+    Returns:
+        dict: docs/keys examined, execution time, per-stage times, sort spill flag and plan shape
+    """
+    summary: Dict[str, Any] = {
+        "docs_examined": 0,
+        "keys_examined": 0,
+        "execution_time_ms": 0,
+        "stage_times_ms": [],
+        "sort_spilled": False,
+        "plan_shapes": [],
+        "shards_targeted": None,
+        "shard_names": []
+    }
+
+    if "shards" in explain:
+        summary["shards_targeted"] = len(explain["shards"])
+        summary["shard_names"] = sorted(explain["shards"])
+        for shard_explain in explain["shards"].values():
+            _summarize_shard(shard_explain, summary)
+    else:
+        _summarize_shard(explain, summary)
+
+    summary["plan_shape"] = " ; ".join(dict.fromkeys(summary.pop("plan_shapes")))
+    summary["collection_scan"] = "COLLSCAN" in summary["plan_shape"]
+    return summary
+
+
+def detect_regressions(previous: Dict[str, Any], current: Dict[str, Any], growth_threshold: float = 1.5) -> List[str]:
+    """
+    Compare two execution summaries of the same pipeline
+
+    Args:
+        previous (dict): Summary from the baseline run
+        current (dict): Summary from this run
+        growth_threshold (float): Ratio above which examined counts or time count as a regression
+
+    Returns:
+        list: Human-readable regression descriptions, empty if none
+    """
+    regressions = []
+    if previous.get("plan_shape") != current.get("plan_shape"):
+        regressions.append(f"plan changed: '{previous.get('plan_shape')}' -> '{current.get('plan_shape')}'")
+    if current.get("collection_scan") and not previous.get("collection_scan"):
+        regressions.append("new collection scan")
+    if current.get("sort_spilled") and not previous.get("sort_spilled"):
+        regressions.append("sort now spills to disk")
+    if (current.get("shards_targeted") or 0) > (previous.get("shards_targeted") or 0) > 0:
+        regressions.append(f"targets {current['shards_targeted']} shards (was {previous['shards_targeted']})")
+    for key in ("docs_examined", "keys_examined", "execution_time_ms"):
+        old, new = previous.get(key, 0), current.get(key, 0)
+        if new > max(old, 1) * growth_threshold:
+            regressions.append(f"{key} grew {old} -> {new}")
+    return regressions
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    """Load stored execution summaries keyed by query name"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def save_baseline(path: str, baseline: Dict[str, Any]):
+    """Persist execution summaries keyed by query name"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(baseline, file, indent=2)
@@ -0,0 +1,113 @@
+import logging
+import time
+from datetime import datetime
+from typing import List, Dict, Any
+
+# Writers set this with {"$currentDate": {UPDATED_AT_FIELD: True}} so incremental refreshes see the change
+UPDATED_AT_FIELD = "updated_at"
+
+
+class GlobalTrendsView:
+    def __init__(
+        self,
+        db,
+        source: str = "regional_trends",
+        target: str = "global_trends",
+        watermark_collection: str = "view_watermarks"
+    ):
+        """
+        Materialized view of total views/likes per content across all regions, maintained with $merge
+
+        Args:
+            db: pymongo Database
+            source (str): Collection holding the per-region rows
+            target (str): Materialized view collection
+            watermark_collection (str): Collection storing the last refresh watermark
+        """
+        self.db = db
+        self.source = source
+        self.target = target
+        self.watermarks = db[watermark_collection]
+        self.logger = logging.getLogger(__name__)
+
+    def ensure_indexes(self):
+        """Index the view for the top-K sort and the source for watermark scans"""
+        self.db[self.target].create_index([("total_views", -1)])
+        self.db[self.source].create_index([(UPDATED_AT_FIELD, 1)])
+
+    def _merge_pipeline(self, match: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        pipeline = [{"$match": match}] if match else []
+        pipeline += [
+            {"$group": {
+                "_id": "$top_content",
+                "total_views": {"$sum": "$engagement_metrics.total_views"},
+                "total_likes": {"$sum": "$engagement_metrics.total_likes"},
+                "regions": {"$addToSet": "$region"}
+            }},
+            {"$set": {"refreshed_at": "$$NOW"}},
+            {"$merge": {"into": self.target, "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}}
+        ]
+        return pipeline
+
+    def _server_time(self) -> datetime:
+        """Current server clock, so watermarks and $$NOW come from the same clock"""
+        return self.db.command("hello")["localTime"]
+
+    def _get_watermark(self):
+        document = self.watermarks.find_one({"_id": self.target})
+        return document["watermark"] if document else None
+
+    def _set_watermark(self, watermark: datetime):
+        self.watermarks.update_one({"_id": self.target}, {"$set": {"watermark": watermark}}, upsert=True)
+
+    def rebuild(self) -> Dict[str, float]:
+        """
+        Recompute the whole view and reset the watermark
+
+        Rows of content that no longer exists in the source are removed afterwards, so the
+        view stays readable during the rebuild.
+
+        Returns:
+            dict: Number of view rows and duration in milliseconds
+        """
+        self.ensure_indexes()
+        start_time = time.perf_counter()
+        watermark = self._server_time()
+        self.db[self.source].aggregate(self._merge_pipeline())
+        self.db[self.target].delete_many({"refreshed_at": {"$lt": watermark}})
+        self._set_watermark(watermark)
+        duration = (time.perf_counter() - start_time) * 1000
+        rows = self.db[self.target].estimated_document_count()
+        self.logger.info(f"Rebuilt {self.target}: {rows} rows in {duration:.2f} ms")
+        return {"rows": rows, "duration_ms": duration}
+
+    def refresh_incremental(self) -> Dict[str, float]:
+        """
+        Recompute only content whose source rows changed since the last watermark
+
+        Changed rows are found through UPDATED_AT_FIELD. Deleting a source row or changing
+        its top_content is not visible this way and needs rebuild().
+
+        Returns:
+            dict: Number of content rows recomputed and duration in milliseconds
+        """
+        previous = self._get_watermark()
+        if previous is None:
+            return self.rebuild()
+
+        start_time = time.perf_counter()
+        watermark = self._server_time()
+        changed = self.db[self.source].distinct(
+            "top_content", {UPDATED_AT_FIELD: {"$gt": previous, "$lte": watermark}}
+        )
+        if changed:
+            self.db[self.source].aggregate(self._merge_pipeline({"top_content": {"$in": changed}}))
+        self._set_watermark(watermark)
+
+        duration = (time.perf_counter() - start_time) * 1000
+        self.logger.info(f"Refreshed {len(changed)} rows of {self.target} in {duration:.2f} ms")
+        return {"rows": len(changed), "duration_ms": duration}
+
+    def top(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Global top content, served from the total_views index"""
+        return list(self.db[self.target].find({}, {"total_views": 1}).sort("total_views", -1).limit(limit))
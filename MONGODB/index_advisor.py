@@ -0,0 +1,111 @@
+import logging
+from typing import List, Dict, Any, Tuple
+
+# Match operators that make a field a range predicate rather than an equality one
+RANGE_OPERATORS = {"$gt", "$gte", "$lt", "$lte", "$ne", "$nin", "$exists"}
+
+
+class IndexAdvisor:
+    def __init__(self, db):
+        """
+        Propose and create indexes for aggregation pipelines
+
+        Args:
+            db: pymongo Database the pipelines run against
+        """
+        self.db = db
+        self.logger = logging.getLogger(__name__)
+
+    def analyze(self, collection: str, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Inspect a pipeline and propose indexes that serve it
+
+        The leading $match/$sort stages yield one compound index following the
+        Equality-Sort-Range rule. Every $lookup with localField/foreignField yields an
+        index on the foreign field of the joined collection.
+
+        Args:
+            collection (str): Collection the pipeline runs on
+            pipeline (list): MongoDB aggregation pipeline
+
+        Returns:
+            list: Proposals as {'collection', 'keys', 'reason'} dicts
+        """
+        equality_fields: List[str] = []
+        range_fields: List[str] = []
+        sort_keys: List[Tuple[str, int]] = []
+        lookup_proposals: List[Dict[str, Any]] = []
+        leading = True
+
+        for stage in pipeline:
+            operator, spec = next(iter(stage.items()))
+            if operator == "$match" and leading:
+                for field, condition in spec.items():
+                    if field.startswith("$"):
+                        continue  # $or / $expr etc. are not turned into index keys
+                    if isinstance(condition, dict) and RANGE_OPERATORS.intersection(condition):
+                        range_fields.append(field)
+                    else:
+                        equality_fields.append(field)
+            elif operator == "$sort" and leading:
+                sort_keys = list(spec.items())
+                leading = False  # Stages after the first $sort can no longer use the index
+            elif operator == "$lookup" and "foreignField" in spec:
+                lookup_proposals.append({
+                    "collection": spec["from"],
+                    "keys": [(spec["foreignField"], 1)],
+                    "reason": f"$lookup from {collection}.{spec['localField']} on {spec['from']}.{spec['foreignField']}"
+                })
+                leading = False
+            else:
+                leading = False
+
+        proposals = []
+        keys = [(field, 1) for field in equality_fields]
+        keys += [(field, direction) for field, direction in sort_keys if field not in equality_fields]
+        keys += [(field, 1) for field in range_fields if field not in dict(keys)]
+        if keys:
+            proposals.append({
+                "collection": collection,
+                "keys": keys,
+                "reason": "leading $match/$sort (equality, sort, range)"
+            })
+        proposals.extend(lookup_proposals)
+
+        return [proposal for proposal in proposals if not self.is_covered(proposal["collection"], proposal["keys"])]
+
+    def is_covered(self, collection: str, keys: List[Tuple[str, int]]) -> bool:
+        """
+        Check whether an existing index already has `keys` as a prefix
+
+        An index whose prefix has every direction inverted serves the same sorts.
+        """
+        inverted = [(field, -direction) for field, direction in keys]
+        for index in self.db[collection].index_information().values():
+            prefix = [(field, direction) for field, direction in index["key"]][:len(keys)]
+            if prefix == keys or prefix == inverted:
+                return True
+        return False
+
+    def create_indexes(self, proposals: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """
+        Create proposed indexes
+
+        Args:
+            proposals (list): Output of analyze()
+
+        Returns:
+            list: (collection, index name) of every index created
+        """
+        created = []
+        for proposal in proposals:
+            name = self.db[proposal["collection"]].create_index(proposal["keys"])
+            self.logger.info(f"Created index {name} on {proposal['collection']} ({proposal['reason']})")
+            created.append((proposal["collection"], name))
+        return created
+
+    def drop_indexes(self, created: List[Tuple[str, str]]):
+        """Drop indexes previously returned by create_indexes"""
+        for collection, name in created:
+            self.db[collection].drop_index(name)
+            self.logger.info(f"Dropped index {name} on {collection}")
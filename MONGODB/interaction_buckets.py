@@ -0,0 +1,206 @@
+import argparse
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Optional
+
+from pymongo import MongoClient, UpdateOne
+
+# One document per user per month, each holding at most BUCKET_MAX_EVENTS compact events
+BUCKET_COLLECTION = "interaction_history_buckets"
+BUCKET_MAX_EVENTS = 200
+
+INTERACTION_TYPES = ["view", "like", "share"]
+
+logger = logging.getLogger(__name__)
+
+
+def _as_datetime(timestamp) -> datetime:
+    """interaction_history stores ISO strings, buckets store BSON dates"""
+    return timestamp if isinstance(timestamp, datetime) else datetime.fromisoformat(timestamp)
+
+
+def bucket_start(timestamp) -> datetime:
+    """First instant of the month bucket a timestamp falls into"""
+    timestamp = _as_datetime(timestamp)
+    return datetime(timestamp.year, timestamp.month, 1)
+
+
+def compact_event(interaction: Dict[str, Any]) -> Dict[str, Any]:
+    """Event as stored inside a bucket, with short keys since the user is stored once per bucket"""
+    return {
+        "c": interaction["content_id"],
+        "t": interaction["interaction_type"],
+        "ts": _as_datetime(interaction["timestamp"])
+    }
+
+
+def unpack(bucket: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Expand a bucket back into flat interaction_history-shaped documents"""
+    return [
+        {
+            "user_id": bucket["user_id"],
+            "content_id": event["c"],
+            "interaction_type": event["t"],
+            "timestamp": event["ts"]
+        }
+        for event in bucket["events"]
+    ]
+
+
+def bucketize(interactions: Iterable[Dict[str, Any]], max_events: int = BUCKET_MAX_EVENTS) -> List[Dict[str, Any]]:
+    """
+    Group flat interactions into full bucket documents for bulk loading
+
+    Args:
+        interactions (iterable): interaction_history documents
+        max_events (int): Events per bucket before another bucket of the same month is started
+
+    Returns:
+        list: Bucket documents ready for insert_many
+    """
+    grouped = defaultdict(list)
+    for interaction in interactions:
+        event = compact_event(interaction)
+        grouped[(interaction["user_id"], bucket_start(event["ts"]))].append(event)
+
+    buckets = []
+    for (user_id, start), events in grouped.items():
+        events.sort(key=lambda event: event["ts"])
+        for offset in range(0, len(events), max_events):
+            chunk = events[offset:offset + max_events]
+            counts = {interaction_type: 0 for interaction_type in INTERACTION_TYPES}
+            for event in chunk:
+                counts[event["t"]] = counts.get(event["t"], 0) + 1
+            buckets.append({
+                "user_id": user_id,
+                "bucket_start": start,
+                "count": len(chunk),
+                "counts": counts,
+                "first_ts": chunk[0]["ts"],
+                "last_ts": chunk[-1]["ts"],
+                "events": chunk
+            })
+    return buckets
+
+
+def ensure_indexes(db, collection: str = BUCKET_COLLECTION):
+    """Index serving both the append upsert and the newest-first read"""
+    db[collection].create_index([("user_id", 1), ("bucket_start", -1), ("count", 1)])
+
+
+def append_operation(interaction: Dict[str, Any], max_events: int = BUCKET_MAX_EVENTS) -> UpdateOne:
+    """
+    Upsert appending one interaction to the user's current bucket for its month
+
+    A full bucket no longer matches the filter, so the upsert opens a new one.
+    """
+    event = compact_event(interaction)
+    return UpdateOne(
+        {"user_id": interaction["user_id"], "bucket_start": bucket_start(event["ts"]), "count": {"$lt": max_events}},
+        {
+            "$push": {"events": event},
+            "$inc": {"count": 1, f"counts.{event['t']}": 1},
+            "$min": {"first_ts": event["ts"]},
+            "$max": {"last_ts": event["ts"]}
+        },
+        upsert=True
+    )
+
+
+def append_interactions(db, interactions: Iterable[Dict[str, Any]], collection: str = BUCKET_COLLECTION) -> int:
+    """
+    Append interactions to their buckets in one unordered bulk write
+
+    Returns:
+        int: Number of interactions written
+    """
+    operations = [append_operation(interaction) for interaction in interactions]
+    if operations:
+        db[collection].bulk_write(operations, ordered=False)
+    return len(operations)
+
+
+def last_interactions(db, user_id: str, limit: int = 20, collection: str = BUCKET_COLLECTION) -> List[Dict[str, Any]]:
+    """
+    Most recent interactions of a user, unpacked from the newest buckets
+
+    Buckets are read newest month first; every bucket of a month is read before
+    stopping, since an out-of-order event may sit in any of them.
+
+    Args:
+        db: pymongo Database
+        user_id (str): User whose interactions are read
+        limit (int): Number of interactions returned
+
+    Returns:
+        list: Flat interaction documents, newest first
+    """
+    events = []
+    reached_month: Optional[datetime] = None
+    cursor = db[collection].find({"user_id": user_id}, {"_id": 0}).sort("bucket_start", -1)
+    for bucket in cursor:
+        if reached_month is not None and bucket["bucket_start"] < reached_month:
+            break
+        events.extend(unpack(bucket))
+        if reached_month is None and len(events) >= limit:
+            reached_month = bucket["bucket_start"]
+    cursor.close()
+    events.sort(key=lambda event: event["timestamp"], reverse=True)
+    return events[:limit]
+
+
+def interaction_counts(db, user_id: str, collection: str = BUCKET_COLLECTION) -> Dict[str, int]:
+    """Totals per interaction type of a user, from the precomputed bucket counts"""
+    group = {"_id": None, **{interaction_type: {"$sum": f"$counts.{interaction_type}"} for interaction_type in INTERACTION_TYPES}}
+    result = list(db[collection].aggregate([{"$match": {"user_id": user_id}}, {"$group": group}]))
+    if not result:
+        return {interaction_type: 0 for interaction_type in INTERACTION_TYPES}
+    result[0].pop("_id")
+    return result[0]
+
+
+def migrate(db, source: str = "interaction_history", collection: str = BUCKET_COLLECTION, batch_users: int = 1000) -> int:
+    """
+    Rebuild the bucket collection from the flat interaction_history
+
+    Interactions are read in user order so buckets are built a batch of users at a time.
+
+    Returns:
+        int: Number of buckets written
+    """
+    db.drop_collection(collection)
+    ensure_indexes(db, collection)
+
+    written = 0
+    batch, users = [], set()
+    projection = {"_id": 0, "user_id": 1, "content_id": 1, "interaction_type": 1, "timestamp": 1}
+    for interaction in db[source].find({}, projection).sort("user_id", 1):
+        if interaction["user_id"] not in users and len(users) >= batch_users:
+            buckets = bucketize(batch)
+            db[collection].insert_many(buckets, ordered=False)
+            written += len(buckets)
+            batch, users = [], set()
+        users.add(interaction["user_id"])
+        batch.append(interaction)
+    if batch:
+        buckets = bucketize(batch)
+        db[collection].insert_many(buckets, ordered=False)
+        written += len(buckets)
+
+    logger.info(f"Bucketed {source} into {written} documents of {collection}")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the time-bucketed interaction_history collection")
+    parser.add_argument("--connection-string", default="mongodb://localhost:27015/")
+    parser.add_argument("--database", default="DDS_Project")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)-8s | %(message)s')
+    migrate(MongoClient(args.connection_string)[args.database])
+
+
+if __name__ == "__main__":
+    main()
@@ -7,27 +7,45 @@
 
 
 
+import os
 import time
+import copy
+import threading
+import asyncio
+import random
+from datetime import datetime
 import statistics
 import logging
-from typing import List, Dict, Any
-from pymongo import MongoClient
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from pymongo import MongoClient, InsertOne, UpdateOne
+from pymongo.write_concern import WriteConcern
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import psutil
-import plotly.graph_objs as plt
-import plotly.io as pio
-import numpy as np
+from index_advisor import IndexAdvisor
+from explain_stats import explain_pipeline, summarize_explain, detect_regressions, load_baseline, save_baseline
+from read_preference_routing import region_read_preference, member_staleness
+import content_snapshot
+from global_trends_view import GlobalTrendsView, UPDATED_AT_FIELD
+from topk_cache import TopKCache
+from driver_monitoring import RequestBreakdownRecorder, summarize_breakdowns
+from sample_store import new_run_id, save_samples
+from workload_spec import WorkloadSpec, default_workload, sample_field
+import interaction_buckets
 
 class EnhancedQueryPerformanceAnalyzer:
     def __init__(self, connection_string: str, database: str):
         """
-        Initialize the performance analyzer with enhanced logging and visualization
+        Initialize the performance analyzer with enhanced logging and raw sample persistence
         
         Args:
             connection_string (str): MongoDB connection string
             database (str): Database name
         """
-        self.client = MongoClient(connection_string)
+        self.connection_string = connection_string
+
+        # Pool checkout and command round-trip timings per request, from driver events
+        self.recorder = RequestBreakdownRecorder()
+        self.client = MongoClient(connection_string, event_listeners=self.recorder.listeners())
         self.db = self.client[database]
         
         # Configure enhanced logging
@@ -39,13 +57,27 @@ class EnhancedQueryPerformanceAnalyzer:
         )
         self.logger = logging.getLogger(__name__)
 
+        # Files written by the benchmarks, kept out of the working directory (ignored by git)
+        self.output_dir = 'benchmark_output'
+
+        # Execution summaries of previous runs, used to flag plan regressions
+        self.explain_baseline_path = os.path.join(self.output_dir, 'explain_baseline.json')
+
+        # Raw latency samples of every benchmark, rendered later by report_builder.py
+        self.samples_dir = os.path.join(self.output_dir, 'samples')
+        self.run_id = new_run_id()
+
     def measure_query_performance(
         self, 
         collection: str, 
         pipeline: List[Dict[str, Any]], 
         query_name: str = "Default Query",
         num_requests: int = 100, 
-        concurrent_users: int = 10
+        concurrent_users: int = 10,
+        warmup_requests: int = 0,
+        window_seconds: float = 1.0,
+        capture_explain: bool = True,
+        read_preference=None
     ) -> Dict[str, float]:
         """
         Comprehensively measure query performance with millisecond-level precision
@@ -56,46 +88,840 @@ class EnhancedQueryPerformanceAnalyzer:
             query_name (str): Name for identifying the specific query
             num_requests (int): Number of requests to simulate
             concurrent_users (int): Number of concurrent users
+            warmup_requests (int): Requests executed before timing starts and excluded from results
+            window_seconds (float): Width of the throughput/latency time series windows
+            capture_explain (bool): Run explain("executionStats") once and store it with the metrics
+            read_preference: pymongo read preference for the benchmarked reads (default: client's)
         
         Returns:
             dict: Detailed performance metrics
         """
-        # Individual query response times
-        response_times: List[float] = []
-        query_results: List[Any] = []
-        
+        target = self.db.get_collection(collection, read_preference=read_preference)
+
         def execute_query():
-            """Execute single query and track response time with high precision"""
-            start_time = time.perf_counter()
-            try:
-                result = list(self.db[collection].aggregate(pipeline))
-                response_time = (time.perf_counter() - start_time) * 1000  # Convert to milliseconds
-                response_times.append(response_time)
-                query_results.append(result)
-                return result
-            except Exception as e:
-                self.logger.error(f"Query execution error for {query_name}: {e}")
-                return None
+            """Execute single aggregation and materialize the cursor"""
+            return list(target.aggregate(pipeline))
 
         # Detailed logging of query parameters
         self.logger.info(f"Performance Test Started: {query_name}")
         self.logger.info(f"Collection: {collection}")
         self.logger.info(f"Concurrent Users: {concurrent_users}")
         self.logger.info(f"Total Requests: {num_requests}")
+        self.logger.info(f"Warmup Requests: {warmup_requests}")
         self.logger.info(f"Pipeline: {pipeline}")
+        if read_preference is not None:
+            self.logger.info(f"Read Preference: {read_preference}")
+
+        breakdowns: List[Dict[str, float]] = []
+        metrics = self._run_benchmark(
+            execute_query, query_name, num_requests, concurrent_users, warmup_requests, window_seconds,
+            breakdowns=breakdowns
+        )
+        if capture_explain:
+            metrics['execution_stats'] = self._capture_execution_stats(collection, pipeline, query_name)
+
+        server_time = (metrics.get('execution_stats') or {}).get('execution_time_ms')
+        metrics['latency_breakdown'] = summarize_breakdowns(breakdowns, server_time)
+        self._log_latency_breakdown(query_name, metrics['latency_breakdown'])
+        return metrics
+
+    def _log_latency_breakdown(self, query_name: str, breakdown: Dict[str, Any]):
+        """
+        Log where the client-side latency of a run went
+        
+        Args:
+            query_name (str): Name of the query being analyzed
+            breakdown (dict): Output of summarize_breakdowns
+        """
+        if not breakdown:
+            return
+        self.logger.info(f"Latency Breakdown for {query_name}:")
+        for description, key in [
+            ("Avg Total", "avg_total_ms"),
+            ("Avg Pool Queueing", "avg_queueing_ms"),
+            ("P95 Pool Queueing", "p95_queueing_ms"),
+            ("Avg Command Round Trip", "avg_command_round_trip_ms"),
+            ("Avg Server (explain)", "avg_server_ms"),
+            ("Avg Network", "avg_network_ms"),
+            ("Avg Client Overhead", "avg_client_overhead_ms"),
+            ("Avg Connection Creation", "avg_connection_creation_ms")
+        ]:
+            value = breakdown.get(key)
+            self.logger.info(f"{description:<30}: {'-' if value is None else f'{value:.2f} ms'}")
+        self.logger.info(f"{'Connections Created':<30}: {breakdown['connections_created']}")
+
+    def measure_find_performance(
+        self,
+        collection: str,
+        filter: Dict[str, Any],
+        sort: List[Tuple[str, int]],
+        limit: int,
+        query_name: str = "Default Query",
+        num_requests: int = 100,
+        concurrent_users: int = 10,
+        warmup_requests: int = 0,
+        window_seconds: float = 1.0
+    ) -> Dict[str, Any]:
+        """
+        Measure a find().sort().limit() query with the same metrics as aggregation pipelines
+        
+        Args:
+            collection (str): Collection to query
+            filter (dict): Query filter
+            sort (list): (field, direction) sort specification
+            limit (int): Maximum documents returned
+            query_name (str): Name for identifying the specific query
+            num_requests (int): Number of requests to simulate
+            concurrent_users (int): Number of concurrent users
+            warmup_requests (int): Requests executed before timing starts and excluded from results
+            window_seconds (float): Width of the throughput/latency time series windows
+        
+        Returns:
+            dict: Detailed performance metrics
+        """
+        def execute_query():
+            """Execute single find and materialize the cursor"""
+            return list(self.db[collection].find(filter).sort(sort).limit(limit))
+
+        self.logger.info(f"Performance Test Started: {query_name}")
+        self.logger.info(f"Collection: {collection}")
+        self.logger.info(f"Find: filter={filter} sort={sort} limit={limit}")
+
+        return self._run_benchmark(
+            execute_query, query_name, num_requests, concurrent_users, warmup_requests, window_seconds
+        )
+
+    def benchmark_global_view(
+        self,
+        global_pipeline: List[Dict[str, Any]],
+        changed_rows: int = 10,
+        num_requests: int = 1000,
+        concurrent_users: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Compare the on-the-fly global aggregation with the global_trends materialized view
+        
+        Refresh cost is measured apart from query latency: a full rebuild, then an
+        incremental refresh after touching `changed_rows` regional_trends rows.
+        
+        Args:
+            global_pipeline (list): Current $group-based global pipeline
+            changed_rows (int): Source rows marked as changed before the incremental refresh
+            num_requests (int): Number of requests per query variant
+            concurrent_users (int): Number of concurrent users
+        
+        Returns:
+            dict: Query metrics of both variants and the refresh costs
+        """
+        view = GlobalTrendsView(self.db)
+        rebuild = view.rebuild()
+
+        aggregate_metrics = self.measure_query_performance(
+            "regional_trends", global_pipeline, "Global Content Trends (aggregation)",
+            num_requests, concurrent_users, warmup_requests=concurrent_users
+        )
+        view_metrics = self.measure_find_performance(
+            view.target, {}, [("total_views", -1)], 5, "Global Content Trends (materialized view)",
+            num_requests, concurrent_users, warmup_requests=concurrent_users
+        )
+        self._log_comparison("Global Content Trends", "Aggregation", aggregate_metrics, "View", view_metrics)
+
+        # Mark a sample of rows as changed without altering their metrics
+        sample = [row["_id"] for row in self.db.regional_trends.aggregate([{"$sample": {"size": changed_rows}}])]
+        self.db.regional_trends.update_many(
+            {"_id": {"$in": sample}}, {"$currentDate": {UPDATED_AT_FIELD: True}}
+        )
+        incremental = view.refresh_incremental()
+
+        self.logger.info(f"View full rebuild: {rebuild['rows']} rows in {rebuild['duration_ms']:.2f} ms")
+        self.logger.info(f"View incremental refresh: {incremental['rows']} rows in {incremental['duration_ms']:.2f} ms")
+        return {
+            'aggregation': aggregate_metrics,
+            'view': view_metrics,
+            'rebuild': rebuild,
+            'incremental_refresh': incremental
+        }
+
+    def benchmark_topk_cache(
+        self,
+        region: str,
+        num_requests: int = 1000,
+        concurrent_users: int = 100,
+        lag_samples: int = 20
+    ) -> Dict[str, Any]:
+        """
+        Measure the change-stream-fed top-K cache: read latency, update visibility lag and memory
+        
+        Args:
+            region (str): Region whose cached top-K is read
+            num_requests (int): Number of cached reads per ranking
+            concurrent_users (int): Number of concurrent users
+            lag_samples (int): Writes timed until they become visible in the cache
+        
+        Returns:
+            dict: Read metrics for regional and global rankings, lag statistics and memory use
+        """
+        cache = TopKCache(self.db, state_path=os.path.join(self.output_dir, "topk_cache_state.json"))
+        start_time = time.perf_counter()
+        cache.start()
+        startup_ms = (time.perf_counter() - start_time) * 1000
+
+        try:
+            regional_metrics = self._run_benchmark(
+                lambda: cache.regional_top(region), f"{region} Regional Trends (top-K cache)",
+                num_requests, concurrent_users
+            )
+            global_metrics = self._run_benchmark(
+                cache.global_top, "Global Content Trends (top-K cache)", num_requests, concurrent_users
+            )
+
+            # Update-to-visibility lag: bump a row's views and wait for the cache to reflect it
+            lags = []
+            row = self.db.regional_trends.find_one({"region": region}, {"engagement_metrics.total_views": 1})
+            for _ in range(lag_samples if row else 0):
+                expected = (cache.row_views(row["_id"]) or 0) + 1
+                write_start = time.perf_counter()
+                self.db.regional_trends.update_one(
+                    {"_id": row["_id"]}, {"$inc": {"engagement_metrics.total_views": 1}}
+                )
+                if cache.wait_until(lambda: cache.row_views(row["_id"]) == expected):
+                    lags.append((time.perf_counter() - write_start) * 1000)
+            if row and lag_samples:
+                self.db.regional_trends.update_one(
+                    {"_id": row["_id"]}, {"$inc": {"engagement_metrics.total_views": -lag_samples}}
+                )
+            memory_bytes = cache.memory_bytes()
+            valid = cache.valid
+        finally:
+            cache.stop()
+
+        lag = {
+            'samples': len(lags),
+            'avg_ms': statistics.mean(lags) if lags else None,
+            'max_ms': max(lags) if lags else None
+        }
+        self.logger.info(f"Top-K cache startup: {startup_ms:.2f} ms")
+        self.logger.info(f"Top-K cache visibility lag: {lag}")
+        self.logger.info(f"Top-K cache memory: {memory_bytes / 1024:.1f} KiB")
+        if not valid:
+            self.logger.warning("Top-K cache change stream was not open at the end of the run, results may be stale")
+        return {
+            'regional': regional_metrics,
+            'global': global_metrics,
+            'startup_ms': startup_ms,
+            'visibility_lag': lag,
+            'memory_bytes': memory_bytes,
+            'valid': valid
+        }
+
+    def measure_workload(
+        self,
+        spec: WorkloadSpec,
+        num_requests: int = 1000,
+        concurrent_users: int = 50,
+        warmup_requests: int = 0,
+        window_seconds: float = 1.0
+    ) -> Dict[str, Any]:
+        """
+        Replay a weighted mix of query templates, instantiating every request with fresh parameters
+        
+        Args:
+            spec (WorkloadSpec): Templates, weights and parameter generators
+            num_requests (int): Number of timed requests across all templates
+            concurrent_users (int): Number of concurrent users
+            warmup_requests (int): Untimed requests drawn from the same mix
+            window_seconds (float): Width of the time series windows
+        
+        Returns:
+            dict: Metrics of the whole mix, with per-template latency under 'templates'
+        """
+        # Operations are drawn before dispatch so a seeded spec replays the same requests
+        operations = iter(spec.generate(warmup_requests + num_requests))
+        operations_lock = threading.Lock()
+
+        def execute_request():
+            with operations_lock:
+                template, pipeline = next(operations)
+            return template.name, list(self.db[template.collection].aggregate(pipeline))
+
+        self.logger.info(f"Performance Test Started: {spec.name}")
+        self.logger.info(f"Template Mix: {spec.shares()}")
+
+        label_samples: Dict[str, List[float]] = {}
+        metrics = self._run_benchmark(
+            execute_request, spec.name, num_requests, concurrent_users, warmup_requests, window_seconds,
+            label_samples=label_samples
+        )
+
+        metrics['templates'] = {}
+        for name, response_times in label_samples.items():
+            response_times.sort()
+            metrics['templates'][name] = {
+                'requests': len(response_times),
+                'share': len(response_times) / num_requests,
+                'avg_response_time_ms': statistics.mean(response_times),
+                'p50_response_time_ms': self._percentile(response_times, 50),
+                'p95_response_time_ms': self._percentile(response_times, 95),
+                'p99_response_time_ms': self._percentile(response_times, 99),
+                'max_response_time_ms': response_times[-1]
+            }
+
+        self.logger.info(f"Per-template latency for: {spec.name}")
+        self.logger.info(
+            f"{'Template':<25}  {'Requests':>8}  {'Avg ms':>8}  {'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}  {'Max ms':>8}"
+        )
+        for name, stats in metrics['templates'].items():
+            self.logger.info(
+                f"{name:<25}  {stats['requests']:>8}  {stats['avg_response_time_ms']:>8.2f}  "
+                f"{stats['p50_response_time_ms']:>8.2f}  {stats['p95_response_time_ms']:>8.2f}  "
+                f"{stats['p99_response_time_ms']:>8.2f}  {stats['max_response_time_ms']:>8.2f}"
+            )
+        return metrics
+
+    def _collection_storage(self, collection: str) -> Dict[str, Any]:
+        """Document count, data size and index size of a collection from collStats"""
+        stats = self.db.command("collStats", collection)
+        return {
+            'documents': stats.get('count', 0),
+            'data_bytes': stats.get('size', 0),
+            'storage_bytes': stats.get('storageSize', 0),
+            'index_bytes': stats.get('totalIndexSize', 0),
+            'indexes': stats.get('nindexes', 0)
+        }
+
+    def benchmark_interaction_buckets(
+        self,
+        history_limit: int = 20,
+        num_requests: int = 500,
+        concurrent_users: int = 20,
+        insert_events: int = 20000,
+        batch_size: int = 500,
+        concurrent_writers: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Compare the flat interaction_history schema with the time-bucketed one
+        
+        Storage and "last N interactions" latency are measured on the loaded interaction_history
+        and on a bucketed copy rebuilt from it for every run, each with the index its read needs;
+        a bucket collection kept from an earlier load would no longer match regenerated data.
+        Insert throughput is measured on scratch collections fed the same kind of generated
+        events, appended to buckets by upsert.
+        
+        Args:
+            history_limit (int): N of the last-N-interactions read
+            num_requests (int): Number of timed reads per schema
+            concurrent_users (int): Number of concurrent readers
+            insert_events (int): Events inserted per schema
+            batch_size (int): Events per bulk_write call
+            concurrent_writers (int): Number of concurrent writers
+        
+        Returns:
+            dict: Storage, read and insert metrics of both schemas
+        """
+        flat, bucketed = "interaction_history", interaction_buckets.BUCKET_COLLECTION
+        bucketed_copy = f"{bucketed}_schema_copy"
+        flat_scratch, bucketed_scratch = f"{flat}_schema_benchmark", f"{bucketed}_schema_benchmark"
+        try:
+            self.db[flat].create_index([("user_id", 1), ("timestamp", -1)])
+            interaction_buckets.migrate(self.db, flat, bucketed_copy)
+
+            report = {'storage': {flat: self._collection_storage(flat), bucketed: self._collection_storage(bucketed_copy)}}
+
+            user_ids = sample_field(self.db, flat, "user_id")
+            if not user_ids:
+                self.logger.warning("Interaction bucket benchmark skipped: interaction_history is empty")
+                return report
+
+            report['flat_read'] = self._run_benchmark(
+                lambda: list(
+                    self.db[flat].find({"user_id": random.choice(user_ids)}).sort("timestamp", -1).limit(history_limit)
+                ),
+                f"Last {history_limit} Interactions (flat)", num_requests, concurrent_users, warmup_requests=num_requests // 10
+            )
+            report['bucketed_read'] = self._run_benchmark(
+                lambda: interaction_buckets.last_interactions(self.db, random.choice(user_ids), history_limit, bucketed_copy),
+                f"Last {history_limit} Interactions (buckets)", num_requests, concurrent_users, warmup_requests=num_requests // 10
+            )
+
+            content_ids = sample_field(self.db, "content", "content_id") or [None]
+
+            def new_interactions(count: int) -> List[Dict[str, Any]]:
+                return [
+                    {
+                        "user_id": random.choice(user_ids),
+                        "content_id": random.choice(content_ids),
+                        "interaction_type": random.choice(interaction_buckets.INTERACTION_TYPES),
+                        "timestamp": datetime.now().isoformat()
+                    }
+                    for _ in range(count)
+                ]
+
+            for name in (flat_scratch, bucketed_scratch):
+                self.db.drop_collection(name)
+            self.db[flat_scratch].create_index([("user_id", 1), ("timestamp", -1)])
+            interaction_buckets.ensure_indexes(self.db, bucketed_scratch)
+
+            num_batches = max(1, insert_events // batch_size)
+            report['flat_insert'] = self.measure_bulk_write_performance(
+                flat_scratch, lambda count: [InsertOne(document) for document in new_interactions(count)],
+                "Interaction Inserts (flat)", num_batches, batch_size, concurrent_writers, ordered=False
+            )
+            report['bucketed_insert'] = self.measure_bulk_write_performance(
+                bucketed_scratch,
+                lambda count: [interaction_buckets.append_operation(document) for document in new_interactions(count)],
+                "Interaction Inserts (buckets)", num_batches, batch_size, concurrent_writers, ordered=False
+            )
+        finally:
+            for name in (bucketed_copy, flat_scratch, bucketed_scratch):
+                self.db.drop_collection(name)
+
+        self.logger.info(f"\n{'='*50}")
+        self.logger.info("Interaction history schema storage")
+        for name, storage in report['storage'].items():
+            self.logger.info(
+                f"{name:<30}: {storage['documents']} documents, data {storage['data_bytes'] / 1024 ** 2:.2f} MiB, "
+                f"{storage['indexes']} indexes {storage['index_bytes'] / 1024 ** 2:.2f} MiB"
+            )
+        self.logger.info(
+            f"Insert throughput: flat {report['flat_insert']['docs_per_sec']:.2f} events/sec, "
+            f"buckets {report['bucketed_insert']['docs_per_sec']:.2f} events/sec"
+        )
+        self._log_comparison(
+            f"Last {history_limit} Interactions", "Flat", report['flat_read'], "Buckets", report['bucketed_read']
+        )
+        return report
+
+    def measure_bulk_write_performance(
+        self,
+        collection: str,
+        make_operations,
+        query_name: str,
+        num_batches: int = 100,
+        batch_size: int = 100,
+        concurrent_writers: int = 10,
+        ordered: bool = True,
+        write_concern: Optional[WriteConcern] = None,
+        warmup_batches: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Measure concurrent bulk_write batches, each request writing one freshly generated batch
+        
+        Args:
+            collection (str): Name of the collection written to
+            make_operations (callable): Returns a list of batch_size write operations
+            query_name (str): Name for identifying the write configuration
+            num_batches (int): Number of timed bulk_write calls
+            batch_size (int): Operations per bulk_write call
+            concurrent_writers (int): Number of concurrent writers
+            ordered (bool): Stop at the first error and apply operations serially when True
+            write_concern (WriteConcern): Acknowledgement required per batch, collection default if None
+            warmup_batches (int): Untimed batches written first
+        
+        Returns:
+            dict: Detailed performance metrics plus documents written per second
+        """
+        target = self.db.get_collection(collection, write_concern=write_concern)
+
+        def execute_write():
+            return target.bulk_write(make_operations(batch_size), ordered=ordered)
+
+        metrics = self._run_benchmark(
+            execute_write, query_name, num_batches, concurrent_writers, warmup_requests=warmup_batches
+        )
+        metrics['batch_size'] = batch_size
+        metrics['docs_per_sec'] = metrics['throughput_queries_per_sec'] * batch_size
+        self.logger.info(f"{'Documents Written':<30}: {metrics['docs_per_sec']:.2f} docs/sec")
+        return metrics
+
+    def run_write_benchmark_suite(
+        self,
+        total_docs: int = 10000,
+        batch_sizes: Tuple[int, ...] = (10, 100, 1000),
+        concurrent_writers: int = 10,
+        target_suffix: str = "_write_benchmark"
+    ) -> List[Dict[str, Any]]:
+        """
+        Benchmark ordered vs unordered bulk_write across batch sizes and write concerns
+        
+        Two workloads are measured: inserts of new interaction_history documents and
+        $inc upserts of regional_trends engagement counters. Both write to scratch copies
+        (collection name + target_suffix), recreated for every configuration so each run
+        starts from the same state, and dropped at the end.
+        
+        Args:
+            total_docs (int): Documents written per configuration
+            batch_sizes (tuple): Operations per bulk_write call
+            concurrent_writers (int): Number of concurrent writers
+            target_suffix (str): Suffix of the scratch collection names
+        
+        Returns:
+            list: One entry per configuration with docs/sec and latency percentiles
+        """
+        write_concerns = {
+            "w:1": WriteConcern(w=1),
+            "w:majority": WriteConcern(w="majority"),
+            "j:true": WriteConcern(w=1, j=True)
+        }
+
+        # Real keys so the written documents look like the loaded data
+        user_ids = [doc["user_id"] for doc in self.db.users.aggregate([{"$sample": {"size": 1000}}, {"$project": {"user_id": 1}}])]
+        contents = list(self.db.content.aggregate([{"$sample": {"size": 200}}, {"$project": {"content_id": 1, "title": 1}}]))
+        regions = self.db.regional_trends.distinct("region")
+        if not user_ids or not contents or not regions:
+            self.logger.warning("Write benchmark skipped: users, content or regional_trends is empty")
+            return []
+
+        def interaction_inserts(count: int) -> List[InsertOne]:
+            return [
+                InsertOne({
+                    "user_id": random.choice(user_ids),
+                    "content_id": random.choice(contents)["content_id"],
+                    "interaction_type": random.choice(["view", "like", "share"]),
+                    "timestamp": datetime.now().isoformat()
+                })
+                for _ in range(count)
+            ]
+
+        def trend_upserts(count: int) -> List[UpdateOne]:
+            return [
+                UpdateOne(
+                    {"region": random.choice(regions), "top_content": random.choice(contents)["title"]},
+                    {
+                        "$inc": {"engagement_metrics.total_views": 1, "engagement_metrics.total_likes": random.randint(0, 1)},
+                        "$currentDate": {UPDATED_AT_FIELD: True}
+                    },
+                    upsert=True
+                )
+                for _ in range(count)
+            ]
+
+        # (name, scratch collection, operation generator, index the upsert filter needs)
+        workloads = [
+            ("interaction_history inserts", f"interaction_history{target_suffix}", interaction_inserts, None),
+            ("regional_trends $inc upserts", f"regional_trends{target_suffix}", trend_upserts,
+             [("region", 1), ("top_content", 1)])
+        ]
+
+        report = []
+        try:
+            for workload, target, make_operations, index_keys in workloads:
+                for batch_size in batch_sizes:
+                    for ordered in (True, False):
+                        for concern_label, write_concern in write_concerns.items():
+                            self.db.drop_collection(target)
+                            if index_keys:
+                                self.db[target].create_index(index_keys, unique=True)
+                            mode = "ordered" if ordered else "unordered"
+                            metrics = self.measure_bulk_write_performance(
+                                collection=target,
+                                make_operations=make_operations,
+                                query_name=f"{workload} ({mode}, {concern_label}, batch {batch_size})",
+                                num_batches=max(1, total_docs // batch_size),
+                                batch_size=batch_size,
+                                concurrent_writers=concurrent_writers,
+                                ordered=ordered,
+                                write_concern=write_concern
+                            )
+                            report.append({
+                                'workload': workload,
+                                'ordered': ordered,
+                                'write_concern': concern_label,
+                                'batch_size': batch_size,
+                                'docs_per_sec': metrics['docs_per_sec'],
+                                'p50_response_time_ms': metrics['p50_response_time_ms'],
+                                'p95_response_time_ms': metrics['p95_response_time_ms'],
+                                'p99_response_time_ms': metrics['p99_response_time_ms']
+                            })
+        finally:
+            for _, target, _, _ in workloads:
+                self.db.drop_collection(target)
+
+        self.logger.info(f"\n{'='*50}")
+        self.logger.info("Bulk write summary (p50/p95/p99 are per batch)")
+        self.logger.info(
+            f"{'Workload':<30}  {'Mode':<9}  {'Concern':<10}  {'Batch':>5}  "
+            f"{'docs/sec':>10}  {'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}"
+        )
+        for entry in report:
+            self.logger.info(
+                f"{entry['workload']:<30}  {'ordered' if entry['ordered'] else 'unordered':<9}  "
+                f"{entry['write_concern']:<10}  {entry['batch_size']:>5}  {entry['docs_per_sec']:>10.2f}  "
+                f"{entry['p50_response_time_ms']:>8.2f}  {entry['p95_response_time_ms']:>8.2f}  "
+                f"{entry['p99_response_time_ms']:>8.2f}"
+            )
+        self.logger.info(f"{'='*50}\n")
+        return report
+
+    def _capture_execution_stats(
+        self, collection: str, pipeline: List[Dict[str, Any]], query_name: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Explain the pipeline once, log the summary and flag regressions against the previous run
+        
+        Args:
+            collection (str): Collection the pipeline runs on
+            pipeline (list): MongoDB aggregation pipeline
+            query_name (str): Key under which the summary is stored in the baseline file
+        
+        Returns:
+            dict: Execution summary with a 'regressions' list, or None if explain failed
+        """
+        try:
+            summary = summarize_explain(explain_pipeline(self.db, collection, pipeline))
+        except Exception as e:
+            self.logger.error(f"Explain failed for {query_name}: {e}")
+            return None
+
+        baseline = load_baseline(self.explain_baseline_path)
+        previous = baseline.get(query_name)
+        summary['regressions'] = detect_regressions(previous, summary) if previous else []
+
+        self.logger.info(f"Execution Stats for {query_name}:")
+        self.logger.info(f"{'Plan Shape':<30}: {summary['plan_shape']}")
+        self.logger.info(f"{'Docs Examined':<30}: {summary['docs_examined']}")
+        self.logger.info(f"{'Keys Examined':<30}: {summary['keys_examined']}")
+        self.logger.info(f"{'Server Execution Time':<30}: {summary['execution_time_ms']} ms")
+        self.logger.info(f"{'Sort Spilled To Disk':<30}: {summary['sort_spilled']}")
+        if summary['shards_targeted'] is not None:
+            targeting = "targeted" if summary['shards_targeted'] == 1 else "scatter-gather"
+            self.logger.info(f"{'Shards Targeted':<30}: {summary['shards_targeted']} ({targeting}: {', '.join(summary['shard_names'])})")
+        for stage, stage_time in summary['stage_times_ms']:
+            self.logger.info(f"  {stage:<28}: {stage_time} ms")
+        for regression in summary['regressions']:
+            self.logger.warning(f"Regression in {query_name}: {regression}")
+
+        baseline[query_name] = {key: value for key, value in summary.items() if key != 'regressions'}
+        save_baseline(self.explain_baseline_path, baseline)
+        return summary
+
+    def _run_benchmark(
+        self,
+        execute_once,
+        query_name: str,
+        num_requests: int,
+        concurrent_users: int,
+        warmup_requests: int = 0,
+        window_seconds: float = 1.0,
+        breakdowns: List[Dict[str, float]] = None,
+        label_samples: Dict[str, List[float]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run a callable concurrently and compute latency, steady-state and time series metrics
+        
+        Args:
+            execute_once (callable): Executes one request
+            query_name (str): Name for identifying the specific query
+            num_requests (int): Number of timed requests
+            concurrent_users (int): Number of concurrent users
+            warmup_requests (int): Untimed requests run first on the same worker pool
+            window_seconds (float): Width of the time series windows
+            breakdowns (list): When given, receives the driver-event timing breakdown of each timed request
+            label_samples (dict): When given, execute_once returns (label, result) and each timed
+                response time is also appended under its label
+        
+        Returns:
+            dict: Detailed performance metrics
+        """
+        # (completion offset ms, response time ms) per successful timed request
+        samples: List[Tuple[float, float]] = []
+        run_start = [0.0]
+
+        def execute_query(timed: bool = True):
+            """Execute single query and track response time with high precision"""
+            if breakdowns is not None:
+                self.recorder.begin()
+            start_time = time.perf_counter()
+            try:
+                result = execute_once()
+            except Exception as e:
+                self.logger.error(f"Query execution error for {query_name}: {e}")
+                return None
+            finally:
+                breakdown = self.recorder.end() if breakdowns is not None else None
+            end_time = time.perf_counter()
+            if timed:
+                samples.append(((end_time - run_start[0]) * 1000, (end_time - start_time) * 1000))  # Convert to milliseconds
+                if breakdown is not None:
+                    breakdowns.append(breakdown)
+                if label_samples is not None:
+                    label_samples.setdefault(result[0], []).append((end_time - start_time) * 1000)
+            return result
 
         # Track system resources before and during query
         initial_cpu = psutil.cpu_percent()
         initial_memory = psutil.virtual_memory().percent
 
-        # Concurrent query execution
-        start_time = time.perf_counter()
         with ThreadPoolExecutor(max_workers=concurrent_users) as executor:
+            # Warmup phase: opens pooled connections and warms caches, results discarded
+            if warmup_requests:
+                warmup_futures = [executor.submit(execute_query, False) for _ in range(warmup_requests)]
+                list(as_completed(warmup_futures))
+
+            # Concurrent query execution
+            run_start[0] = start_time = time.perf_counter()
             futures = [executor.submit(execute_query) for _ in range(num_requests)]
             list(as_completed(futures))  # Wait for all futures
         
         total_execution_time = (time.perf_counter() - start_time) * 1000  # milliseconds
 
+        return self._compile_metrics(
+            query_name, samples, total_execution_time, num_requests, concurrent_users,
+            warmup_requests, window_seconds, initial_cpu, initial_memory
+        )
+
+    def measure_query_performance_async(
+        self,
+        collection: str,
+        pipeline: List[Dict[str, Any]],
+        query_name: str = "Default Query",
+        num_requests: int = 100,
+        concurrent_users: int = 10,
+        warmup_requests: int = 0,
+        window_seconds: float = 1.0,
+        max_pool_size: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Measure query performance from a single asyncio event loop instead of a thread pool
+        
+        Up to `concurrent_users` aggregations are in flight at once, all sharing one
+        connection pool of `max_pool_size`. The metrics dict matches
+        measure_query_performance so both modes can be compared directly.
+        
+        Args:
+            collection (str): Collection to query
+            pipeline (list): MongoDB aggregation pipeline
+            query_name (str): Name for identifying the specific query
+            num_requests (int): Number of requests to simulate
+            concurrent_users (int): Number of concurrent in-flight aggregations
+            warmup_requests (int): Requests executed before timing starts and excluded from results
+            window_seconds (float): Width of the throughput/latency time series windows
+            max_pool_size (int): Connection pool size of the async client
+        
+        Returns:
+            dict: Detailed performance metrics
+        """
+        self.logger.info(f"Async Performance Test Started: {query_name}")
+        self.logger.info(f"Collection: {collection}")
+        self.logger.info(f"Concurrent Users: {concurrent_users}")
+        self.logger.info(f"Total Requests: {num_requests}")
+        self.logger.info(f"Pipeline: {pipeline}")
+
+        return asyncio.run(self._run_async_benchmark(
+            collection, pipeline, query_name, num_requests, concurrent_users,
+            warmup_requests, window_seconds, max_pool_size
+        ))
+
+    async def _run_async_benchmark(
+        self,
+        collection: str,
+        pipeline: List[Dict[str, Any]],
+        query_name: str,
+        num_requests: int,
+        concurrent_users: int,
+        warmup_requests: int,
+        window_seconds: float,
+        max_pool_size: int
+    ) -> Dict[str, Any]:
+        """Event-loop counterpart of _run_benchmark for the async driver"""
+        # Imported here so the threaded mode keeps working on drivers without the async API
+        from pymongo import AsyncMongoClient
+
+        client = AsyncMongoClient(self.connection_string, maxPoolSize=max_pool_size)
+        target = client[self.db.name][collection]
+        semaphore = asyncio.Semaphore(concurrent_users)
+        samples: List[Tuple[float, float]] = []
+        run_start = 0.0
+
+        async def execute_query(timed: bool = True):
+            """Execute single aggregation and track response time with high precision"""
+            async with semaphore:
+                start_time = time.perf_counter()
+                try:
+                    cursor = await target.aggregate(pipeline)
+                    result = await cursor.to_list(None)
+                except Exception as e:
+                    self.logger.error(f"Query execution error for {query_name}: {e}")
+                    return None
+                end_time = time.perf_counter()
+                if timed:
+                    samples.append(((end_time - run_start) * 1000, (end_time - start_time) * 1000))
+                return result
+
+        initial_cpu = psutil.cpu_percent()
+        initial_memory = psutil.virtual_memory().percent
+        try:
+            if warmup_requests:
+                await asyncio.gather(*(execute_query(False) for _ in range(warmup_requests)))
+
+            run_start = start_time = time.perf_counter()
+            await asyncio.gather(*(execute_query() for _ in range(num_requests)))
+            total_execution_time = (time.perf_counter() - start_time) * 1000
+        finally:
+            await client.close()
+
+        return self._compile_metrics(
+            query_name, samples, total_execution_time, num_requests, concurrent_users,
+            warmup_requests, window_seconds, initial_cpu, initial_memory
+        )
+
+    def compare_execution_modes(
+        self,
+        collection: str,
+        pipeline: List[Dict[str, Any]],
+        query_name: str = "Default Query",
+        num_requests: int = 1000,
+        concurrent_users: int = 100,
+        warmup_requests: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Run the same pipeline in thread-pool and asyncio mode and log them side by side
+        
+        Returns:
+            dict: Metrics keyed by 'threads' and 'async'
+        """
+        threaded = self.measure_query_performance(
+            collection, pipeline, f"{query_name} (threads)", num_requests, concurrent_users,
+            warmup_requests, capture_explain=False
+        )
+        asynchronous = self.measure_query_performance_async(
+            collection, pipeline, f"{query_name} (async)", num_requests, concurrent_users, warmup_requests
+        )
+        self._log_comparison(query_name, "Threads", threaded, "Async", asynchronous)
+        return {'threads': threaded, 'async': asynchronous}
+
+    def _compile_metrics(
+        self,
+        query_name: str,
+        samples: List[Tuple[float, float]],
+        total_execution_time: float,
+        num_requests: int,
+        concurrent_users: int,
+        warmup_requests: int,
+        window_seconds: float,
+        initial_cpu: float,
+        initial_memory: float
+    ) -> Dict[str, Any]:
+        """
+        Turn raw timing samples into the metrics dict shared by every execution mode
+        
+        Args:
+            query_name (str): Name for identifying the specific query
+            samples (list): (completion offset ms, response time ms) per successful request
+            total_execution_time (float): Duration of the timed run in milliseconds
+            num_requests (int): Number of timed requests
+            concurrent_users (int): Number of concurrent users
+            warmup_requests (int): Untimed requests run before the timed run
+            window_seconds (float): Width of the time series windows
+            initial_cpu (float): CPU utilization sampled before the run
+            initial_memory (float): Memory utilization sampled before the run
+        
+        Returns:
+            dict: Detailed performance metrics
+        """
+        samples.sort()  # Completion order, for the steady state and time series
+        response_times = [response_time for _, response_time in samples]
+        ordered_times = sorted(response_times)
+
         # Calculate performance metrics with millisecond precision
         metrics = {
             'total_execution_time_ms': total_execution_time,
@@ -104,20 +930,306 @@ class EnhancedQueryPerformanceAnalyzer:
             'min_response_time_ms': min(response_times),
             'max_response_time_ms': max(response_times),
             'response_time_std_dev_ms': statistics.stdev(response_times) if len(response_times) > 1 else 0,
+            'p50_response_time_ms': self._percentile(ordered_times, 50),
+            'p95_response_time_ms': self._percentile(ordered_times, 95),
+            'p99_response_time_ms': self._percentile(ordered_times, 99),
             'cpu_utilization_increase': psutil.cpu_percent() - initial_cpu,
             'memory_utilization_increase': psutil.virtual_memory().percent - initial_memory,
             'total_requests': num_requests,
-            'concurrent_users': concurrent_users
+            'concurrent_users': concurrent_users,
+            'warmup_requests': warmup_requests
         }
+        metrics.update(self._steady_state_metrics(samples, total_execution_time))
+        metrics['time_series'] = self._build_time_series(samples, total_execution_time, window_seconds)
 
         # Enhanced detailed logging
         self._log_performance_metrics(query_name, metrics)
-        
-        # Create interactive visualization
-        #self._create_interactive_visualization(response_times, query_name)
+
+        # Only the raw samples are written here; plots come from report_builder.py
+        metrics['samples_path'] = save_samples(self.samples_dir, self.run_id, query_name, samples, metrics)
 
         return metrics
 
+    @staticmethod
+    def _percentile(sorted_values: List[float], percentile: float) -> float:
+        """Nearest-rank percentile of an ascending list"""
+        if not sorted_values:
+            return 0.0
+        rank = max(1, int(round(percentile / 100 * len(sorted_values))))
+        return sorted_values[min(rank, len(sorted_values)) - 1]
+
+    def _detect_steady_state(self, response_times: List[float], tolerance: float = 0.2, min_blocks: int = 3) -> Optional[int]:
+        """
+        Find the first request of the steady state in completion order
+        
+        The run is cut into blocks of consecutive requests. Steady state starts at the
+        first block from which `min_blocks` consecutive block means all stay within
+        `tolerance` of the median block mean of the rest of the run.
+        
+        Args:
+            response_times (list): Response times ordered by completion
+            tolerance (float): Allowed relative deviation from the median block mean
+            min_blocks (int): Number of consecutive stable blocks required
+        
+        Returns:
+            int: Index of the first steady-state request, or None if never reached
+        """
+        block_size = max(5, len(response_times) // 20)
+        block_means = [
+            statistics.mean(response_times[i:i + block_size])
+            for i in range(0, len(response_times) - block_size + 1, block_size)
+        ]
+        for block in range(len(block_means) - min_blocks + 1):
+            median = statistics.median(block_means[block:])
+            window = block_means[block:block + min_blocks]
+            if median > 0 and all(abs(mean - median) / median <= tolerance for mean in window):
+                return block * block_size
+        return None
+
+    def _steady_state_metrics(self, samples: List[Tuple[float, float]], total_execution_time: float) -> Dict[str, Any]:
+        """
+        Latency and throughput restricted to the detected steady state
+        
+        Args:
+            samples (list): (completion offset ms, response time ms) sorted by completion
+            total_execution_time (float): Duration of the timed run in milliseconds
+        
+        Returns:
+            dict: Steady-state metrics, None values when no steady state was reached
+        """
+        start_index = self._detect_steady_state([response_time for _, response_time in samples])
+        if start_index is None:
+            return {
+                'steady_state_start_ms': None,
+                'steady_state_requests': 0,
+                'steady_state_avg_response_time_ms': None,
+                'steady_state_throughput_queries_per_sec': None
+            }
+
+        steady_start = samples[start_index - 1][0] if start_index else 0.0
+        steady_times = [response_time for _, response_time in samples[start_index:]]
+        steady_duration = max(total_execution_time - steady_start, 1e-9)
+        return {
+            'steady_state_start_ms': steady_start,
+            'steady_state_requests': len(steady_times),
+            'steady_state_avg_response_time_ms': statistics.mean(steady_times),
+            'steady_state_throughput_queries_per_sec': len(steady_times) / (steady_duration / 1000)
+        }
+
+    def _build_time_series(
+        self, samples: List[Tuple[float, float]], total_execution_time: float, window_seconds: float
+    ) -> List[Dict[str, float]]:
+        """
+        Bucket completed requests into fixed windows to expose drift over the run
+        
+        Args:
+            samples (list): (completion offset ms, response time ms) sorted by completion
+            total_execution_time (float): Duration of the timed run in milliseconds
+            window_seconds (float): Window width in seconds
+        
+        Returns:
+            list: Per-window request count, throughput and latency
+        """
+        window_ms = window_seconds * 1000
+        num_windows = max(1, int(total_execution_time // window_ms) + 1)
+        windows: List[List[float]] = [[] for _ in range(num_windows)]
+        for completed_at, response_time in samples:
+            windows[min(int(completed_at // window_ms), num_windows - 1)].append(response_time)
+
+        time_series = []
+        for index, response_times in enumerate(windows):
+            window_start = index * window_ms
+            window_length = min(window_ms, total_execution_time - window_start) or window_ms
+            time_series.append({
+                'window_start_ms': window_start,
+                'requests': len(response_times),
+                'throughput_queries_per_sec': len(response_times) / (window_length / 1000),
+                'avg_response_time_ms': statistics.mean(response_times) if response_times else None,
+                'max_response_time_ms': max(response_times) if response_times else None
+            })
+        return time_series
+
+    def compare_index_advice(
+        self,
+        collection: str,
+        pipeline: List[Dict[str, Any]],
+        query_name: str = "Default Query",
+        num_requests: int = 100,
+        concurrent_users: int = 10,
+        warmup_requests: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Benchmark a pipeline, create the indexes the advisor proposes for it, and benchmark again
+        
+        Args:
+            collection (str): Collection to query
+            pipeline (list): MongoDB aggregation pipeline
+            query_name (str): Name for identifying the specific query
+            num_requests (int): Number of requests per run
+            concurrent_users (int): Number of concurrent users
+            warmup_requests (int): Untimed requests before each run
+        
+        Returns:
+            dict: Report with before/after metrics and the proposed and created indexes
+        """
+        advisor = IndexAdvisor(self.db)
+
+        before = self.measure_query_performance(
+            collection, pipeline, f"{query_name} (before indexes)", num_requests, concurrent_users, warmup_requests
+        )
+        proposals = advisor.analyze(collection, pipeline)
+        for proposal in proposals:
+            self.logger.info(f"Index proposal for {proposal['collection']}: {proposal['keys']} ({proposal['reason']})")
+        created = advisor.create_indexes(proposals)
+        after = self.measure_query_performance(
+            collection, pipeline, f"{query_name} (after indexes)", num_requests, concurrent_users, warmup_requests
+        )
+
+        self._log_comparison(f"{query_name}: index advisor", "Before", before, "After", after)
+        return {
+            'before': before,
+            'after': after,
+            'proposed_indexes': [
+                {'collection': proposal['collection'], 'keys': proposal['keys'], 'reason': proposal['reason']}
+                for proposal in proposals
+            ],
+            'created_indexes': created
+        }
+
+    def compare_pipelines(
+        self,
+        collection: str,
+        baseline_pipeline: List[Dict[str, Any]],
+        candidate_pipeline: List[Dict[str, Any]],
+        query_name: str = "Default Query",
+        baseline_label: str = "Baseline",
+        candidate_label: str = "Candidate",
+        num_requests: int = 100,
+        concurrent_users: int = 10,
+        warmup_requests: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Benchmark two pipelines that answer the same query and log them side by side
+        
+        Args:
+            collection (str): Collection to query
+            baseline_pipeline (list): Current pipeline
+            candidate_pipeline (list): Alternative pipeline
+            query_name (str): Name for identifying the query
+            baseline_label (str): Label of the current pipeline
+            candidate_label (str): Label of the alternative pipeline
+            num_requests (int): Number of requests per pipeline
+            concurrent_users (int): Number of concurrent users
+            warmup_requests (int): Untimed requests before each run
+        
+        Returns:
+            dict: Metrics keyed by the two labels
+        """
+        baseline = self.measure_query_performance(
+            collection, baseline_pipeline, f"{query_name} ({baseline_label})",
+            num_requests, concurrent_users, warmup_requests
+        )
+        candidate = self.measure_query_performance(
+            collection, candidate_pipeline, f"{query_name} ({candidate_label})",
+            num_requests, concurrent_users, warmup_requests
+        )
+        self._log_comparison(query_name, baseline_label, baseline, candidate_label, candidate)
+        return {baseline_label: baseline, candidate_label: candidate}
+
+    def is_replica_set(self) -> bool:
+        """Whether the analyzer is connected to a replica set (required for tagged reads)"""
+        return 'setName' in self.client.admin.command('hello')
+
+    def compare_read_preferences(
+        self,
+        collection: str,
+        pipeline: List[Dict[str, Any]],
+        regions: List[str],
+        modes: Sequence[str] = ("primary", "nearest", "secondaryPreferred"),
+        max_staleness_seconds: int = 90,
+        num_requests: int = 200,
+        concurrent_users: int = 20
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Run each regional query under several read preferences and relate latency to staleness
+        
+        Replica set members are expected to carry a 'region' tag. Non-primary modes use a
+        tag set for the query's region (falling back to any member) and maxStalenessSeconds.
+        
+        Args:
+            collection (str): Collection to query
+            pipeline (list): Regional pipeline whose first stage is {'$match': {'region': ...}}
+            regions (list): Regions to benchmark; each also selects the member tag
+            modes (list): 'primary' and/or read preference modes accepting tag sets
+            max_staleness_seconds (int): maxStalenessSeconds for non-primary modes
+            num_requests (int): Number of requests per region and mode
+            concurrent_users (int): Number of concurrent users
+        
+        Returns:
+            dict: region -> mode -> metrics with the observed staleness of the region's members
+        """
+        report: Dict[str, Dict[str, Any]] = {}
+        for region in regions:
+            regional_pipeline = copy.deepcopy(pipeline)
+            regional_pipeline[0]['$match']['region'] = region
+            report[region] = {}
+            for mode in modes:
+                read_preference = None if mode == 'primary' else region_read_preference(
+                    region, mode, max_staleness_seconds
+                )
+                metrics = self.measure_query_performance(
+                    collection, regional_pipeline, f"{region} Regional Trends ({mode})",
+                    num_requests, concurrent_users, warmup_requests=concurrent_users,
+                    capture_explain=False, read_preference=read_preference
+                )
+                members = member_staleness(self.client)
+                regional_members = [
+                    member['staleness_seconds'] for member in members
+                    if member['region'] == region and member['staleness_seconds'] is not None
+                ]
+                metrics['region_member_staleness_seconds'] = max(regional_members) if regional_members else None
+                metrics['members'] = members
+                report[region][mode] = metrics
+
+            self.logger.info(f"Latency vs staleness for {region}:")
+            for mode, metrics in report[region].items():
+                staleness = metrics['region_member_staleness_seconds']
+                self.logger.info(
+                    f"  {mode:<20}: avg {metrics['avg_response_time_ms']:.2f} ms, "
+                    f"max {metrics['max_response_time_ms']:.2f} ms, "
+                    f"regional member staleness {'-' if staleness is None else f'{staleness:.1f} s'}"
+                )
+        return report
+
+    def _log_comparison(
+        self, title: str, baseline_label: str, baseline: Dict[str, Any], candidate_label: str, candidate: Dict[str, Any]
+    ):
+        """
+        Log headline metrics of two runs side by side with the relative change
+        
+        Args:
+            title (str): Heading of the comparison
+            baseline_label (str): Name of the reference run
+            baseline (dict): Metrics of the reference run
+            candidate_label (str): Name of the compared run
+            candidate (dict): Metrics of the compared run
+        """
+        self.logger.info(f"\n{'='*50}")
+        self.logger.info(f"Comparison: {title}")
+        self.logger.info(f"{'':<30}  {baseline_label:>12}  {candidate_label:>12}  {'Change':>8}")
+        for description, key in [
+            ("Throughput (queries/sec)", "throughput_queries_per_sec"),
+            ("Average Response Time (ms)", "avg_response_time_ms"),
+            ("Maximum Response Time (ms)", "max_response_time_ms"),
+            ("Steady State Avg (ms)", "steady_state_avg_response_time_ms")
+        ]:
+            old, new = baseline.get(key), candidate.get(key)
+            if old is None or new is None:
+                continue
+            change = f"{(new - old) / old * 100:+.1f}%" if old else "-"
+            self.logger.info(f"{description:<30}  {old:>12.2f}  {new:>12.2f}  {change:>8}")
+        self.logger.info(f"{'='*50}\n")
+
     def _log_performance_metrics(self, query_name: str, metrics: Dict[str, float]):
         """
         Log performance metrics with detailed, human-readable format
@@ -138,63 +1250,33 @@ class EnhancedQueryPerformanceAnalyzer:
             ("Minimum Response Time", "min_response_time_ms", "ms"),
             ("Maximum Response Time", "max_response_time_ms", "ms"),
             ("Response Time Std Deviation", "response_time_std_dev_ms", "ms"),
+            ("50th Percentile Response Time", "p50_response_time_ms", "ms"),
+            ("95th Percentile Response Time", "p95_response_time_ms", "ms"),
+            ("99th Percentile Response Time", "p99_response_time_ms", "ms"),
             ("CPU Utilization Increase", "cpu_utilization_increase", "%"),
             ("Memory Utilization Increase", "memory_utilization_increase", "%")
         ]
         
         for description, key, unit in log_format:
             self.logger.info(f"{description:<30}: {metrics[key]:.2f} {unit}")
-        
-        self.logger.info(f"{'='*50}\n")
 
-    def _create_interactive_visualization(self, response_times: List[float], query_name: str):
-        """
-        Create an interactive Plotly visualization of response times
-        
-        Args:
-            response_times (list): List of response times in milliseconds
-            query_name (str): Name of the query for plot title
-        """
-        # Calculate optimal number of bins using Sturges' rule
-        num_bins = int(1 + 3.322 * np.log10(len(response_times)))
-        
-        # Create interactive histogram
-        histogram = plt.Figure(data=[
-            plt.Histogram(
-                x=response_times, 
-                nbinsx=num_bins,  # Use calculated number of bins 
-                marker_color='skyblue', 
-                marker_line_color='black',
-                marker_line_width=1
+        if metrics.get('steady_state_start_ms') is None:
+            self.logger.info(f"{'Steady State':<30}: not reached")
+        else:
+            self.logger.info(f"{'Steady State Start':<30}: {metrics['steady_state_start_ms']:.2f} ms")
+            self.logger.info(f"{'Steady State Avg Response':<30}: {metrics['steady_state_avg_response_time_ms']:.2f} ms")
+            self.logger.info(f"{'Steady State Throughput':<30}: {metrics['steady_state_throughput_queries_per_sec']:.2f} queries/sec")
+
+        for window in metrics.get('time_series', []):
+            avg_response = window['avg_response_time_ms']
+            self.logger.info(
+                f"  t={window['window_start_ms'] / 1000:>6.1f}s  requests={window['requests']:<6} "
+                f"throughput={window['throughput_queries_per_sec']:.2f} q/s  "
+                f"avg={'-' if avg_response is None else f'{avg_response:.2f} ms'}"
             )
-        ])
-        
-        # Customize layout
-        histogram.update_layout(
-            title=f'Response Time Distribution - {query_name}',
-            xaxis_title='Response Time (milliseconds)',
-            yaxis_title='Frequency',
-            template='plotly_white'
-        )
-
-        # Create interactive box plot
-        boxplot = plt.Figure(data=[
-            plt.Box(
-                y=response_times,
-                marker_color='lightgreen',
-                boxmean=True  # Shows the mean as a dashed line
-            )
-        ])
         
-        boxplot.update_layout(
-            title=f'Response Time Box Plot - {query_name}',
-            yaxis_title='Response Time (milliseconds)',
-            template='plotly_white'
-        )
+        self.logger.info(f"{'='*50}\n")
 
-        # Save interactive plots
-        pio.write_html(histogram, file=f'{query_name}_response_histogram.html')
-        pio.write_html(boxplot, file=f'{query_name}_response_boxplot.html')
 def main():
     # MongoDB connection and performance measurement
     analyzer = EnhancedQueryPerformanceAnalyzer(
@@ -238,12 +1320,29 @@ def main():
     }
     ]
 
-    regional_metrics = analyzer.measure_query_performance(
+    # Benchmarked before and after creating the indexes the advisor proposes
+    regional_report = analyzer.compare_index_advice(
         collection="regional_trends", 
         pipeline=regional_pipeline, 
         query_name="South America Regional Trends",
         num_requests=200, 
-        concurrent_users=20
+        concurrent_users=20,
+        warmup_requests=20
+    )
+    regional_metrics = regional_report['after']
+
+    # Join-free regional query reading the content snapshot embedded in regional_trends
+    content_snapshot.migrate(analyzer.db)
+    snapshot_report = analyzer.compare_pipelines(
+        collection="regional_trends",
+        baseline_pipeline=regional_pipeline,
+        candidate_pipeline=content_snapshot.regional_snapshot_pipeline("South America"),
+        query_name="South America Regional Trends",
+        baseline_label="$lookup",
+        candidate_label="Snapshot",
+        num_requests=200,
+        concurrent_users=20,
+        warmup_requests=20
     )
 
     # Global query performance
@@ -261,9 +1360,45 @@ def main():
         pipeline=global_pipeline, 
         query_name="Global Content Trends",
         num_requests=1000, 
-        concurrent_users=100
+        concurrent_users=100,
+        warmup_requests=100
+    )
+
+    # Same global pipeline from a thread pool and from an asyncio event loop
+    execution_mode_report = analyzer.compare_execution_modes(
+        collection="regional_trends",
+        pipeline=global_pipeline,
+        query_name="Global Content Trends"
     )
 
+    # Global query served from the incrementally maintained materialized view
+    global_view_report = analyzer.benchmark_global_view(global_pipeline)
+
+    # Region-tagged reads, only meaningful against a replica set with 'region'-tagged members
+    if analyzer.is_replica_set():
+        read_preference_report = analyzer.compare_read_preferences(
+            collection="regional_trends",
+            pipeline=regional_pipeline,
+            regions=["North America", "Europe", "Asia", "South America"]
+        )
+
+        # Change streams need a replica set as well
+        topk_cache_report = analyzer.benchmark_topk_cache(region="South America")
+
+    # Mixed workload: weighted templates with fresh parameters per request instead of one repeated pipeline
+    workload_metrics = analyzer.measure_workload(
+        default_workload(analyzer.db, seed=42),
+        num_requests=2000,
+        concurrent_users=50,
+        warmup_requests=200
+    )
+
+    # Flat vs time-bucketed interaction_history: storage, inserts and last-N reads
+    bucket_report = analyzer.benchmark_interaction_buckets()
+
+    # Ordered vs unordered bulk writes across batch sizes and write concerns, on scratch collections
+    write_report = analyzer.run_write_benchmark_suite()
+
 if __name__ == "__main__":
     main()
 
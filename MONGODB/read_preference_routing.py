@@ -0,0 +1,85 @@
+from typing import Dict, Any, List
+
+from pymongo.read_preferences import Nearest, PrimaryPreferred, Secondary, SecondaryPreferred
+
+# Read preference modes that accept tag sets and maxStalenessSeconds
+READ_PREFERENCE_MODES = {
+    "nearest": Nearest,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "primaryPreferred": PrimaryPreferred
+}
+
+# Smallest maxStalenessSeconds the server accepts
+MIN_MAX_STALENESS_SECONDS = 90
+
+
+def region_read_preference(region: str, mode: str = "nearest", max_staleness_seconds: int = -1, fallback: bool = True):
+    """
+    Build a read preference that prefers replica set members tagged with a region
+
+    Args:
+        region (str): Value of the members' 'region' tag
+        mode (str): One of READ_PREFERENCE_MODES
+        max_staleness_seconds (int): -1 for no limit, otherwise at least 90
+        fallback (bool): Append an empty tag set so any eligible member serves if the region has none
+
+    Returns:
+        pymongo read preference
+    """
+    if max_staleness_seconds != -1 and max_staleness_seconds < MIN_MAX_STALENESS_SECONDS:
+        raise ValueError(f"maxStalenessSeconds must be -1 or at least {MIN_MAX_STALENESS_SECONDS}")
+    tag_sets = [{"region": region}] + ([{}] if fallback else [])
+    return READ_PREFERENCE_MODES[mode](tag_sets=tag_sets, max_staleness=max_staleness_seconds)
+
+
+def tag_members_by_region(client, member_regions: Dict[str, str]) -> int:
+    """
+    Tag replica set members with their region through replSetReconfig
+
+    Args:
+        client: MongoClient connected to the replica set primary
+        member_regions (dict): 'host:port' -> region
+
+    Returns:
+        int: New replica set config version
+    """
+    config = client.admin.command("replSetGetConfig")["config"]
+    for member in config["members"]:
+        if member["host"] in member_regions:
+            member.setdefault("tags", {})["region"] = member_regions[member["host"]]
+    config["version"] += 1
+    client.admin.command("replSetReconfig", config)
+    return config["version"]
+
+
+def member_staleness(client) -> List[Dict[str, Any]]:
+    """
+    Replication lag of every member relative to the primary
+
+    Args:
+        client: MongoClient connected to the replica set
+
+    Returns:
+        list: {'host', 'state', 'region', 'staleness_seconds'} per member
+    """
+    status = client.admin.command("replSetGetStatus")
+    tags = {
+        member["host"]: member.get("tags", {})
+        for member in client.admin.command("replSetGetConfig")["config"]["members"]
+    }
+    primary_optime = next(
+        (member["optimeDate"] for member in status["members"] if member["stateStr"] == "PRIMARY"), None
+    )
+    members = []
+    for member in status["members"]:
+        staleness = None
+        if primary_optime is not None and "optimeDate" in member:
+            staleness = max(0.0, (primary_optime - member["optimeDate"]).total_seconds())
+        members.append({
+            "host": member["name"],
+            "state": member["stateStr"],
+            "region": tags.get(member["name"], {}).get("region"),
+            "staleness_seconds": staleness
+        })
+    return members
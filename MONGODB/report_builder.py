@@ -0,0 +1,158 @@
+import argparse
+import math
+import os
+import statistics
+from typing import List, Dict, Any
+
+from sample_store import SAMPLE_SUFFIX, list_runs, load_samples
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(percentile / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _label(entry: Dict[str, Any]) -> str:
+    return f"{entry['query_name']} [{entry['run_id']}]"
+
+
+def summarize(response_times: List[float]) -> Dict[str, float]:
+    """Latency summary of one benchmark's samples"""
+    ordered = sorted(response_times)
+    return {
+        'requests': len(ordered),
+        'avg_ms': statistics.mean(ordered) if ordered else 0.0,
+        'p50_ms': _percentile(ordered, 50),
+        'p95_ms': _percentile(ordered, 95),
+        'p99_ms': _percentile(ordered, 99),
+        'max_ms': ordered[-1] if ordered else 0.0
+    }
+
+
+def render_run(entry: Dict[str, Any], response_times: List[float], output_dir: str) -> List[str]:
+    """
+    Histogram and box plot of one benchmark, as interactive HTML
+
+    Returns:
+        list: Written file paths
+    """
+    import plotly.graph_objs as plt
+    import plotly.io as pio
+
+    # Calculate optimal number of bins using Sturges' rule
+    num_bins = int(1 + 3.322 * math.log10(max(1, len(response_times))))
+    histogram = plt.Figure(data=[
+        plt.Histogram(
+            x=response_times,
+            nbinsx=num_bins,
+            marker_color='skyblue',
+            marker_line_color='black',
+            marker_line_width=1
+        )
+    ])
+    histogram.update_layout(
+        title=f"Response Time Distribution - {_label(entry)}",
+        xaxis_title='Response Time (milliseconds)',
+        yaxis_title='Frequency',
+        template='plotly_white'
+    )
+
+    boxplot = plt.Figure(data=[
+        plt.Box(
+            y=response_times,
+            marker_color='lightgreen',
+            boxmean=True  # Shows the mean as a dashed line
+        )
+    ])
+    boxplot.update_layout(
+        title=f"Response Time Box Plot - {_label(entry)}",
+        yaxis_title='Response Time (milliseconds)',
+        template='plotly_white'
+    )
+
+    base = os.path.join(output_dir, f"{entry['run_id']}_{os.path.basename(entry['path'])[:-len(SAMPLE_SUFFIX)]}")
+    paths = [f"{base}_response_histogram.html", f"{base}_response_boxplot.html"]
+    pio.write_html(histogram, file=paths[0])
+    pio.write_html(boxplot, file=paths[1])
+    return paths
+
+
+def render_comparison(entries: List[Dict[str, Any]], samples: List[List[float]], output_dir: str) -> str:
+    """
+    Box plots of several benchmarks side by side with a percentile table
+
+    Returns:
+        str: Written file path
+    """
+    import plotly.graph_objs as plt
+    import plotly.io as pio
+    from plotly.subplots import make_subplots
+
+    summaries = [summarize(response_times) for response_times in samples]
+    figure = make_subplots(
+        rows=2, cols=1, row_heights=[0.65, 0.35], vertical_spacing=0.08,
+        specs=[[{"type": "box"}], [{"type": "table"}]]
+    )
+    for entry, response_times in zip(entries, samples):
+        figure.add_trace(plt.Box(y=response_times, name=_label(entry), boxmean=True), row=1, col=1)
+
+    columns = ['requests', 'avg_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms']
+    figure.add_trace(plt.Table(
+        header={"values": ["Benchmark"] + columns},
+        cells={"values": [[_label(entry) for entry in entries]] + [
+            [summary[column] if column == 'requests' else round(summary[column], 2) for summary in summaries]
+            for column in columns
+        ]}
+    ), row=2, col=1)
+    figure.update_layout(
+        title="Response Time Comparison",
+        yaxis_title='Response Time (milliseconds)',
+        template='plotly_white',
+        showlegend=False,
+        height=400 + 300 + 25 * len(entries)
+    )
+
+    path = os.path.join(output_dir, "response_comparison.html")
+    pio.write_html(figure, file=path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render reports from the raw latency samples stored by benchmark runs")
+    parser.add_argument("--samples-dir", default=os.path.join("benchmark_output", "samples"))
+    parser.add_argument("--runs", nargs="+", default=None, help="Run ids to include (default: all)")
+    parser.add_argument("--query", default=None, help="Only benchmarks whose name contains this text")
+    parser.add_argument("--output-dir", default=os.path.join("benchmark_output", "reports"))
+    parser.add_argument("--list", action="store_true", help="List stored benchmarks instead of rendering")
+    parser.add_argument("--no-per-run", action="store_true", help="Only render the comparison")
+    args = parser.parse_args()
+
+    entries = list_runs(args.samples_dir, args.runs, args.query)
+    if not entries:
+        print(f"No stored benchmarks found in {args.samples_dir}")
+        return
+
+    samples = [load_samples(entry['path'])[1] for entry in entries]
+    if args.list:
+        for entry, response_times in zip(entries, samples):
+            summary = summarize(response_times)
+            print(f"{_label(entry):<60}  n={summary['requests']:<6}  avg={summary['avg_ms']:.2f} ms  "
+                  f"p95={summary['p95_ms']:.2f} ms  p99={summary['p99_ms']:.2f} ms")
+        return
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    written = []
+    if not args.no_per_run:
+        for entry, response_times in zip(entries, samples):
+            written += render_run(entry, response_times, args.output_dir)
+    if len(entries) > 1:
+        written.append(render_comparison(entries, samples, args.output_dir))
+    for path in written:
+        print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import json
+import os
+import re
+import sys
+from array import array
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+# Raw samples are stored as little-endian float64 pairs (completion offset ms, response time ms)
+SAMPLE_SUFFIX = ".f64"
+METADATA_SUFFIX = ".json"
+
+
+def new_run_id() -> str:
+    """Identifier grouping every benchmark of one analyzer run"""
+    return datetime.now().strftime("%Y%m%d-%H%M%S")
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_").lower()
+
+
+def save_samples(
+    directory: str,
+    run_id: str,
+    query_name: str,
+    samples: List[Tuple[float, float]],
+    summary: Dict[str, Any] = None
+) -> str:
+    """
+    Persist the raw samples of one benchmark as a compact binary array plus a small metadata file
+
+    Args:
+        directory (str): Root directory of the stored runs
+        run_id (str): Run the benchmark belongs to
+        query_name (str): Name of the benchmarked query
+        samples (list): (completion offset ms, response time ms) per request
+        summary (dict): Scalar metrics stored alongside for quick listing
+
+    Returns:
+        str: Path of the sample file
+    """
+    run_directory = os.path.join(directory, run_id)
+    os.makedirs(run_directory, exist_ok=True)
+    base = os.path.join(run_directory, _slug(query_name))
+    suffix = 1
+    while os.path.exists(base + SAMPLE_SUFFIX):  # Same query benchmarked twice in a run
+        suffix += 1
+        base = os.path.join(run_directory, f"{_slug(query_name)}_{suffix}")
+
+    values = array("d")
+    for offset, response_time in samples:
+        values.append(offset)
+        values.append(response_time)
+    if sys.byteorder != "little":
+        values.byteswap()
+    with open(base + SAMPLE_SUFFIX, "wb") as file:
+        values.tofile(file)
+
+    metadata = {
+        "run_id": run_id,
+        "query_name": query_name,
+        "samples": len(samples),
+        "recorded_at": datetime.now().isoformat(),
+        "summary": {key: value for key, value in (summary or {}).items() if isinstance(value, (int, float, str)) or value is None}
+    }
+    with open(base + METADATA_SUFFIX, "w") as file:
+        json.dump(metadata, file, indent=2)
+    return base + SAMPLE_SUFFIX
+
+
+def load_samples(path: str) -> Tuple[List[float], List[float]]:
+    """
+    Read a sample file back
+
+    Returns:
+        tuple: (completion offsets ms, response times ms)
+    """
+    values = array("d")
+    with open(path, "rb") as file:
+        values.frombytes(file.read())
+    if sys.byteorder != "little":
+        values.byteswap()
+    return list(values[0::2]), list(values[1::2])
+
+
+def list_runs(directory: str, run_ids: Optional[List[str]] = None, query_filter: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Metadata of the stored benchmarks, oldest run first
+
+    Args:
+        directory (str): Root directory of the stored runs
+        run_ids (list): Only these runs (all if None)
+        query_filter (str): Case-insensitive substring of the query name
+
+    Returns:
+        list: Metadata dicts with the sample file under 'path'
+    """
+    if not os.path.isdir(directory):
+        return []
+    entries = []
+    for run_id in sorted(os.listdir(directory)):
+        run_directory = os.path.join(directory, run_id)
+        if not os.path.isdir(run_directory) or (run_ids and run_id not in run_ids):
+            continue
+        for name in sorted(os.listdir(run_directory)):
+            if not name.endswith(METADATA_SUFFIX):
+                continue
+            with open(os.path.join(run_directory, name), "r") as file:
+                metadata = json.load(file)
+            if query_filter and query_filter.lower() not in metadata["query_name"].lower():
+                continue
+            metadata["path"] = os.path.join(run_directory, name[:-len(METADATA_SUFFIX)] + SAMPLE_SUFFIX)
+            entries.append(metadata)
+    return entries
@@ -0,0 +1,372 @@
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+
+from pymongo import MongoClient, InsertOne
+
+from explain_stats import explain_pipeline, summarize_explain
+from performance_metrics import EnhancedQueryPerformanceAnalyzer
+from sharded_cluster import LocalShardedCluster, REGIONS
+from workload_spec import QueryTemplate, WorkloadSpec, sample_field, uniform_choice, user_history_pipeline
+
+# Strategy -> collection -> shard key. users has no timestamp, so the timestamp strategy ranges it on user_id
+STRATEGIES = {
+    "hashed_user_id": {
+        "interaction_history": [("user_id", "hashed")],
+        "users": [("user_id", "hashed")]
+    },
+    "ranged_timestamp": {
+        "interaction_history": [("timestamp", 1)],
+        "users": [("user_id", 1)]
+    },
+    "location_user_id": {
+        "interaction_history": [("location", 1), ("user_id", 1)],
+        "users": [("location", 1), ("user_id", 1)]
+    }
+}
+
+# Every strategy loads the same copy: interactions carry their user's location so all keys exist
+SOURCE_COLLECTIONS = ["users", "interaction_history"]
+
+logger = logging.getLogger(__name__)
+
+
+def recent_interactions_pipeline(params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Interactions of one day, timestamps being ISO strings as loaded by fakedata.py"""
+    start = params["day"]
+    end = start + timedelta(days=1)
+    return [
+        {"$match": {"timestamp": {"$gte": start.isoformat(), "$lt": end.isoformat()}}},
+        {"$limit": 100}
+    ]
+
+
+def user_profile_pipeline(params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Single user document by user_id"""
+    return [{"$match": {"user_id": params["user_id"]}}, {"$limit": 1}]
+
+
+def users_by_location_pipeline(params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Users of one region"""
+    return [{"$match": {"location": params["location"]}}, {"$limit": 50}]
+
+
+class ShardKeyHarness:
+    def __init__(
+        self,
+        connection_string: str = "mongodb://localhost:27015/",
+        source_connection_string: Optional[str] = None,
+        source_database: str = "DDS_Project",
+        chunk_size_mb: int = 1,
+        balancer_timeout: float = 300.0
+    ):
+        """
+        Loads the same dataset under several shard-key strategies and benchmarks each
+
+        Every strategy gets its own database on the cluster, so they are compared on
+        identical data and hardware.
+
+        Args:
+            connection_string (str): mongos of the sharded cluster
+            source_connection_string (str): Deployment holding the loaded dataset (default: the cluster)
+            source_database (str): Database holding users and interaction_history
+            chunk_size_mb (int): Cluster chunk size while the harness runs, small so the sample data splits
+            balancer_timeout (float): Seconds to wait for the balancer to settle after loading
+        """
+        self.connection_string = connection_string
+        self.client = MongoClient(connection_string)
+        self.source = MongoClient(source_connection_string or connection_string)[source_database]
+        self.source_database = source_database
+        self.chunk_size_mb = chunk_size_mb
+        self.balancer_timeout = balancer_timeout
+
+    def database_name(self, strategy: str) -> str:
+        return f"{self.source_database}_shardkey_{strategy}"
+
+    def shard_count(self) -> int:
+        return len(self.client.admin.command("listShards")["shards"])
+
+    def _set_chunk_size(self, size_mb: Optional[int]) -> Optional[int]:
+        """Set the cluster chunk size (None restores the default) and return the previous setting"""
+        settings = self.client.config.settings
+        previous = settings.find_one({"_id": "chunksize"})
+        if size_mb is None:
+            settings.delete_one({"_id": "chunksize"})
+        else:
+            settings.update_one({"_id": "chunksize"}, {"$set": {"value": size_mb}}, upsert=True)
+        return previous["value"] if previous else None
+
+    def load(self, strategy: str, batch_size: int = 1000) -> Dict[str, float]:
+        """
+        Recreate the strategy's database, shard its collections and copy the dataset in
+
+        Returns:
+            dict: Insert throughput in documents per second per collection
+        """
+        database = self.database_name(strategy)
+        self.client.drop_database(database)
+        self.client.admin.command("enableSharding", database)
+        db = self.client[database]
+
+        locations = {user["user_id"]: user.get("location") for user in self.source.users.find({}, {"user_id": 1, "location": 1})}
+        throughput = {}
+        for collection in SOURCE_COLLECTIONS:
+            shard_key = STRATEGIES[strategy][collection]
+            db[collection].create_index(shard_key)
+            self.client.admin.command("shardCollection", f"{database}.{collection}", key=dict(shard_key))
+
+            written, batch = 0, []
+            start_time = time.perf_counter()
+            for document in self.source[collection].find({}, {"_id": 0}):
+                if collection == "interaction_history":
+                    document["location"] = locations.get(document["user_id"])
+                batch.append(document)
+                if len(batch) == batch_size:
+                    db[collection].insert_many(batch, ordered=False)
+                    written, batch = written + len(batch), []
+            if batch:
+                db[collection].insert_many(batch, ordered=False)
+                written += len(batch)
+            duration = time.perf_counter() - start_time
+            throughput[collection] = written / duration if duration else 0.0
+            logger.info(f"[{strategy}] Loaded {written} {collection} documents at {throughput[collection]:.0f} docs/sec")
+        return throughput
+
+    def wait_for_balancer(self, strategy: str) -> bool:
+        """Wait until every collection of the strategy is balanced, or the timeout expires"""
+        deadline = time.monotonic() + self.balancer_timeout
+        namespaces = [f"{self.database_name(strategy)}.{collection}" for collection in SOURCE_COLLECTIONS]
+        while time.monotonic() < deadline:
+            statuses = [self.client.admin.command("balancerCollectionStatus", namespace) for namespace in namespaces]
+            if all(status.get("balancerCompliant") for status in statuses):
+                return True
+            time.sleep(2)
+        logger.warning(f"[{strategy}] Balancer still active after {self.balancer_timeout:.0f} s")
+        return False
+
+    def chunk_distribution(self, strategy: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Chunks per shard and jumbo chunks of each collection, from config.chunks
+
+        Chunks reference their collection by uuid since 5.0 and by ns before, both are matched.
+        Every shard from listShards is counted, so a shard without chunks shows up as 0 and
+        makes the imbalance (max/min chunks per shard) infinite.
+        """
+        shard_names = [shard["_id"] for shard in self.client.admin.command("listShards")["shards"]]
+        distribution = {}
+        for collection in SOURCE_COLLECTIONS:
+            namespace = f"{self.database_name(strategy)}.{collection}"
+            metadata = self.client.config.collections.find_one({"_id": namespace}) or {}
+            match = {"$or": [{"ns": namespace}, {"uuid": metadata.get("uuid")}]} if "uuid" in metadata else {"ns": namespace}
+            per_shard = {name: 0 for name in shard_names}
+            for entry in self.client.config.chunks.aggregate([{"$match": match}, {"$group": {"_id": "$shard", "count": {"$sum": 1}}}]):
+                per_shard[entry["_id"]] = entry["count"]
+            counts = list(per_shard.values())
+            if not counts or not max(counts):
+                imbalance = None  # Collection not sharded yet
+            elif not min(counts):
+                imbalance = float("inf")
+            else:
+                imbalance = max(counts) / min(counts)
+            distribution[collection] = {
+                'chunks_per_shard': per_shard,
+                'chunks': sum(counts),
+                'imbalance': imbalance,
+                'jumbo_chunks': self.client.config.chunks.count_documents({**match, "jumbo": True})
+            }
+        return distribution
+
+    def migrations(self, strategy: str, since: datetime) -> int:
+        """Chunk migrations committed by the balancer for the strategy's collections since a time"""
+        namespaces = [f"{self.database_name(strategy)}.{collection}" for collection in SOURCE_COLLECTIONS]
+        return self.client.config.changelog.count_documents(
+            {"what": "moveChunk.commit", "ns": {"$in": namespaces}, "time": {"$gte": since}}
+        )
+
+    def read_workload(self, seed: Optional[int] = None) -> WorkloadSpec:
+        """
+        Standard reads on both collections, with parameters drawn from the source data
+
+        With a seed the user pool and the request sequence are the same on every call, so
+        each strategy is benchmarked on the same operations.
+        """
+        user_ids = sample_field(self.source, "users", "user_id", seed=seed)
+        days = [datetime(2022, 1, 1) + timedelta(days=offset) for offset in range(3 * 365)]
+        return WorkloadSpec("Shard Key Read Workload", [
+            QueryTemplate("User History", "interaction_history", user_history_pipeline,
+                          {"user_id": uniform_choice(user_ids)}, weight=4),
+            QueryTemplate("Recent Interactions", "interaction_history", recent_interactions_pipeline,
+                          {"day": uniform_choice(days)}, weight=2),
+            QueryTemplate("User Profile", "users", user_profile_pipeline,
+                          {"user_id": uniform_choice(user_ids)}, weight=3),
+            QueryTemplate("Users By Location", "users", users_by_location_pipeline,
+                          {"location": uniform_choice(REGIONS)}, weight=1)
+        ], seed=seed)
+
+    def targeted_ratio(
+        self, strategy: str, spec: WorkloadSpec, samples_per_template: int = 20, seed: Optional[int] = 42
+    ) -> Dict[str, Any]:
+        """
+        Share of each template's requests that mongos routed to a single shard, from explain
+
+        Parameters are drawn from a separate generator, so the workload's own sequence (and
+        with it the benchmarked operations) is the same for every strategy.
+
+        Returns:
+            dict: Per-template ratio and average shards contacted, plus the weighted overall ratio
+        """
+        db = self.client[self.database_name(strategy)]
+        rng = random.Random(seed)
+        templates = {}
+        for template in spec.templates:
+            shards = []
+            for _ in range(samples_per_template):
+                _, pipeline = template.instantiate(rng)
+                shards.append(summarize_explain(explain_pipeline(db, template.collection, pipeline))["shards_targeted"] or 1)
+            templates[template.name] = {
+                'targeted_ratio': sum(1 for count in shards if count == 1) / len(shards),
+                'avg_shards_targeted': sum(shards) / len(shards)
+            }
+        shares = spec.shares()
+        overall = sum(shares[name] * stats['targeted_ratio'] for name, stats in templates.items())
+        return {'templates': templates, 'targeted_ratio': overall}
+
+    def write_users(self, size: int = 1000, seed: int = 42) -> List[Dict[str, Any]]:
+        """Users the insert workload writes for, the same sample for the same data and seed"""
+        users = sorted(self.source.users.find({}, {"_id": 0, "user_id": 1, "location": 1}), key=lambda user: user["user_id"])
+        return random.Random(seed).sample(users, min(size, len(users)))
+
+    def run_strategy(
+        self, strategy: str, num_requests: int = 1000, concurrent_users: int = 50, write_batches: int = 50, seed: int = 42
+    ) -> Dict[str, Any]:
+        """Load, balance and benchmark one strategy; the same seed gives every strategy the same operations"""
+        started_at = self.client.admin.command("hello")["localTime"]
+        report = {'load_docs_per_sec': self.load(strategy)}
+        report['balanced'] = self.wait_for_balancer(strategy)
+        report['chunks'] = self.chunk_distribution(strategy)
+        report['migrations'] = self.migrations(strategy, started_at)
+
+        spec = self.read_workload(seed=seed)
+        report['routing'] = self.targeted_ratio(strategy, spec, seed=seed)
+
+        analyzer = EnhancedQueryPerformanceAnalyzer(self.connection_string, self.database_name(strategy))
+        reads = analyzer.measure_workload(spec, num_requests, concurrent_users, warmup_requests=num_requests // 10)
+        report['read_throughput_queries_per_sec'] = reads['throughput_queries_per_sec']
+        report['read_templates'] = reads['templates']
+
+        users = self.write_users(seed=seed)
+        content_ids = sorted(self.source.content.distinct("content_id"))
+        rng = random.Random(seed)
+        rng_lock = threading.Lock()  # Concurrent writers draw whole batches, so the batches are the same every run
+
+        def interaction_inserts(count: int) -> List[InsertOne]:
+            operations = []
+            with rng_lock:
+                for user in rng.choices(users, k=count):
+                    operations.append(InsertOne({
+                        "user_id": user["user_id"],
+                        "location": user.get("location"),
+                        "content_id": rng.choice(content_ids) if content_ids else None,
+                        "interaction_type": rng.choice(["view", "like", "share"]),
+                        "timestamp": datetime.now().isoformat()
+                    }))
+            return operations
+
+        writes = analyzer.measure_bulk_write_performance(
+            "interaction_history", interaction_inserts, f"Interaction Inserts ({strategy})",
+            num_batches=write_batches, batch_size=100, ordered=False
+        )
+        report['write_docs_per_sec'] = writes['docs_per_sec']
+        report['write_p95_response_time_ms'] = writes['p95_response_time_ms']
+        return report
+
+    def run(self, strategies: List[str] = None, keep_databases: bool = False, **benchmark_args) -> Dict[str, Any]:
+        """
+        Benchmark every strategy and log a comparison
+
+        Args:
+            strategies (list): Keys of STRATEGIES, all by default
+            keep_databases (bool): Leave the per-strategy databases in place for inspection
+            **benchmark_args: Passed to run_strategy
+
+        Returns:
+            dict: Report per strategy
+        """
+        strategies = strategies or list(STRATEGIES)
+        previous_chunk_size = self._set_chunk_size(self.chunk_size_mb)
+        results = {}
+        try:
+            for strategy in strategies:
+                logger.info(f"Shard key strategy {strategy}: {STRATEGIES[strategy]}")
+                results[strategy] = self.run_strategy(strategy, **benchmark_args)
+                if not keep_databases:
+                    self.client.drop_database(self.database_name(strategy))
+        finally:
+            self._set_chunk_size(previous_chunk_size)
+
+        self.log_report(results)
+        return results
+
+    def log_report(self, results: Dict[str, Any]):
+        logger.info(f"Shard key comparison on {self.shard_count()} shards")
+        logger.info(
+            f"{'Strategy':<20}  {'Chunks (ih/users)':>17}  {'Jumbo':>5}  {'Moves':>5}  "
+            f"{'Targeted':>8}  {'Reads/sec':>10}  {'Writes/sec':>10}"
+        )
+        for strategy, report in results.items():
+            chunks = report['chunks']
+            logger.info(
+                f"{strategy:<20}  "
+                f"{chunks['interaction_history']['chunks']:>8}/{chunks['users']['chunks']:<8}  "
+                f"{sum(entry['jumbo_chunks'] for entry in chunks.values()):>5}  {report['migrations']:>5}  "
+                f"{report['routing']['targeted_ratio'] * 100:>7.1f}%  "
+                f"{report['read_throughput_queries_per_sec']:>10.2f}  {report['write_docs_per_sec']:>10.2f}"
+            )
+            for collection, entry in chunks.items():
+                logger.info(f"    {collection}: chunks per shard {entry['chunks_per_shard']}, imbalance {entry['imbalance']}")
+            for name, stats in report['routing']['templates'].items():
+                logger.info(
+                    f"    {name}: {stats['targeted_ratio'] * 100:.0f}% single-shard, "
+                    f"{stats['avg_shards_targeted']:.1f} shards on average"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare shard key strategies for users and interaction_history")
+    parser.add_argument("--connection-string", default="mongodb://localhost:27015/")
+    parser.add_argument("--source-connection-string", default=None)
+    parser.add_argument("--database", default="DDS_Project")
+    parser.add_argument("--strategies", nargs="+", choices=list(STRATEGIES), default=None)
+    parser.add_argument("--num-requests", type=int, default=1000)
+    parser.add_argument("--concurrent-users", type=int, default=50)
+    parser.add_argument("--start-cluster", action="store_true", help="Start a LocalShardedCluster first and stop it afterwards")
+    parser.add_argument("--keep-databases", action="store_true")
+    parser.add_argument("--output", default=None, help="Write the report as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)-8s | %(message)s')
+    cluster = LocalShardedCluster() if args.start_cluster else None
+    if cluster:
+        cluster.start()
+    try:
+        harness = ShardKeyHarness(args.connection_string, args.source_connection_string, args.database)
+        results = harness.run(
+            args.strategies, args.keep_databases,
+            num_requests=args.num_requests, concurrent_users=args.concurrent_users
+        )
+    finally:
+        if cluster:
+            cluster.stop()
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
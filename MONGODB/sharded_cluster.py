@@ -0,0 +1,210 @@
+import argparse
+import json
+import os
+import signal
+import subprocess
+import time
+from typing import List, Dict, Any
+
+from bson import MinKey, MaxKey
+from pymongo import MongoClient
+from pymongo.errors import ConnectionFailure, OperationFailure
+
+# One shard (and one zone) per region of the dataset
+REGIONS = ["North America", "Europe", "Asia", "South America"]
+
+# Collection -> (shard key, field holding the region); the second key field keeps chunks splittable
+ZONED_COLLECTIONS = {
+    "users": ([("location", 1), ("user_id", 1)], "location"),
+    "regional_trends": ([("region", 1), ("_id", 1)], "region")
+}
+
+
+def region_slug(region: str) -> str:
+    """'North America' -> 'north-america'"""
+    return region.lower().replace(" ", "-")
+
+
+class LocalShardedCluster:
+    def __init__(
+        self,
+        base_dir: str = "sharded_cluster",
+        mongos_port: int = 27015,
+        config_port: int = 27100,
+        shard_base_port: int = 27101,
+        regions: List[str] = None,
+        mongod_binary: str = "mongod",
+        mongos_binary: str = "mongos"
+    ):
+        """
+        Local sharded cluster made of plain processes: one config server, one single-member
+        replica set shard per region and a mongos
+
+        Args:
+            base_dir (str): Directory for data files, logs and the pid file
+            mongos_port (int): Port of the mongos router (the analyzer's default port)
+            config_port (int): Port of the config server
+            shard_base_port (int): Port of the first shard; further shards use consecutive ports
+            regions (list): Regions, one shard and zone each
+            mongod_binary (str): Path to mongod
+            mongos_binary (str): Path to mongos
+        """
+        self.base_dir = os.path.abspath(base_dir)
+        self.mongos_port = mongos_port
+        self.config_port = config_port
+        self.regions = regions or REGIONS
+        self.shard_ports = {region: shard_base_port + i for i, region in enumerate(self.regions)}
+        self.mongod_binary = mongod_binary
+        self.mongos_binary = mongos_binary
+        self.pid_file = os.path.join(self.base_dir, "pids.json")
+
+    def shard_name(self, region: str) -> str:
+        """Replica set (and shard) name of a region"""
+        return f"shard-{region_slug(region)}"
+
+    def _spawn(self, name: str, args: List[str]) -> int:
+        """Start one server process with its own log file and return its pid"""
+        log_path = os.path.join(self.base_dir, f"{name}.log")
+        process = subprocess.Popen(
+            args + ["--bind_ip", "localhost", "--logpath", log_path],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.STDOUT
+        )
+        return process.pid
+
+    def _start_mongod(self, name: str, port: int, replica_set: str, role: str) -> int:
+        dbpath = os.path.join(self.base_dir, name)
+        os.makedirs(dbpath, exist_ok=True)
+        return self._spawn(name, [
+            self.mongod_binary, role, "--replSet", replica_set, "--port", str(port), "--dbpath", dbpath
+        ])
+
+    def _wait_for(self, port: int, timeout: float = 60.0) -> MongoClient:
+        """Wait until a server accepts connections"""
+        client = MongoClient(f"mongodb://localhost:{port}/", directConnection=True, serverSelectionTimeoutMS=1000)
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                client.admin.command("ping")
+                return client
+            except ConnectionFailure:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.5)
+
+    def _initiate(self, port: int, replica_set: str, configsvr: bool = False):
+        """Initiate a single-member replica set and wait for it to elect itself primary"""
+        client = self._wait_for(port)
+        config = {"_id": replica_set, "members": [{"_id": 0, "host": f"localhost:{port}"}]}
+        if configsvr:
+            config["configsvr"] = True
+        try:
+            client.admin.command("replSetInitiate", config)
+        except OperationFailure as e:
+            if e.code != 23:  # AlreadyInitialized
+                raise
+        while not client.admin.command("hello").get("isWritablePrimary"):
+            time.sleep(0.5)
+
+    def start(self):
+        """Start every process, build the replica sets, add the shards and assign one zone per shard"""
+        os.makedirs(self.base_dir, exist_ok=True)
+        pids = {}
+
+        pids["config"] = self._start_mongod("config", self.config_port, "config-rs", "--configsvr")
+        for region, port in self.shard_ports.items():
+            pids[self.shard_name(region)] = self._start_mongod(self.shard_name(region), port, self.shard_name(region), "--shardsvr")
+
+        self._initiate(self.config_port, "config-rs", configsvr=True)
+        for region, port in self.shard_ports.items():
+            self._initiate(port, self.shard_name(region))
+
+        pids["mongos"] = self._spawn("mongos", [
+            self.mongos_binary, "--configdb", f"config-rs/localhost:{self.config_port}", "--port", str(self.mongos_port)
+        ])
+        with open(self.pid_file, "w") as file:
+            json.dump(pids, file, indent=2)
+
+        admin = self._wait_for(self.mongos_port).admin
+        for region, port in self.shard_ports.items():
+            shard = self.shard_name(region)
+            admin.command("addShard", f"{shard}/localhost:{port}", name=shard)
+            admin.command("addShardToZone", shard, zone=region)
+        print(f"Sharded cluster running, mongos on port {self.mongos_port}")
+
+    def configure_zones(self, database: str = "DDS_Project"):
+        """
+        Pin each region's key range to its zone, then shard the region-keyed collections
+
+        The zone ranges are defined first: sharding an empty collection that already has
+        zone ranges creates one initial chunk per range on its zone's shard, so documents
+        loaded afterwards land on their region's shard directly. Run before loading data;
+        a collection that already holds documents starts as a single chunk that the
+        balancer splits and moves into the zones later.
+        """
+        client = MongoClient(f"mongodb://localhost:{self.mongos_port}/")
+        admin = client.admin
+        admin.command("enableSharding", database)
+
+        for collection, (shard_key, region_field) in ZONED_COLLECTIONS.items():
+            namespace = f"{database}.{collection}"
+            suffix_fields = [field for field, _ in shard_key if field != region_field]
+            for region in self.regions:
+                admin.command(
+                    "updateZoneKeyRange",
+                    namespace,
+                    min={region_field: region, **{field: MinKey() for field in suffix_fields}},
+                    max={region_field: region, **{field: MaxKey() for field in suffix_fields}},
+                    zone=region
+                )
+            client[database][collection].create_index(shard_key)
+            admin.command("shardCollection", namespace, key=dict(shard_key))
+            print(f"Zoned {namespace} on {dict(shard_key)}")
+
+    def shard_distribution(self, database: str = "DDS_Project") -> Dict[str, Any]:
+        """Document counts per shard for each zoned collection, as reported by $collStats"""
+        client = MongoClient(f"mongodb://localhost:{self.mongos_port}/")
+        distribution = {}
+        for collection in ZONED_COLLECTIONS:
+            stats = client[database][collection].aggregate([{"$collStats": {"count": {}}}])
+            distribution[collection] = {entry["shard"]: entry["count"] for entry in stats}
+        return distribution
+
+    def stop(self):
+        """Terminate the processes recorded in the pid file, mongos first"""
+        if not os.path.exists(self.pid_file):
+            print("No running cluster recorded")
+            return
+        with open(self.pid_file, "r") as file:
+            pids = json.load(file)
+        for name in ["mongos"] + [name for name in pids if name != "mongos"]:
+            try:
+                os.kill(pids[name], signal.SIGTERM)
+            except (KeyError, ProcessLookupError):
+                continue
+        os.remove(self.pid_file)
+        print("Sharded cluster stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local zone-sharded MongoDB cluster, one shard per region")
+    parser.add_argument("command", choices=["start", "zones", "status", "stop"])
+    parser.add_argument("--base-dir", default="sharded_cluster")
+    parser.add_argument("--mongos-port", type=int, default=27015)
+    parser.add_argument("--database", default="DDS_Project")
+    args = parser.parse_args()
+
+    cluster = LocalShardedCluster(base_dir=args.base_dir, mongos_port=args.mongos_port)
+    if args.command == "start":
+        cluster.start()
+        cluster.configure_zones(args.database)
+    elif args.command == "zones":
+        cluster.configure_zones(args.database)
+    elif args.command == "status":
+        print(json.dumps(cluster.shard_distribution(args.database), indent=2))
+    else:
+        cluster.stop()
+
+
+if __name__ == "__main__":
+    main()
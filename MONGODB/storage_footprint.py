@@ -0,0 +1,173 @@
+import argparse
+import json
+from typing import List, Dict, Any
+
+from pymongo import MongoClient
+
+from performance_metrics import EnhancedQueryPerformanceAnalyzer
+from workload_spec import regional_trends_pipeline, global_trends_pipeline, user_history_pipeline
+
+# WiredTiger block compressors compared; snappy is the server default
+BLOCK_COMPRESSORS = ["snappy", "zstd", "zlib"]
+
+COLLECTIONS = ["users", "content", "interaction_history", "recommendations", "regional_trends"]
+
+
+class StorageFootprint:
+    def __init__(self, connection_string: str = "mongodb://localhost:27015/", database: str = "DDS_Project"):
+        """
+        Copies the dataset into one database per block compressor and compares size and latency
+
+        Args:
+            connection_string (str): MongoDB connection string
+            database (str): Database holding the loaded dataset
+        """
+        self.connection_string = connection_string
+        self.client = MongoClient(connection_string)
+        self.database = database
+
+    def database_name(self, compressor: str) -> str:
+        return f"{self.database}_footprint_{compressor}"
+
+    def load(self, compressor: str, batch_size: int = 1000):
+        """Recreate every collection with the block compressor, copy documents and recreate indexes"""
+        source = self.client[self.database]
+        target = self.client[self.database_name(compressor)]
+        self.client.drop_database(target.name)
+
+        for collection in COLLECTIONS:
+            target.create_collection(
+                collection, storageEngine={"wiredTiger": {"configString": f"block_compressor={compressor}"}}
+            )
+            batch = []
+            for document in source[collection].find():
+                batch.append(document)
+                if len(batch) == batch_size:
+                    target[collection].insert_many(batch, ordered=False)
+                    batch = []
+            if batch:
+                target[collection].insert_many(batch, ordered=False)
+
+            for index in source[collection].list_indexes():
+                if index["name"] == "_id_":
+                    continue
+                options = {key: value for key, value in index.items() if key not in ("v", "key", "ns")}
+                target[collection].create_index(list(index["key"].items()), **options)
+
+        # Sizes on disk are only accurate once the data is checkpointed
+        self.client.admin.command("fsync")
+
+    def collection_sizes(self, compressor: str) -> Dict[str, Dict[str, Any]]:
+        """Records, data, storage and index bytes per collection from collStats, plus dbStats totals"""
+        db = self.client[self.database_name(compressor)]
+        sizes = {}
+        for collection in COLLECTIONS:
+            stats = db.command("collStats", collection)
+            records = stats.get("count", 0)
+            total = stats.get("storageSize", 0) + stats.get("totalIndexSize", 0)
+            sizes[collection] = {
+                "records": records,
+                "data_bytes": stats.get("size", 0),
+                "storage_bytes": stats.get("storageSize", 0),
+                "index_bytes": stats.get("totalIndexSize", 0),
+                "total_bytes": total,
+                "bytes_per_record": total / records if records else None
+            }
+        stats = db.command("dbStats")
+        records = stats.get("objects", 0)
+        sizes["database"] = {
+            "records": records,
+            "data_bytes": stats.get("dataSize", 0),
+            "storage_bytes": stats.get("storageSize", 0),
+            "index_bytes": stats.get("indexSize", 0),
+            "total_bytes": stats.get("totalSize", stats.get("storageSize", 0) + stats.get("indexSize", 0)),
+        }
+        sizes["database"]["bytes_per_record"] = sizes["database"]["total_bytes"] / records if records else None
+        return sizes
+
+    def query_latency(self, compressor: str, num_requests: int = 200, concurrent_users: int = 20) -> Dict[str, Dict[str, float]]:
+        """
+        Latency of the existing regional, global and user history queries on the compressed copy
+
+        Compression only costs time when pages are read from disk, so the difference shows
+        mostly when the data exceeds the WiredTiger cache.
+        """
+        analyzer = EnhancedQueryPerformanceAnalyzer(self.connection_string, self.database_name(compressor))
+        user = analyzer.db.interaction_history.find_one({}, {"user_id": 1}) or {}
+        queries = {
+            "Regional Trends": ("regional_trends", regional_trends_pipeline({"region": "South America"})),
+            "Global Trends": ("regional_trends", global_trends_pipeline({"limit": 5})),
+            "User History": ("interaction_history", user_history_pipeline({"user_id": user.get("user_id")}))
+        }
+        latency = {}
+        for query_name, (collection, pipeline) in queries.items():
+            metrics = analyzer.measure_query_performance(
+                collection, pipeline, f"{query_name} ({compressor})", num_requests, concurrent_users,
+                warmup_requests=concurrent_users, capture_explain=False
+            )
+            latency[query_name] = {
+                "avg_response_time_ms": metrics["avg_response_time_ms"],
+                "p95_response_time_ms": metrics["p95_response_time_ms"]
+            }
+        return latency
+
+    def run(self, compressors: List[str] = None, keep_databases: bool = False, **latency_args) -> Dict[str, Any]:
+        """
+        Load, measure and print every compressor configuration
+
+        Returns:
+            dict: Sizes and latencies per compressor
+        """
+        report = {}
+        for compressor in compressors or BLOCK_COMPRESSORS:
+            print(f"Loading {self.database} with block_compressor={compressor}...")
+            self.load(compressor)
+            report[compressor] = {
+                "sizes": self.collection_sizes(compressor),
+                "latency": self.query_latency(compressor, **latency_args)
+            }
+            if not keep_databases:
+                self.client.drop_database(self.database_name(compressor))
+        print_report(report)
+        return report
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"{'Compressor':<10}  {'Collection':<20}  {'Records':>9}  {'Data MiB':>9}  {'Storage MiB':>11}  "
+          f"{'Index MiB':>9}  {'Bytes/record':>12}")
+    for compressor, entry in report.items():
+        for collection, sizes in entry["sizes"].items():
+            bytes_per_record = sizes["bytes_per_record"]
+            print(
+                f"{compressor:<10}  {collection:<20}  {sizes['records']:>9}  {sizes['data_bytes'] / 1024 ** 2:>9.2f}  "
+                f"{sizes['storage_bytes'] / 1024 ** 2:>11.2f}  {sizes['index_bytes'] / 1024 ** 2:>9.2f}  "
+                f"{'-' if bytes_per_record is None else f'{bytes_per_record:.1f}':>12}"
+            )
+    print()
+    print(f"{'Compressor':<10}  {'Query':<20}  {'Avg ms':>8}  {'p95 ms':>8}")
+    for compressor, entry in report.items():
+        for query_name, latency in entry["latency"].items():
+            print(f"{compressor:<10}  {query_name:<20}  {latency['avg_response_time_ms']:>8.2f}  "
+                  f"{latency['p95_response_time_ms']:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare MongoDB storage footprint and latency across block compressors")
+    parser.add_argument("--connection-string", default="mongodb://localhost:27015/")
+    parser.add_argument("--database", default="DDS_Project")
+    parser.add_argument("--compressors", nargs="+", choices=BLOCK_COMPRESSORS + ["none"], default=None)
+    parser.add_argument("--num-requests", type=int, default=200)
+    parser.add_argument("--keep-databases", action="store_true")
+    parser.add_argument("--output", default=None, help="Write the report as JSON")
+    args = parser.parse_args()
+
+    report = StorageFootprint(args.connection_string, args.database).run(
+        args.compressors, args.keep_databases, num_requests=args.num_requests
+    )
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
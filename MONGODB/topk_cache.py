@@ -0,0 +1,270 @@
+import heapq
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Tuple
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+# Row kept per regional_trends document: (region, title, content type, views, likes)
+Row = Tuple[str, str, Optional[str], int, int]
+
+
+def _deep_size(value: Any, seen: set = None) -> int:
+    """Approximate retained size of nested containers in bytes"""
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_deep_size(key, seen) + _deep_size(item, seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(_deep_size(item, seen) for item in value)
+    return size
+
+
+class TopKCache:
+    def __init__(self, db, regional_k: int = 10, global_k: int = 5,
+                 state_path: str = os.path.join("benchmark_output", "topk_cache_state.json"),
+                 persist_every: int = 100, retry_delay: float = 1.0):
+        """
+        In-process regional and global top-K results kept current by a regional_trends change stream
+
+        Args:
+            db: pymongo Database (must belong to a replica set or sharded cluster)
+            regional_k (int): Entries kept per region, as in the regional pipeline
+            global_k (int): Entries kept for the global ranking
+            state_path (str): File holding rows and the resume token between restarts
+            persist_every (int): Events applied between state file writes
+            retry_delay (float): Seconds between attempts to reopen a failed change stream
+        """
+        self.db = db
+        self.regional_k = regional_k
+        self.global_k = global_k
+        self.state_path = state_path
+        self.persist_every = persist_every
+        self.retry_delay = retry_delay
+        self.logger = logging.getLogger(__name__)
+
+        # False until the change stream is open, and again while a failed stream is reopened:
+        # the results may then be missing writes
+        self.valid = False
+
+        self._rows: Dict[str, Row] = {}
+        self._region_rows: Dict[str, Dict[str, Row]] = defaultdict(dict)
+        self._global_views: Dict[str, int] = defaultdict(int)
+        self._regional_top: Dict[str, List[Dict[str, Any]]] = {}
+        self._global_top: List[Dict[str, Any]] = []
+
+        self._resume_token = None
+        self._events_since_persist = 0
+        self._changed = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _row_from_document(document: Dict[str, Any]) -> Row:
+        metrics = document.get("engagement_metrics", {})
+        return (
+            document.get("region"),
+            document.get("top_content"),
+            document.get("content_snapshot", {}).get("type"),
+            int(metrics.get("total_views", 0)),
+            int(metrics.get("total_likes", 0))
+        )
+
+    def _recompute_region(self, region: str):
+        top = heapq.nlargest(self.regional_k, self._region_rows[region].values(), key=lambda row: (row[3], row[4]))
+        self._regional_top[region] = [
+            {"Content Title": title, "Content Type": content_type, "Total Views": views, "Total Likes": likes}
+            for _, title, content_type, views, likes in top
+        ]
+
+    def _recompute_global(self):
+        top = heapq.nlargest(self.global_k, self._global_views.items(), key=lambda item: item[1])
+        self._global_top = [{"_id": title, "total_views": views} for title, views in top]
+
+    def _put(self, key: str, row: Optional[Row]):
+        """Replace (or with row=None, remove) one source row and fix the affected results"""
+        old = self._rows.pop(key, None)
+        regions = set()
+        if old is not None:
+            self._region_rows[old[0]].pop(key, None)
+            self._global_views[old[1]] -= old[3]
+            if self._global_views[old[1]] <= 0:
+                del self._global_views[old[1]]
+            regions.add(old[0])
+        if row is not None:
+            self._rows[key] = row
+            self._region_rows[row[0]][key] = row
+            self._global_views[row[1]] += row[3]
+            regions.add(row[0])
+        for region in regions:
+            self._recompute_region(region)
+        self._recompute_global()
+
+    def _reset(self, rows: Dict[str, Row]):
+        """Replace every row at once and compute all results from scratch"""
+        with self._changed:
+            self._rows = rows
+            self._region_rows.clear()
+            self._global_views.clear()
+            for key, row in rows.items():
+                self._region_rows[row[0]][key] = row
+                self._global_views[row[1]] += row[3]
+            for region in self._region_rows:
+                self._recompute_region(region)
+            self._recompute_global()
+
+    def rebuild(self):
+        """Load every regional_trends row from the database"""
+        projection = {"region": 1, "top_content": 1, "engagement_metrics": 1, "content_snapshot.type": 1}
+        self._reset({
+            str(document["_id"]): self._row_from_document(document)
+            for document in self.db.regional_trends.find({}, projection)
+        })
+
+    def _load_state(self) -> bool:
+        if not os.path.exists(self.state_path):
+            return False
+        with open(self.state_path, "r") as file:
+            state = json.load(file)
+        self._reset({key: tuple(row) for key, row in state["rows"].items()})
+        self._resume_token = state["resume_token"]
+        return True
+
+    def persist(self):
+        """Write rows and resume token atomically so a restart can resume without a rebuild"""
+        with self._changed:
+            state = {"resume_token": self._resume_token, "rows": self._rows}
+            directory = os.path.dirname(self.state_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temporary_path = f"{self.state_path}.tmp"
+            with open(temporary_path, "w") as file:
+                json.dump(state, file)
+            os.replace(temporary_path, self.state_path)
+            self._events_since_persist = 0
+
+    def _apply(self, change: Dict[str, Any]):
+        operation = change["operationType"]
+        key = str(change["documentKey"]["_id"])
+        with self._changed:
+            if operation in ("insert", "update", "replace"):
+                document = change.get("fullDocument")
+                self._put(key, self._row_from_document(document) if document else None)
+            elif operation == "delete":
+                self._put(key, None)
+            self._resume_token = change["_id"]
+            self._events_since_persist += 1
+            self._changed.notify_all()
+        if self._events_since_persist >= self.persist_every:
+            self.persist()
+
+    def _open_stream(self):
+        """
+        Open the change stream after the last applied event, or rebuild under a new one
+
+        The stream is opened before a rebuild so no write between the snapshot and the
+        first event is lost; events already reflected in the snapshot are reapplied
+        idempotently from their full documents. A resume token that has fallen off the
+        oplog fails with ChangeStreamHistoryLost, which also leads to a rebuild and
+        overwrites the state file.
+        """
+        if self._resume_token is not None:
+            try:
+                stream = self.db.regional_trends.watch(
+                    full_document="updateLookup", resume_after=self._resume_token, max_await_time_ms=200
+                )
+                self.logger.info(f"Top-K cache resumed with {len(self._rows)} rows")
+                return stream
+            except OperationFailure as error:
+                self.logger.warning(f"Top-K cache cannot resume its change stream, rebuilding: {error}")
+
+        stream = self.db.regional_trends.watch(full_document="updateLookup", max_await_time_ms=200)
+        self._resume_token = stream.resume_token
+        self.rebuild()
+        self.persist()
+        self.logger.info(f"Top-K cache rebuilt with {len(self._rows)} rows")
+        return stream
+
+    def _follow(self, stream):
+        """Apply change events until stopped, reopening the stream from the last token after an error"""
+        try:
+            while not self._stop.is_set():
+                if stream is None:
+                    try:
+                        stream = self._open_stream()
+                    except PyMongoError as error:
+                        self.logger.error(f"Top-K cache cannot reopen its change stream: {error}")
+                        self._stop.wait(self.retry_delay)
+                        continue
+                    self.valid = True
+                try:
+                    change = stream.try_next()
+                except PyMongoError as error:
+                    self.valid = False
+                    self.logger.error(f"Top-K cache change stream failed, reopening: {error}")
+                    stream.close()
+                    stream = None
+                    continue
+                if change is not None:
+                    self._apply(change)
+        except Exception:
+            self.valid = False
+            self.logger.exception("Top-K cache stopped following regional_trends")
+            raise
+        finally:
+            if stream is not None:
+                stream.close()
+
+    def start(self):
+        """Resume from the state file if present, otherwise rebuild, then follow the change stream"""
+        self._load_state()
+        stream = self._open_stream()
+        self.valid = True
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._follow, args=(stream,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop following the change stream and persist the state"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.persist()
+
+    def regional_top(self, region: str) -> List[Dict[str, Any]]:
+        """Top-K rows of a region, same fields as the regional pipeline output"""
+        return self._regional_top.get(region, [])
+
+    def global_top(self) -> List[Dict[str, Any]]:
+        """Top-K content by total views across regions"""
+        return self._global_top
+
+    def row_views(self, document_id) -> Optional[int]:
+        """Views currently cached for one regional_trends document"""
+        row = self._rows.get(str(document_id))
+        return None if row is None else row[3]
+
+    def wait_until(self, predicate, timeout: float = 10.0) -> bool:
+        """Block until predicate() holds after some applied change, or the timeout expires"""
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while not predicate():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._changed.wait(remaining)
+        return True
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by cached rows and results"""
+        with self._changed:
+            return _deep_size([self._rows, self._region_rows, self._global_views, self._regional_top, self._global_top])
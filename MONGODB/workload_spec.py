@@ -0,0 +1,198 @@
+import bisect
+import itertools
+import random
+from typing import List, Dict, Any, Callable, Optional, Sequence, Tuple
+
+# Builds a pipeline from the parameters drawn for one request
+PipelineBuilder = Callable[[Dict[str, Any]], List[Dict[str, Any]]]
+
+# Draws one parameter value from the given random generator
+ParameterGenerator = Callable[[random.Random], Any]
+
+REGIONS = ["North America", "Europe", "Asia", "South America"]
+
+
+def uniform_choice(values: Sequence[Any]) -> ParameterGenerator:
+    """Parameter drawn uniformly from values"""
+    values = list(values)
+    if not values:
+        raise ValueError("uniform_choice needs at least one value")
+    return lambda rng: rng.choice(values)
+
+
+def zipf_choice(values: Sequence[Any], exponent: float = 1.1) -> ParameterGenerator:
+    """
+    Parameter drawn with Zipf-distributed popularity: the k-th value has weight 1 / k^exponent
+
+    Args:
+        values (list): Values ordered from most to least popular
+        exponent (float): Skew of the distribution, larger concentrates more traffic on the head
+
+    Returns:
+        callable: Parameter generator
+    """
+    values = list(values)
+    if not values:
+        raise ValueError("zipf_choice needs at least one value")
+    cumulative = list(itertools.accumulate(1.0 / rank ** exponent for rank in range(1, len(values) + 1)))
+    return lambda rng: values[bisect.bisect_left(cumulative, rng.random() * cumulative[-1])]
+
+
+def sample_field(db, collection: str, field: str, size: int = 1000, seed: Optional[int] = None) -> List[Any]:
+    """
+    Values of a field from a random sample of a collection, used to feed parameter generators
+
+    $sample draws a different pool on every call, so with a seed the pool is instead drawn
+    from the sorted distinct values by random.Random(seed): the same data and seed give the
+    same pool in the same order.
+    """
+    if seed is None:
+        pipeline = [{"$sample": {"size": size}}, {"$project": {"_id": 0, "value": f"${field}"}}]
+        return [document["value"] for document in db[collection].aggregate(pipeline) if "value" in document]
+    values = sorted(value for value in db[collection].distinct(field) if value is not None)
+    return random.Random(seed).sample(values, min(size, len(values)))
+
+
+class QueryTemplate:
+    def __init__(
+        self,
+        name: str,
+        collection: str,
+        build_pipeline: PipelineBuilder,
+        parameters: Dict[str, ParameterGenerator] = None,
+        weight: float = 1.0
+    ):
+        """
+        One kind of query in a workload, instantiated with fresh parameters for every request
+
+        Args:
+            name (str): Name the template's latency is reported under
+            collection (str): Collection the pipeline runs against
+            build_pipeline (callable): Parameters dict -> aggregation pipeline
+            parameters (dict): Parameter name -> generator
+            weight (float): Relative share of requests in the mix
+        """
+        if weight <= 0:
+            raise ValueError(f"Template {name} needs a positive weight")
+        self.name = name
+        self.collection = collection
+        self.build_pipeline = build_pipeline
+        self.parameters = parameters or {}
+        self.weight = weight
+
+    def instantiate(self, rng: random.Random) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Draw parameters and build the pipeline for one request"""
+        values = {name: generate(rng) for name, generate in self.parameters.items()}
+        return values, self.build_pipeline(values)
+
+
+class WorkloadSpec:
+    def __init__(self, name: str, templates: List[QueryTemplate], seed: Optional[int] = None):
+        """
+        Weighted mix of query templates
+
+        Args:
+            name (str): Name of the workload
+            templates (list): QueryTemplate instances, picked in proportion to their weights
+            seed (int): Seed of the random generator; generate() then returns the same operations every run
+        """
+        if not templates:
+            raise ValueError("A workload needs at least one template")
+        self.name = name
+        self.templates = templates
+        self.rng = random.Random(seed)
+        self._cumulative_weights = list(itertools.accumulate(template.weight for template in templates))
+
+    def next_request(self) -> Tuple[QueryTemplate, List[Dict[str, Any]]]:
+        """Pick a template by weight and instantiate it"""
+        template = self.rng.choices(self.templates, cum_weights=self._cumulative_weights)[0]
+        _, pipeline = template.instantiate(self.rng)
+        return template, pipeline
+
+    def generate(self, count: int) -> List[Tuple[QueryTemplate, List[Dict[str, Any]]]]:
+        """
+        Draw `count` requests up front
+
+        Concurrent workers calling next_request would interleave their draws from the shared
+        generator differently on every run; drawing the list first keeps it reproducible.
+        """
+        return [self.next_request() for _ in range(count)]
+
+    def shares(self) -> Dict[str, float]:
+        """Expected fraction of requests per template"""
+        total = self._cumulative_weights[-1]
+        return {template.name: template.weight / total for template in self.templates}
+
+
+def regional_trends_pipeline(params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Regional top content for params['region'], same shape as the analyzer's regional query"""
+    return [
+        {"$match": {"region": params["region"]}},
+        {"$sort": {"engagement_metrics.total_views": -1, "engagement_metrics.total_likes": -1}},
+        {"$lookup": {"from": "content", "localField": "top_content", "foreignField": "title", "as": "content_details"}},
+        {"$unwind": "$content_details"},
+        {"$project": {
+            "_id": 0,
+            "Content Title": "$top_content",
+            "Content Type": "$content_details.type",
+            "Total Views": "$engagement_metrics.total_views",
+            "Total Likes": "$engagement_metrics.total_likes"
+        }},
+        {"$limit": 10}
+    ]
+
+
+def user_history_pipeline(params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Last interactions of params['user_id']"""
+    return [
+        {"$match": {"user_id": params["user_id"]}},
+        {"$sort": {"timestamp": -1}},
+        {"$limit": params.get("limit", 20)}
+    ]
+
+
+def content_engagement_pipeline(params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Interaction counts by type for params['content_id']"""
+    return [
+        {"$match": {"content_id": params["content_id"]}},
+        {"$group": {"_id": "$interaction_type", "count": {"$sum": 1}}}
+    ]
+
+
+def global_trends_pipeline(params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Global top content by views, params['limit'] entries"""
+    return [
+        {"$group": {"_id": "$top_content", "total_views": {"$sum": "$engagement_metrics.total_views"}}},
+        {"$sort": {"total_views": -1}},
+        {"$limit": params["limit"]}
+    ]
+
+
+def default_workload(db, seed: Optional[int] = None, zipf_exponent: float = 1.1) -> WorkloadSpec:
+    """
+    Mixed read workload over the project's collections with parameters drawn from the data
+
+    User ids are sampled uniformly; content ids follow a Zipf distribution over a random
+    sample of content, so a few titles receive most of the engagement lookups.
+
+    Args:
+        db: pymongo Database
+        seed (int): Seed of the parameter pools and of the workload's random generator; the same
+            data and seed give the same operations
+        zipf_exponent (float): Skew of the content popularity
+
+    Returns:
+        WorkloadSpec: The workload
+    """
+    user_ids = sample_field(db, "users", "user_id", seed=seed)
+    content_ids = sample_field(db, "content", "content_id", seed=seed)
+    return WorkloadSpec("Mixed Read Workload", [
+        QueryTemplate("Regional Trends", "regional_trends", regional_trends_pipeline,
+                      {"region": uniform_choice(REGIONS)}, weight=4),
+        QueryTemplate("User History", "interaction_history", user_history_pipeline,
+                      {"user_id": uniform_choice(user_ids)}, weight=3),
+        QueryTemplate("Content Engagement", "interaction_history", content_engagement_pipeline,
+                      {"content_id": zipf_choice(content_ids, zipf_exponent)}, weight=2),
+        QueryTemplate("Global Trends", "regional_trends", global_trends_pipeline,
+                      {"limit": uniform_choice([5, 10, 20])}, weight=1)
+    ], seed=seed)